@@ -8,6 +8,7 @@ from apps.NTF.serializers import (
     NTFInfoDetailSerializer,
     NTFInfoListSerializer,
 )
+from utils.downsample import downsample_matrix
 from utils.response import Response
 
 
@@ -18,6 +19,18 @@ POS_LABEL = {
 }
 
 
+def _heat_series(values, width: Optional[int]) -> List[Optional[float]]:
+    """将热力图一行数据转换为浮点数列表，无法解析的值置为 None，并按频率轴长度截断"""
+    series: List[Optional[float]] = []
+    for v in values[:width]:
+        try:
+            f = float(v)
+        except (TypeError, ValueError):
+            f = None
+        series.append(f)
+    return series
+
+
 def _seat_layout(seat_count: int | None):
     layout = [{'key': 'front', 'label': '前排'}]
     if seat_count and seat_count > 5:
@@ -194,6 +207,16 @@ def ntf_query(request):
     if not vehicle_ids:
         return Response.bad_request(message='缺少参数：vehicle_ids')
 
+    # 热力图频率轴最多保留的点数，超出时按频段取峰值降采样；不传则返回全部数据
+    max_points = request.GET.get('max_points')
+    if max_points:
+        try:
+            max_points = int(max_points)
+        except ValueError:
+            return Response.bad_request(message='参数错误：max_points')
+        if max_points < 10:
+            return Response.bad_request(message='参数错误：max_points 不能小于10')
+
     results = _collect_filtered_queryset(request.GET)
     if not results:
         return Response.success(data={
@@ -283,7 +306,7 @@ def ntf_query(request):
             break
 
     heat_points: List[str] = []
-    heat_matrix: List[List[Optional[float]]] = []
+    heat_sources: List[list] = []
 
     requested_dirs = _normalize_csv(request.GET.get('directions')) or ['x','y','z']
     for r in results:
@@ -295,17 +318,20 @@ def ntf_query(request):
                     continue
                 values = branch.get(f'{d_key}_values') or []
                 if values:
-                    series: List[Optional[float]] = []
-                    for v in values:
-                        try:
-                            f = float(v)
-                        except (TypeError, ValueError):
-                            f = None
-                        series.append(f)
-                    if frequency_axis:
-                        series = series[:len(frequency_axis)]
                     heat_points.append(f"{vm.vehicle_model_name}_{r.measurement_point}_{POS_LABEL.get(p,p)}_{d_code}")
-                    heat_matrix.append(series)
+                    heat_sources.append(values)
+
+    width = len(frequency_axis) or None
+    if max_points:
+        frequency_axis, heat_matrix = downsample_matrix(
+            frequency_axis,
+            [_heat_series(values, width) for values in heat_sources],
+            max_points,
+        )
+        heat_matrix = iter(heat_matrix)
+    else:
+        # 热力图各行在流式输出时逐行转换
+        heat_matrix = (_heat_series(values, width) for values in heat_sources)
 
     data = {
         'seat_columns': seat_columns,
@@ -317,4 +343,4 @@ def ntf_query(request):
             'matrix': heat_matrix,
         }
     }
-    return Response.success(data=data, message='获取NTF综合查询结果成功')
+    return Response.stream(data=data, message='获取NTF综合查询结果成功')
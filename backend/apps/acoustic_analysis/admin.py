@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import ConditionMeasurePoint, AcousticTestData, DynamicNoiseData
+from .models import ConditionMeasurePoint, AcousticTestData, AcousticLatestResult, DynamicNoiseData
 
 
 @admin.register(ConditionMeasurePoint)
@@ -33,3 +33,11 @@ class DynamicNoiseDataAdmin(admin.ModelAdmin):
     )
     list_filter = ('x_axis_type',)
     list_per_page = 20
+
+
+@admin.register(AcousticLatestResult)
+class AcousticLatestResultAdmin(admin.ModelAdmin):
+    list_display = ('vehicle_model', 'condition_point', 'rms_value', 'speech_clarity', 'test_date')
+    list_filter = ('condition_point__measure_type',)
+    raw_id_fields = ('test_data',)
+    list_per_page = 10
@@ -6,3 +6,6 @@ class AcousticAnalysisConfig(AppConfig):
     name = 'apps.acoustic_analysis'
     verbose_name = '声学测试数据分析'
 
+
+    def ready(self):
+        from apps.acoustic_analysis import signals  # noqa: F401
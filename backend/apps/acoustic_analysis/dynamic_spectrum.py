@@ -0,0 +1,204 @@
+"""
+动态噪声三维频谱矩阵（频率 × 车速/转速）的存储与切片读取
+
+getdata.py 生成的 .npz 为压缩格式，读取任意切片都需要解压整个 20~50 MB 矩阵。
+这里将其转换为目录下的三个未压缩 .npy 文件：
+
+- frequencies.npy  频率轴（float64）
+- axis.npy         车速/转速轴（float64）
+- levels.npy       声压级矩阵（float32），按 [横轴, 频率] 行优先存储
+
+查询时以 mmap_mode='r' 打开，只读取请求涉及的字节。矩阵在存储时转置，
+使“某一车速下的频谱”为连续内存，最常用的切片只需顺序读取一行。
+"""
+import os
+
+import numpy as np
+from django.conf import settings
+
+from utils.downsample import downsample_xy
+
+
+FREQUENCY_FILE = 'frequencies.npy'
+AXIS_FILE = 'axis.npy'
+LEVELS_FILE = 'levels.npy'
+LEVELS_DTYPE = np.dtype('<f4')
+
+# npz 中横轴可能使用的键名
+NPZ_AXIS_KEYS = ('speeds', 'rpms', 'axis')
+
+# 分块读取时每块的行数，控制单次读取的内存占用
+TILE_BLOCK_ROWS = 64
+
+
+class SpectrumMatrixError(Exception):
+    """三维频谱矩阵不存在或格式错误"""
+
+
+# ==================== 路径处理 ====================
+
+def resolve_media_path(raw_path):
+    """
+    将数据库中存储的路径（可能包含 /media/ 前缀或起始斜杠）规范化为 MEDIA_ROOT 下的绝对路径
+
+    路径越界时返回 None。
+    """
+    rel_path = str(raw_path).replace('\\', '/').strip()
+    # 去掉开头的斜杠，避免在 Windows 上被当作磁盘根路径处理
+    rel_path = rel_path.lstrip('/')
+    media_prefix = (settings.MEDIA_URL or '').lstrip('/')  # 例如 'media/'
+    if media_prefix and rel_path.startswith(media_prefix):
+        rel_path = rel_path[len(media_prefix):].lstrip('/')
+
+    media_root = os.path.abspath(settings.MEDIA_ROOT)
+    file_path = os.path.abspath(os.path.join(media_root, rel_path))
+    # 防止路径越界
+    if file_path != media_root and not file_path.startswith(media_root + os.sep):
+        return None
+    return file_path
+
+
+# ==================== 格式转换 ====================
+
+def convert_npz_to_npy(npz_path, target_dir):
+    """
+    将 getdata.py 生成的 .npz（frequencies / speeds|rpms / db_data[频率, 横轴]）
+    转换为可内存映射的 .npy 目录，返回 (频率点数, 横轴点数)
+    """
+    with np.load(npz_path) as data:
+        if 'frequencies' not in data or 'db_data' not in data:
+            raise SpectrumMatrixError('npz 文件缺少 frequencies 或 db_data')
+        axis_key = next((key for key in NPZ_AXIS_KEYS if key in data), None)
+        if axis_key is None:
+            raise SpectrumMatrixError('npz 文件缺少车速/转速轴（speeds 或 rpms）')
+
+        frequencies = np.asarray(data['frequencies'], dtype=np.float64)
+        axis = np.asarray(data[axis_key], dtype=np.float64)
+        db_data = data['db_data']
+        if db_data.shape != (len(frequencies), len(axis)):
+            raise SpectrumMatrixError(
+                f'矩阵形状 {db_data.shape} 与坐标轴长度 ({len(frequencies)}, {len(axis)}) 不一致'
+            )
+
+        os.makedirs(target_dir, exist_ok=True)
+        np.save(os.path.join(target_dir, FREQUENCY_FILE), frequencies)
+        np.save(os.path.join(target_dir, AXIS_FILE), axis)
+        np.save(
+            os.path.join(target_dir, LEVELS_FILE),
+            np.ascontiguousarray(db_data.T, dtype=LEVELS_DTYPE),
+        )
+    return len(frequencies), len(axis)
+
+
+# ==================== 切片读取 ====================
+
+def open_spectrum_matrix(matrix_dir):
+    """以内存映射方式打开矩阵目录，返回 (频率轴, 横轴, 声压级矩阵[横轴, 频率])"""
+    try:
+        frequencies = np.load(os.path.join(matrix_dir, FREQUENCY_FILE))
+        axis = np.load(os.path.join(matrix_dir, AXIS_FILE))
+        levels = np.load(os.path.join(matrix_dir, LEVELS_FILE), mmap_mode='r')
+    except (OSError, ValueError) as exc:
+        raise SpectrumMatrixError('三维频谱文件不存在或已损坏') from exc
+    if levels.shape != (len(axis), len(frequencies)):
+        raise SpectrumMatrixError('三维频谱矩阵形状与坐标轴不一致')
+    return frequencies, axis, levels
+
+
+def _nearest_index(values, target):
+    return int(np.abs(values - target).argmin())
+
+
+def _range_slice(values, lower=None, upper=None):
+    """坐标轴单调递增时，按数值范围换算为下标切片"""
+    start = 0 if lower is None else int(np.searchsorted(values, lower, side='left'))
+    stop = len(values) if upper is None else int(np.searchsorted(values, upper, side='right'))
+    return slice(start, max(start, stop))
+
+
+def spectrum_at(frequencies, axis, levels, x, f_min=None, f_max=None, max_points=None):
+    """某一车速/转速下的频谱（读取连续的一行）"""
+    index = _nearest_index(axis, x)
+    freq_range = _range_slice(frequencies, f_min, f_max)
+    freq, values = downsample_xy(frequencies[freq_range], levels[index, freq_range], max_points)
+    return {
+        'x': float(axis[index]),
+        'frequency': freq,
+        'values': values,
+    }
+
+
+def frequency_line(frequencies, axis, levels, frequency, x_min=None, x_max=None):
+    """某一频率随车速/转速的变化曲线（每行读取一个元素）"""
+    index = _nearest_index(frequencies, frequency)
+    axis_range = _range_slice(axis, x_min, x_max)
+    return {
+        'frequency': float(frequencies[index]),
+        'x': axis[axis_range],
+        'values': np.asarray(levels[axis_range, index], dtype=np.float64),
+    }
+
+
+def band_level(frequencies, axis, levels, f_min, f_max, x_min=None, x_max=None):
+    """频段 [f_min, f_max] 内按能量叠加的声压级随车速/转速的变化曲线"""
+    freq_range = _range_slice(frequencies, f_min, f_max)
+    axis_range = _range_slice(axis, x_min, x_max)
+    totals = np.zeros(axis_range.stop - axis_range.start)
+    if freq_range.stop > freq_range.start:
+        for offset in range(0, len(totals), TILE_BLOCK_ROWS):
+            rows = slice(axis_range.start + offset, min(axis_range.stop, axis_range.start + offset + TILE_BLOCK_ROWS))
+            block = np.asarray(levels[rows, freq_range], dtype=np.float64)
+            totals[offset:offset + block.shape[0]] = np.power(10.0, block / 10).sum(axis=1)
+    with np.errstate(divide='ignore'):
+        values = 10 * np.log10(totals)
+    values[~np.isfinite(values)] = np.nan
+    return {
+        'f_min': float(frequencies[freq_range.start]) if freq_range.stop > freq_range.start else None,
+        'f_max': float(frequencies[freq_range.stop - 1]) if freq_range.stop > freq_range.start else None,
+        'x': axis[axis_range],
+        'values': values,
+    }
+
+
+def _bucket_peaks(block, bucket_size):
+    """按列分桶取最大值（峰值保持），末桶不足时按实际宽度计算"""
+    width = block.shape[1]
+    bucket_count = -(-width // bucket_size)
+    padded = np.full((block.shape[0], bucket_count * bucket_size), -np.inf)
+    padded[:, :width] = block
+    return padded.reshape(block.shape[0], bucket_count, bucket_size).max(axis=2)
+
+
+def tile(frequencies, axis, levels, f_min=None, f_max=None, x_min=None, x_max=None,
+         max_rows=200, max_cols=400):
+    """
+    指定范围的降采样热力图
+
+    横轴与频率方向均按桶取峰值，分块读取，内存占用与请求范围而非整个矩阵相关。
+    返回矩阵为 [横轴, 频率]。
+    """
+    freq_range = _range_slice(frequencies, f_min, f_max)
+    axis_range = _range_slice(axis, x_min, x_max)
+    width = freq_range.stop - freq_range.start
+    height = axis_range.stop - axis_range.start
+    if not width or not height:
+        return {'frequency': [], 'x': [], 'matrix': []}
+
+    col_bucket = -(-width // max_cols)
+    row_bucket = -(-height // max_rows)
+    # 分块行数取桶大小的整数倍，保证块边界与桶边界对齐
+    block_rows = row_bucket * max(1, TILE_BLOCK_ROWS // row_bucket)
+
+    row_peaks = []
+    for offset in range(0, height, block_rows):
+        rows = slice(axis_range.start + offset, min(axis_range.stop, axis_range.start + offset + block_rows))
+        block = np.asarray(levels[rows, freq_range], dtype=np.float64)
+        block = _bucket_peaks(block, col_bucket)
+        row_peaks.append(_bucket_peaks(block.T, row_bucket).T)
+    matrix = np.vstack(row_peaks)
+
+    return {
+        'frequency': frequencies[freq_range][::col_bucket],
+        'x': axis[axis_range][::row_bucket],
+        'matrix': matrix,
+    }
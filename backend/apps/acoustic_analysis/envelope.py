@@ -0,0 +1,234 @@
+"""
+车队统计包络（P10/P50/P90）
+
+每个工况测点取全部车型各自最新的一条测试记录，计算窄带与频带的分位数曲线及有效值分位数，
+结果保存在 AcousticEnvelope 中。测试数据变更时标记 is_dirty，并在事务提交后交给进程内
+后台线程按工况测点增量重建（同一工况测点排队期间的多次变更合并为一次重建）；
+查询时直接返回已有包络（重建完成前为上一版本），仅尚未生成过包络的工况测点在首次查询时同步生成。
+进程退出时未完成的重建由 rebuild_acoustic_envelopes 补做（默认处理全部待重建的工况测点）。
+"""
+import logging
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+import numpy as np
+from django.db import IntegrityError, connections, transaction
+
+from apps.acoustic_analysis.models import (
+    AcousticEnvelope,
+    AcousticLatestResult,
+    AcousticTestData,
+    ConditionMeasurePoint,
+)
+from apps.acoustic_analysis.spectrum import (
+    BAND_DEFINITIONS,
+    BAND_RESOLUTIONS,
+    SPECTRUM_DTYPE,
+    load_spectrum_arrays,
+    to_json_floats,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 50, 90)
+PERCENTILE_KEYS = tuple(f'p{p}' for p in PERCENTILES)
+# 窄带包络的公共网格点数，满足叠加显示即可，无需保留原始 12000 点
+NARROWBAND_POINTS = 2000
+
+
+# ==================== 分位数计算 ====================
+
+def _nanpercentiles(matrix):
+    """按列计算分位数，返回 [分位数, 列] 矩阵；整列缺失时为 NaN"""
+    with warnings.catch_warnings():
+        # 整列缺失时 nanpercentile 会给出 All-NaN 告警，结果按 NaN 处理即可
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanpercentile(matrix, PERCENTILES, axis=0)
+
+
+def compute_narrowband_envelope(curves, num_points=NARROWBAND_POINTS):
+    """
+    将各车型频谱插值到公共线性网格后逐频率计算分位数
+
+    网格范围取各曲线起止频率的中位数，避免个别频率范围异常的曲线收窄整个包络；
+    网格点超出某条曲线范围时该曲线不参与该点统计。无有效数据时返回 None。
+    """
+    curves = [(freq, values) for freq, values in curves if len(freq) > 1]
+    if not curves:
+        return None
+    lower = float(np.median([freq.min() for freq, _ in curves]))
+    upper = float(np.median([freq.max() for freq, _ in curves]))
+    if upper <= lower:
+        return None
+
+    grid = np.linspace(lower, upper, num_points)
+    matrix = np.empty((len(curves), num_points))
+    for row, (freq, values) in enumerate(curves):
+        if np.any(np.diff(freq) < 0):
+            order = np.argsort(freq, kind='stable')
+            freq, values = freq[order], values[order]
+        matrix[row] = np.interp(grid, freq, values, left=np.nan, right=np.nan)
+    return grid, _nanpercentiles(matrix)
+
+
+def compute_band_envelope(band_levels_list: List[dict], resolution: str) -> Optional[dict]:
+    """按标称中心频率对齐各车型的频带级后计算分位数，仅输出有数据的频带"""
+    nominal = BAND_DEFINITIONS[resolution][0]
+    column = {center: i for i, center in enumerate(nominal)}
+    rows = [levels.get(resolution) for levels in band_levels_list if levels and levels.get(resolution)]
+    if not rows:
+        return None
+
+    matrix = np.full((len(rows), len(nominal)), np.nan)
+    for row, band in enumerate(rows):
+        for center, value in zip(band.get('frequency') or [], band.get('values') or []):
+            index = column.get(center)
+            if index is not None and value is not None:
+                matrix[row, index] = value
+
+    present = ~np.isnan(matrix).all(axis=0)
+    percentiles = _nanpercentiles(matrix[:, present])
+    envelope = {'frequency': [nominal[i] for i in np.flatnonzero(present).tolist()]}
+    for key, values in zip(PERCENTILE_KEYS, percentiles):
+        envelope[key] = to_json_floats(values)
+    return envelope
+
+
+def compute_oa_percentiles(values) -> Optional[dict]:
+    data = np.asarray([float(v) for v in values if v is not None], dtype=np.float64)
+    if not len(data):
+        return None
+    return dict(zip(PERCENTILE_KEYS, to_json_floats(np.percentile(data, PERCENTILES))))
+
+
+# ==================== 二进制编码 ====================
+
+def encode_envelope(grid, percentiles) -> bytes:
+    return np.vstack([grid, percentiles]).astype(SPECTRUM_DTYPE).tobytes()
+
+
+def decode_envelope(blob):
+    """还原为 (公共频率网格, [分位数, 网格] 矩阵)"""
+    if not blob:
+        return None
+    data = np.frombuffer(blob, dtype=SPECTRUM_DTYPE).astype(np.float64)
+    data = data.reshape(len(PERCENTILES) + 1, -1)
+    return data[0], data[1:]
+
+
+# ==================== 包络维护 ====================
+
+# 单线程顺序重建，避免同一工况测点并发写入；_pending 为排队中的工况测点
+_rebuild_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='acoustic-envelope')
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _rebuild_pending():
+    try:
+        while True:
+            with _pending_lock:
+                if not _pending:
+                    return
+                condition_point_id = _pending.pop()
+            try:
+                rebuild_envelope(condition_point_id)
+            except Exception:
+                logger.exception('重建工况测点 %s 的车队统计包络失败', condition_point_id)
+    finally:
+        connections.close_all()
+
+
+def schedule_envelope_rebuild(condition_point_ids: Iterable[int]) -> None:
+    """事务提交后在后台线程重建指定工况测点的包络"""
+    ids = {cp_id for cp_id in condition_point_ids if cp_id is not None}
+    if not ids:
+        return
+
+    def _submit():
+        with _pending_lock:
+            added = ids - _pending
+            _pending.update(added)
+        if added:
+            _rebuild_executor.submit(_rebuild_pending)
+
+    transaction.on_commit(_submit)
+
+
+def mark_envelopes_dirty(condition_point_ids: Iterable[int]) -> None:
+    """测试数据变更后标记对应工况测点的包络待重建，并在提交后安排后台重建"""
+    ids = {cp_id for cp_id in condition_point_ids if cp_id is not None}
+    if ids:
+        AcousticEnvelope.objects.filter(condition_point_id__in=ids, is_dirty=False).update(is_dirty=True)
+        schedule_envelope_rebuild(ids)
+
+
+def rebuild_envelope(condition_point_id: int) -> AcousticEnvelope:
+    """按最新测试结果表重新计算单个工况测点的包络"""
+    latest = list(
+        AcousticLatestResult.objects
+        .filter(condition_point_id=condition_point_id)
+        .values_list('test_data_id', 'rms_value')
+    )
+    measure_type = (
+        ConditionMeasurePoint.objects
+        .filter(pk=condition_point_id)
+        .values_list('measure_type', flat=True)
+        .first()
+    )
+
+    narrowband_blob = None
+    band_envelopes = None
+    if latest and measure_type != ConditionMeasurePoint.MeasureType.SPEED:
+        records = (
+            AcousticTestData.objects
+            .filter(id__in=[test_data_id for test_data_id, _ in latest])
+            .only('id', 'spectrum_blob', 'band_levels')
+            .order_by()
+        )
+        curves = []
+        band_levels_list = []
+        for obj in records:
+            curves.append(load_spectrum_arrays(obj))
+            band_levels_list.append(obj.band_levels)
+        narrowband = compute_narrowband_envelope(curves)
+        if narrowband is not None:
+            narrowband_blob = encode_envelope(*narrowband)
+        band_envelopes = {
+            resolution: compute_band_envelope(band_levels_list, resolution)
+            for resolution in BAND_RESOLUTIONS
+        }
+
+    envelope, _ = AcousticEnvelope.objects.update_or_create(
+        condition_point_id=condition_point_id,
+        defaults={
+            'vehicle_count': len(latest),
+            'narrowband_blob': narrowband_blob,
+            'band_envelopes': band_envelopes,
+            'oa_percentiles': compute_oa_percentiles(rms for _, rms in latest),
+            'is_dirty': False,
+        },
+    )
+    return envelope
+
+
+def get_envelope(condition_point_id: int) -> AcousticEnvelope:
+    """
+    读取包络
+
+    待重建的包络直接返回上一版本（后台重建完成前）；尚未生成时同步生成，
+    并发首次查询同时创建导致唯一约束冲突时改为读取已生成的行。
+    """
+    envelope = AcousticEnvelope.objects.filter(condition_point_id=condition_point_id).first()
+    if envelope is not None:
+        if envelope.is_dirty:
+            # 后台重建可能因进程重启丢失，重新排队（已在队列中时不会重复执行）
+            schedule_envelope_rebuild([condition_point_id])
+        return envelope
+    try:
+        return rebuild_envelope(condition_point_id)
+    except IntegrityError:
+        return AcousticEnvelope.objects.get(condition_point_id=condition_point_id)
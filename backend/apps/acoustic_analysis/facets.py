@@ -0,0 +1,204 @@
+"""
+声学筛选项索引（工况 → 测点级联）
+
+AcousticFacet 表按数据来源记录 (车型, 工况测点) 组合，写入时由信号维护。
+读取时整表加载到进程内存并按版本号失效：版本号保存在 Django 缓存中，
+索引表有变化时在事务提交后递增；进程内副本另设有效期，
+即使缓存后端不在进程间共享，陈旧数据也最多保留 FACET_LOCAL_TTL 秒。
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.acoustic_analysis.models import (
+    AcousticFacet,
+    AcousticTestData,
+    ConditionMeasurePoint,
+    DynamicNoiseData,
+)
+
+
+FACET_VERSION_KEY = 'acoustic_facet:version'
+FACET_LOCAL_TTL = 60
+
+# 各数据来源对应的事实表及其 (车型, 工况测点) 字段名
+SOURCE_TABLES = {
+    AcousticFacet.Source.ACOUSTIC: (AcousticTestData, 'vehicle_model_id', 'condition_point_id'),
+    AcousticFacet.Source.DYNAMIC: (DynamicNoiseData, 'vehicle_model_id', 'condition_measure_point_id'),
+}
+
+_lock = threading.Lock()
+# (版本号, 加载时间, 索引)；整体替换，读取无需加锁
+_local = (None, 0.0, None)
+
+
+# ==================== 版本号 ====================
+
+def _current_version():
+    version = cache.get(FACET_VERSION_KEY)
+    if version is None:
+        cache.add(FACET_VERSION_KEY, 1, None)
+        version = cache.get(FACET_VERSION_KEY, 1)
+    return version
+
+
+def bump_facet_version():
+    """索引表变更后递增版本号；在事务提交后执行，避免其他请求缓存提交前的数据"""
+    def _bump():
+        try:
+            cache.incr(FACET_VERSION_KEY)
+        except ValueError:
+            cache.set(FACET_VERSION_KEY, 1, None)
+    transaction.on_commit(_bump)
+
+
+# ==================== 索引维护 ====================
+
+def sync_facets(source: str, pairs: Iterable[Tuple[int, int]]) -> None:
+    """根据事实表中是否仍有数据，新增或删除对应的 (车型, 工况测点) 索引行"""
+    model, vm_field, cp_field = SOURCE_TABLES[source]
+    changed = False
+    for vehicle_model_id, condition_point_id in set(pairs):
+        if vehicle_model_id is None or condition_point_id is None:
+            continue
+        exists = model.objects.filter(
+            **{vm_field: vehicle_model_id, cp_field: condition_point_id}
+        ).exists()
+        facet_qs = AcousticFacet.objects.filter(
+            source=source,
+            vehicle_model_id=vehicle_model_id,
+            condition_point_id=condition_point_id,
+        )
+        if exists:
+            if facet_qs.exists():
+                continue
+            cp = ConditionMeasurePoint.objects.filter(pk=condition_point_id).first()
+            if cp is None:
+                continue
+            AcousticFacet.objects.get_or_create(
+                source=source,
+                vehicle_model_id=vehicle_model_id,
+                condition_point=cp,
+                defaults={
+                    'work_condition': cp.work_condition,
+                    'measure_point': cp.measure_point,
+                    'measure_type': cp.measure_type,
+                },
+            )
+            changed = True
+        elif facet_qs.delete()[0]:
+            changed = True
+    if changed:
+        bump_facet_version()
+
+
+def sync_condition_point(cp: ConditionMeasurePoint) -> None:
+    """工况测点名称/类型变更时同步冗余字段"""
+    updated = (
+        AcousticFacet.objects
+        .filter(condition_point_id=cp.pk)
+        .exclude(
+            work_condition=cp.work_condition,
+            measure_point=cp.measure_point,
+            measure_type=cp.measure_type,
+        )
+        .update(
+            work_condition=cp.work_condition,
+            measure_point=cp.measure_point,
+            measure_type=cp.measure_type,
+        )
+    )
+    if updated:
+        bump_facet_version()
+
+
+def rebuild_facets() -> int:
+    """按事实表全量重建索引表，返回写入行数"""
+    objs = []
+    for source, (model, vm_field, cp_field) in SOURCE_TABLES.items():
+        cp_relation = cp_field[:-len('_id')]
+        rows = (
+            model.objects
+            .order_by()
+            .values_list(
+                vm_field,
+                cp_field,
+                f'{cp_relation}__work_condition',
+                f'{cp_relation}__measure_point',
+                f'{cp_relation}__measure_type',
+            )
+            .distinct()
+        )
+        objs.extend(
+            AcousticFacet(
+                source=source,
+                vehicle_model_id=vm_id,
+                condition_point_id=cp_id,
+                work_condition=wc,
+                measure_point=mp,
+                measure_type=mt,
+            )
+            for vm_id, cp_id, wc, mp, mt in rows
+        )
+    with transaction.atomic():
+        AcousticFacet.objects.all().delete()
+        AcousticFacet.objects.bulk_create(objs, batch_size=1000)
+        bump_facet_version()
+    return len(objs)
+
+
+# ==================== 索引读取 ====================
+
+def _load_index():
+    """{来源: {车型ID: {工况: {(测点类型, 测点), ...}}}}"""
+    index: Dict[str, Dict[int, Dict[str, set]]] = defaultdict(lambda: defaultdict(lambda: defaultdict(set)))
+    rows = AcousticFacet.objects.values_list(
+        'source', 'vehicle_model_id', 'work_condition', 'measure_point', 'measure_type'
+    )
+    for source, vm_id, wc, mp, mt in rows:
+        index[source][vm_id][wc].add((mt, mp))
+    return index
+
+
+def get_facet_index():
+    global _local
+    version = _current_version()
+    cached_version, loaded_at, index = _local
+    if index is not None and cached_version == version and time.monotonic() - loaded_at < FACET_LOCAL_TTL:
+        return index
+    with _lock:
+        cached_version, loaded_at, index = _local
+        if index is not None and cached_version == version and time.monotonic() - loaded_at < FACET_LOCAL_TTL:
+            return index
+        index = _load_index()
+        _local = (version, time.monotonic(), index)
+        return index
+
+
+def list_work_conditions(source: str, vehicle_model_ids: Sequence[int]) -> List[str]:
+    """指定车型下存在数据的工况（升序）"""
+    by_vehicle = get_facet_index().get(source, {})
+    values = set()
+    for vm_id in vehicle_model_ids:
+        values.update(by_vehicle.get(vm_id, {}).keys())
+    return sorted(values)
+
+
+def list_measure_points(
+    source: str, vehicle_model_ids: Sequence[int], work_conditions: Sequence[str]
+) -> List[Dict[str, str]]:
+    """指定车型与工况下存在数据的测点，按 (测点类型, 测点) 排序"""
+    by_vehicle = get_facet_index().get(source, {})
+    values = set()
+    for vm_id in vehicle_model_ids:
+        by_condition = by_vehicle.get(vm_id, {})
+        for wc in work_conditions:
+            values.update(by_condition.get(wc, ()))
+    return [
+        {'measure_point': mp, 'measure_type': mt}
+        for mt, mp in sorted(values)
+    ]
@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.acoustic_analysis.models import DynamicNoiseData
+from apps.nvh_benchmark.payload_cache import bump_global_generation
+from apps.wheel_performance.models import WheelPerformance
+from utils.curves import CURVE_SCHEMA_VERSION, normalize_force_transfer_signal
+
+
+def _outdated(field):
+    """缺少规范曲线或版本号与当前规则不一致"""
+    return Q(**{f'{field}__isnull': True}) | ~Q(**{f'{field}__version': CURVE_SCHEMA_VERSION})
+
+
+class Command(BaseCommand):
+    help = '为历史动态噪声与车轮性能数据生成规范曲线（声压级/语音清晰度/力传递一阶曲线）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='每批处理的记录数',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='重新生成所有记录（默认仅处理缺少规范曲线或版本过期的记录）',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = max(1, options['batch_size'])
+        force = options['force']
+
+        dynamic_qs = DynamicNoiseData.objects.all()
+        if not force:
+            dynamic_qs = dynamic_qs.filter(
+                _outdated('sound_pressure_normalized') | _outdated('speech_clarity_normalized')
+            )
+        self._process(
+            '动态噪声数据',
+            DynamicNoiseData,
+            dynamic_qs,
+            ['sound_pressure_curve', 'speech_clarity_curve'],
+            ['sound_pressure_normalized', 'speech_clarity_normalized'],
+            lambda row: row.refresh_normalized_curves(),
+        )
+
+        wheel_qs = WheelPerformance.objects.all()
+        if not force:
+            wheel_qs = wheel_qs.filter(_outdated('force_transfer_normalized'))
+        self._process(
+            '车轮性能数据',
+            WheelPerformance,
+            wheel_qs,
+            ['force_transfer_signal'],
+            ['force_transfer_normalized'],
+            lambda row: setattr(
+                row, 'force_transfer_normalized', normalize_force_transfer_signal(row.force_transfer_signal)
+            ),
+        )
+        # bulk_update 不触发保存信号，对标数据缓存需整体失效
+        bump_global_generation()
+
+    def _process(self, label, model, qs, source_fields, target_fields, refresh):
+        ids = list(qs.order_by('id').values_list('id', flat=True))
+        if not ids:
+            self.stdout.write(f'{label}：没有需要处理的记录')
+            return
+
+        self.stdout.write(f'开始处理 {len(ids)} 条{label}...')
+        updated = 0
+        for start in range(0, len(ids), self.batch_size):
+            rows = list(
+                model.objects
+                .filter(id__in=ids[start:start + self.batch_size])
+                .only('id', *source_fields)
+            )
+            for row in rows:
+                refresh(row)
+            model.objects.bulk_update(rows, target_fields)
+            updated += len(rows)
+            self.stdout.write(f'已处理 {updated}/{len(ids)}')
+
+        self.stdout.write(self.style.SUCCESS(f'成功生成 {updated} 条{label}的规范曲线'))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.acoustic_analysis.envelope import mark_envelopes_dirty
+from apps.acoustic_analysis.models import AcousticTestData, ConditionMeasurePoint
+from apps.acoustic_analysis.services import refresh_spectrum_derivatives
+
+
+class Command(BaseCommand):
+    help = '为历史声学测试数据生成频谱二进制数据与频带级数据'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='每批处理的记录数',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='重新生成所有记录（默认仅处理缺少派生数据的记录）',
+        )
+        parser.add_argument(
+            '--condition-point',
+            type=int,
+            action='append',
+            dest='condition_points',
+            help='仅处理指定工况测点 ID 的记录（可重复指定，隐含 --force）',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+
+        qs = AcousticTestData.objects.filter(spectrum_json__isnull=False)
+        if options['condition_points']:
+            qs = qs.filter(condition_point_id__in=options['condition_points'])
+        elif not options['force']:
+            # 转速测点不计算频带级，band_levels 始终为空，无需重复处理
+            qs = qs.filter(
+                Q(spectrum_blob__isnull=True)
+                | (
+                    Q(band_levels__isnull=True)
+                    & ~Q(condition_point__measure_type=ConditionMeasurePoint.MeasureType.SPEED)
+                )
+            )
+        ids = list(qs.order_by('id').values_list('id', flat=True))
+        if not ids:
+            self.stdout.write('没有需要处理的记录')
+            return
+
+        self.stdout.write(f'开始处理 {len(ids)} 条声学测试数据...')
+        updated = 0
+        for updated in refresh_spectrum_derivatives(ids, batch_size=batch_size):
+            self.stdout.write(f'已处理 {updated}/{len(ids)}')
+        mark_envelopes_dirty(
+            AcousticTestData.objects.filter(id__in=ids).values_list('condition_point_id', flat=True).distinct()
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'成功生成 {updated} 条频谱派生数据'))
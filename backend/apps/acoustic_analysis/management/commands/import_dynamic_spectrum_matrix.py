@@ -0,0 +1,43 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.acoustic_analysis.dynamic_spectrum import SpectrumMatrixError, convert_npz_to_npy
+from apps.acoustic_analysis.models import DynamicNoiseData
+
+
+# 矩阵目录相对于 MEDIA_ROOT 的存放位置
+MATRIX_ROOT = 'dynamic_noise_data/spectrum_matrix'
+
+
+class Command(BaseCommand):
+    help = '将动态噪声三维频谱 .npz 文件转换为可内存映射的 .npy 目录并关联到记录'
+
+    def add_arguments(self, parser):
+        parser.add_argument('record_id', type=int, help='动态噪声数据记录ID')
+        parser.add_argument('npz_path', help='.npz 文件路径（frequencies / speeds|rpms / db_data）')
+
+    def handle(self, *args, **options):
+        record_id = options['record_id']
+        npz_path = options['npz_path']
+
+        try:
+            obj = DynamicNoiseData.objects.get(pk=record_id)
+        except DynamicNoiseData.DoesNotExist:
+            raise CommandError(f'动态噪声数据不存在: {record_id}')
+        if not os.path.isfile(npz_path):
+            raise CommandError(f'文件不存在: {npz_path}')
+
+        rel_dir = f'{MATRIX_ROOT}/{record_id}'
+        target_dir = os.path.join(settings.MEDIA_ROOT, *rel_dir.split('/'))
+        try:
+            freq_count, axis_count = convert_npz_to_npy(npz_path, target_dir)
+        except SpectrumMatrixError as exc:
+            raise CommandError(str(exc))
+
+        obj.spectrum_matrix_path = rel_dir
+        obj.save(update_fields=['spectrum_matrix_path'])
+        self.stdout.write(self.style.SUCCESS(
+            f'成功转换 {freq_count} × {axis_count} 三维频谱矩阵: {rel_dir}'
+        ))
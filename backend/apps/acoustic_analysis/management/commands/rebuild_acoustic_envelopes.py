@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from apps.acoustic_analysis.envelope import rebuild_envelope
+from apps.acoustic_analysis.models import AcousticEnvelope, AcousticLatestResult
+
+
+class Command(BaseCommand):
+    help = '重建车队统计包络（默认仅处理待重建或尚未生成的工况测点）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='重建所有工况测点的包络',
+        )
+
+    def handle(self, *args, **options):
+        cp_ids = set(
+            AcousticLatestResult.objects.order_by().values_list('condition_point_id', flat=True).distinct()
+        )
+        if not options['all']:
+            clean_ids = set(
+                AcousticEnvelope.objects.filter(is_dirty=False).values_list('condition_point_id', flat=True)
+            )
+            dirty_ids = set(
+                AcousticEnvelope.objects.filter(is_dirty=True).values_list('condition_point_id', flat=True)
+            )
+            cp_ids = (cp_ids - clean_ids) | dirty_ids
+        if not cp_ids:
+            self.stdout.write('没有需要处理的工况测点')
+            return
+
+        self.stdout.write(f'开始重建 {len(cp_ids)} 个工况测点的包络...')
+        for index, cp_id in enumerate(sorted(cp_ids), start=1):
+            envelope = rebuild_envelope(cp_id)
+            self.stdout.write(f'[{index}/{len(cp_ids)}] 工况测点 {cp_id}: {envelope.vehicle_count} 个车型')
+
+        self.stdout.write(self.style.SUCCESS(f'成功重建 {len(cp_ids)} 个工况测点的包络'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.acoustic_analysis.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = '全量重建声学筛选项索引表（工况/测点级联下拉）'
+
+    def handle(self, *args, **options):
+        self.stdout.write('开始重建声学筛选项索引...')
+        count = rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f'成功写入 {count} 条筛选项索引'))
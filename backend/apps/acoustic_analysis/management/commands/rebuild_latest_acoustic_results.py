@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.acoustic_analysis.services import rebuild_latest_results
+from apps.nvh_benchmark.payload_cache import bump_global_generation
+
+
+class Command(BaseCommand):
+    help = '全量重建最新声学测试结果表（批量导入或直接改库后执行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批写入的记录数',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        self.stdout.write('开始重建最新声学测试结果...')
+        count = rebuild_latest_results(batch_size=batch_size)
+        # 批量写入不触发信号，对标数据缓存需整体失效
+        bump_global_generation()
+        self.stdout.write(self.style.SUCCESS(f'成功写入 {count} 条最新测试结果'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0006_dynamicnoisedata_spectrum_image_path_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='acoustictestdata',
+            name='spectrum_blob',
+            field=models.BinaryField(blank=True, null=True, verbose_name='频谱二进制数据'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0007_acoustictestdata_spectrum_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='acoustictestdata',
+            name='band_levels',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='频带级数据'),
+        ),
+    ]
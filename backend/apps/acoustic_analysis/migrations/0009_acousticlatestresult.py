@@ -0,0 +1,70 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+def populate_latest_results(apps, schema_editor):
+    """按 (车型, 工况测点) 取最新测试记录，初始化最新测试结果表"""
+    AcousticTestData = apps.get_model('acoustic_analysis', 'AcousticTestData')
+    AcousticLatestResult = apps.get_model('acoustic_analysis', 'AcousticLatestResult')
+    rows = (
+        AcousticTestData.objects
+        .order_by()
+        .annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('vehicle_model_id'), F('condition_point_id')],
+                order_by=[F('test_date').desc(nulls_last=True), F('id').desc()],
+            )
+        )
+        .filter(row_number=1)
+        .values_list('id', 'vehicle_model_id', 'condition_point_id', 'rms_value', 'speech_clarity', 'test_date')
+    )
+    AcousticLatestResult.objects.bulk_create(
+        [
+            AcousticLatestResult(
+                test_data_id=record_id,
+                vehicle_model_id=vm_id,
+                condition_point_id=cp_id,
+                rms_value=rms_value,
+                speech_clarity=speech_clarity,
+                test_date=test_date,
+            )
+            for record_id, vm_id, cp_id, rms_value, speech_clarity, test_date in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0008_acoustictestdata_band_levels'),
+        ('modal', '0015_alter_airtightnessimage_door_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AcousticLatestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('speech_clarity', models.DecimalField(blank=True, decimal_places=4, max_digits=10, null=True, verbose_name='语音清晰度')),
+                ('rms_value', models.DecimalField(blank=True, decimal_places=4, max_digits=10, null=True, verbose_name='有效值')),
+                ('test_date', models.DateField(blank=True, null=True, verbose_name='测试日期')),
+                ('condition_point', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='latest_results', to='acoustic_analysis.conditionmeasurepoint', verbose_name='工况测点')),
+                ('test_data', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='latest_result', to='acoustic_analysis.acoustictestdata', verbose_name='最新测试记录')),
+                ('vehicle_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='acoustic_latest_results', to='modal.vehiclemodel', verbose_name='车型信息')),
+            ],
+            options={
+                'verbose_name': '最新声学测试结果',
+                'verbose_name_plural': '最新声学测试结果',
+                'db_table': 'acoustic_latest_result',
+                'indexes': [models.Index(fields=['condition_point', 'test_date'], name='idx_latest_cp_date')],
+                'constraints': [models.UniqueConstraint(fields=('vehicle_model', 'condition_point'), name='uniq_latest_vm_cp')],
+            },
+        ),
+        migrations.RunPython(populate_latest_results, migrations.RunPython.noop),
+    ]
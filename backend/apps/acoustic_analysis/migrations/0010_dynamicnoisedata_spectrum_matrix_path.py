@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0009_acousticlatestresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dynamicnoisedata',
+            name='spectrum_matrix_path',
+            field=models.CharField(blank=True, max_length=500, verbose_name='三维频谱矩阵目录(.npy)'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_facets(apps, schema_editor):
+    """按声学测试数据与动态噪声数据初始化筛选项索引表"""
+    AcousticFacet = apps.get_model('acoustic_analysis', 'AcousticFacet')
+    sources = (
+        ('acoustic', apps.get_model('acoustic_analysis', 'AcousticTestData'), 'condition_point'),
+        ('dynamic', apps.get_model('acoustic_analysis', 'DynamicNoiseData'), 'condition_measure_point'),
+    )
+    objs = []
+    for source, model, cp_field in sources:
+        rows = (
+            model.objects
+            .order_by()
+            .values_list(
+                'vehicle_model_id',
+                f'{cp_field}_id',
+                f'{cp_field}__work_condition',
+                f'{cp_field}__measure_point',
+                f'{cp_field}__measure_type',
+            )
+            .distinct()
+        )
+        objs.extend(
+            AcousticFacet(
+                source=source,
+                vehicle_model_id=vm_id,
+                condition_point_id=cp_id,
+                work_condition=wc,
+                measure_point=mp,
+                measure_type=mt,
+            )
+            for vm_id, cp_id, wc, mp, mt in rows
+        )
+    AcousticFacet.objects.bulk_create(objs, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0010_dynamicnoisedata_spectrum_matrix_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AcousticFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('acoustic', '声学测试数据'), ('dynamic', '动态噪声数据')], max_length=20, verbose_name='数据来源')),
+                ('vehicle_model_id', models.IntegerField(verbose_name='车型ID')),
+                ('work_condition', models.CharField(max_length=100, verbose_name='工况')),
+                ('measure_point', models.CharField(max_length=100, verbose_name='测点')),
+                ('measure_type', models.CharField(choices=[('noise', '噪声'), ('vibration', '振动'), ('speed', '转速')], default='noise', max_length=20, verbose_name='测点类型')),
+                ('condition_point', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='acoustic_analysis.conditionmeasurepoint', verbose_name='工况测点')),
+            ],
+            options={
+                'verbose_name': '声学筛选项索引',
+                'verbose_name_plural': '声学筛选项索引',
+                'db_table': 'acoustic_facet',
+                'constraints': [models.UniqueConstraint(fields=('source', 'vehicle_model_id', 'condition_point'), name='uniq_facet_source_vm_cp')],
+            },
+        ),
+        migrations.RunPython(populate_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0011_acousticfacet'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AcousticEnvelope',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vehicle_count', models.IntegerField(default=0, verbose_name='参与统计车型数')),
+                ('narrowband_blob', models.BinaryField(blank=True, null=True, verbose_name='窄带包络二进制数据')),
+                ('band_envelopes', models.JSONField(blank=True, null=True, verbose_name='频带包络数据')),
+                ('oa_percentiles', models.JSONField(blank=True, null=True, verbose_name='有效值分位数')),
+                ('is_dirty', models.BooleanField(db_index=True, default=True, verbose_name='待重建')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('condition_point', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='envelope', to='acoustic_analysis.conditionmeasurepoint', verbose_name='工况测点')),
+            ],
+            options={
+                'verbose_name': '车队统计包络',
+                'verbose_name_plural': '车队统计包络',
+                'db_table': 'acoustic_envelope',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('acoustic_analysis', '0012_acousticenvelope'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dynamicnoisedata',
+            name='sound_pressure_normalized',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='声压级曲线（规范化）'),
+        ),
+        migrations.AddField(
+            model_name='dynamicnoisedata',
+            name='speech_clarity_normalized',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='语音清晰度曲线（规范化）'),
+        ),
+    ]
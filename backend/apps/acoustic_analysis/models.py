@@ -1,5 +1,8 @@
 from django.db import models
 
+from apps.acoustic_analysis.spectrum import build_band_levels, encode_spectrum_arrays, parse_spectrum_arrays
+from utils.curves import SOUND_PRESSURE_Y_KEYS, SPEECH_CLARITY_Y_KEYS, normalize_speed_curve
+
 
 class ConditionMeasurePoint(models.Model):
     """工况测点维度表：仅存储工况与测点"""
@@ -53,6 +56,11 @@ class AcousticTestData(models.Model):
     # 频谱数据（约12000个数据点）
     # 格式：{"frequency": [...], "dB": [...]}
     spectrum_json = models.JSONField(null=True, blank=True, verbose_name='频谱数据JSON')
+    # 频谱二进制数据：float32 频率数组 + float32 幅值数组，由 spectrum_json 在保存时生成
+    spectrum_blob = models.BinaryField(null=True, blank=True, editable=False, verbose_name='频谱二进制数据')
+    # 频带级数据（由窄带频谱能量叠加得到），与 spectrum_blob 同时生成
+    # 格式：{"third_octave": {"frequency": [...], "values": [...]}, "octave": {...}}
+    band_levels = models.JSONField(null=True, blank=True, editable=False, verbose_name='频带级数据')
 
     # 总声压级数据（约20个数据点）
     # 格式：{"time": [...], "OA": [...]}
@@ -89,6 +97,173 @@ class AcousticTestData(models.Model):
         mp = getattr(self.condition_point, 'measure_point', '')
         return f"{self.vehicle_model_id} - {wc} - {mp}"
 
+    def refresh_spectrum_data(self):
+        """根据 spectrum_json 重新生成频谱二进制数据与频带级数据"""
+        freq, values = parse_spectrum_arrays(self.spectrum_json)
+        self.spectrum_blob = encode_spectrum_arrays(freq, values)
+
+        measure_type = getattr(self.condition_point, 'measure_type', ConditionMeasurePoint.MeasureType.NOISE)
+        if measure_type == ConditionMeasurePoint.MeasureType.SPEED:
+            self.band_levels = None
+        else:
+            # 噪声按 dB 能量叠加，振动按线性幅值均方根叠加
+            linear = measure_type == ConditionMeasurePoint.MeasureType.VIBRATION
+            self.band_levels = build_band_levels(freq, values, linear=linear)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 记录加载时的工况测点，保存时据此判断测点类型（dB/线性）是否可能变化
+        instance._loaded_condition_point_id = instance.__dict__.get('condition_point_id')
+        return instance
+
+    def _condition_point_changed(self, update_fields) -> bool:
+        if not hasattr(self, '_loaded_condition_point_id'):
+            return False
+        if update_fields is not None and not {'condition_point', 'condition_point_id'} & set(update_fields):
+            return False
+        return self._loaded_condition_point_id != self.condition_point_id
+
+    def save(self, *args, **kwargs):
+        # 入库时同步生成频谱派生数据：spectrum_json 更新或工况测点变更（频带级依赖测点类型）时重新生成
+        update_fields = kwargs.get('update_fields')
+        spectrum_updated = (
+            'spectrum_json' not in self.get_deferred_fields()
+            and (update_fields is None or 'spectrum_json' in update_fields)
+        )
+        if spectrum_updated or self._condition_point_changed(update_fields):
+            if 'spectrum_json' in self.get_deferred_fields():
+                self.refresh_from_db(fields=['spectrum_json'])
+            self.refresh_spectrum_data()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'spectrum_blob', 'band_levels'}
+        super().save(*args, **kwargs)
+        self._loaded_condition_point_id = self.condition_point_id
+
+
+class AcousticLatestResult(models.Model):
+    """
+    最新声学测试结果表：每个 (车型, 工况测点) 仅保留最新一条测试记录的标量结果
+
+    由 AcousticTestData 的保存/删除信号维护（见 signals.py），
+    批量写入（queryset.update / bulk_create）不会触发信号，需执行 rebuild_latest_acoustic_results 重建。
+    """
+
+    vehicle_model = models.ForeignKey(
+        'modal.VehicleModel',
+        on_delete=models.CASCADE,
+        related_name='acoustic_latest_results',
+        verbose_name='车型信息'
+    )
+    condition_point = models.ForeignKey(
+        ConditionMeasurePoint,
+        on_delete=models.CASCADE,
+        related_name='latest_results',
+        verbose_name='工况测点'
+    )
+    test_data = models.OneToOneField(
+        AcousticTestData,
+        on_delete=models.CASCADE,
+        related_name='latest_result',
+        verbose_name='最新测试记录'
+    )
+
+    speech_clarity = models.DecimalField(max_digits=10, decimal_places=4, null=True, blank=True, verbose_name='语音清晰度')
+    rms_value = models.DecimalField(max_digits=10, decimal_places=4, null=True, blank=True, verbose_name='有效值')
+    test_date = models.DateField(null=True, blank=True, verbose_name='测试日期')
+
+    class Meta:
+        db_table = 'acoustic_latest_result'
+        verbose_name = '最新声学测试结果'
+        verbose_name_plural = '最新声学测试结果'
+        constraints = [
+            models.UniqueConstraint(fields=['vehicle_model', 'condition_point'], name='uniq_latest_vm_cp'),
+        ]
+        indexes = [
+            models.Index(fields=['condition_point', 'test_date'], name='idx_latest_cp_date'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vehicle_model_id} - {self.condition_point_id} - {self.test_date}"
+
+
+class AcousticEnvelope(models.Model):
+    """
+    车队统计包络表：每个工况测点下全部车型（各取最新一条测试记录）的 P10/P50/P90 曲线
+
+    - narrowband_blob：窄带包络，float32 二进制（公共频率网格 + P10 + P50 + P90，等长）
+    - band_envelopes：频带包络，格式 {"third_octave": {"frequency": [...], "p10": [...], "p50": [...], "p90": [...]}, ...}
+    - oa_percentiles：有效值分位数，格式 {"p10": x, "p50": x, "p90": x}
+    测试数据变更时由信号标记 is_dirty，查询时或执行 rebuild_acoustic_envelopes 时增量重建。
+    """
+
+    condition_point = models.OneToOneField(
+        ConditionMeasurePoint,
+        on_delete=models.CASCADE,
+        related_name='envelope',
+        verbose_name='工况测点'
+    )
+    vehicle_count = models.IntegerField(default=0, verbose_name='参与统计车型数')
+    narrowband_blob = models.BinaryField(null=True, blank=True, editable=False, verbose_name='窄带包络二进制数据')
+    band_envelopes = models.JSONField(null=True, blank=True, verbose_name='频带包络数据')
+    oa_percentiles = models.JSONField(null=True, blank=True, verbose_name='有效值分位数')
+    is_dirty = models.BooleanField(default=True, db_index=True, verbose_name='待重建')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'acoustic_envelope'
+        verbose_name = '车队统计包络'
+        verbose_name_plural = '车队统计包络'
+
+    def __str__(self) -> str:
+        return f"{self.condition_point_id} - {self.vehicle_count}"
+
+
+class AcousticFacet(models.Model):
+    """
+    声学筛选项索引表：记录每个数据来源下 (车型, 工况测点) 是否存在数据
+
+    供工况 → 测点级联下拉使用，避免每次在大表上做 DISTINCT + JOIN。
+    由 AcousticTestData / DynamicNoiseData / ConditionMeasurePoint 的信号维护（见 signals.py），
+    批量写入后需执行 rebuild_acoustic_facets 重建。
+    """
+
+    class Source(models.TextChoices):
+        ACOUSTIC = 'acoustic', '声学测试数据'
+        DYNAMIC = 'dynamic', '动态噪声数据'
+
+    source = models.CharField(max_length=20, choices=Source.choices, verbose_name='数据来源')
+    vehicle_model_id = models.IntegerField(verbose_name='车型ID')
+    condition_point = models.ForeignKey(
+        ConditionMeasurePoint,
+        on_delete=models.CASCADE,
+        related_name='facets',
+        verbose_name='工况测点'
+    )
+    # 以下字段冗余自工况测点，工况测点变更时同步更新
+    work_condition = models.CharField(max_length=100, verbose_name='工况')
+    measure_point = models.CharField(max_length=100, verbose_name='测点')
+    measure_type = models.CharField(
+        max_length=20,
+        choices=ConditionMeasurePoint.MeasureType.choices,
+        default=ConditionMeasurePoint.MeasureType.NOISE,
+        verbose_name='测点类型',
+    )
+
+    class Meta:
+        db_table = 'acoustic_facet'
+        verbose_name = '声学筛选项索引'
+        verbose_name_plural = '声学筛选项索引'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'vehicle_model_id', 'condition_point'],
+                name='uniq_facet_source_vm_cp',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.source} - {self.vehicle_model_id} - {self.work_condition} - {self.measure_point}"
+
 
 class DynamicNoiseData(models.Model):
     """动态噪声数据表"""
@@ -115,10 +290,15 @@ class DynamicNoiseData(models.Model):
     sound_pressure_curve = models.JSONField(verbose_name='声压级曲线数据')
     # 数据格式: {"speed/rpm": [...], "%AI": [...]}
     speech_clarity_curve = models.JSONField(verbose_name='语音清晰度曲线数据')
+    # 入库时生成的规范曲线 {"version": 1, "x": [...], "y": [...]}，见 utils/curves.py
+    sound_pressure_normalized = models.JSONField(null=True, blank=True, editable=False, verbose_name='声压级曲线（规范化）')
+    speech_clarity_normalized = models.JSONField(null=True, blank=True, editable=False, verbose_name='语音清晰度曲线（规范化）')
 
     noise_analysis_image = models.CharField(max_length=500, verbose_name='噪声分析图路径', blank=True)
     audio_file = models.CharField(max_length=500, verbose_name='音频文件路径(.wav)', blank=True)
     spectrum_file = models.CharField(max_length=500, verbose_name='三维频谱文件路径(.pptx)', blank=True)
+    # 三维频谱矩阵目录（frequencies.npy / axis.npy / levels.npy），由 import_dynamic_spectrum_matrix 生成
+    spectrum_matrix_path = models.CharField(max_length=500, verbose_name='三维频谱矩阵目录(.npy)', blank=True)
     spectrum_image_path = models.CharField(
         max_length=500,
         blank=True,
@@ -137,6 +317,35 @@ class DynamicNoiseData(models.Model):
             models.Index(fields=['x_axis_type'], name='idx_dyn_x_axis'),
         ]
 
+    # 原始曲线字段 → (规范曲线字段, y 轴候选键名)
+    NORMALIZED_CURVES = {
+        'sound_pressure_curve': ('sound_pressure_normalized', SOUND_PRESSURE_Y_KEYS),
+        'speech_clarity_curve': ('speech_clarity_normalized', SPEECH_CLARITY_Y_KEYS),
+    }
+
+    def refresh_normalized_curves(self, fields=None):
+        """根据原始曲线重新生成规范曲线，返回更新的字段名"""
+        updated = []
+        for raw_field, (target_field, y_keys) in self.NORMALIZED_CURVES.items():
+            if fields is not None and raw_field not in fields:
+                continue
+            setattr(self, target_field, normalize_speed_curve(getattr(self, raw_field), y_keys))
+            updated.append(target_field)
+        return updated
+
+    def save(self, *args, **kwargs):
+        # 入库时同步生成规范曲线；原始曲线未加载或未更新时保持原值
+        update_fields = kwargs.get('update_fields')
+        deferred = self.get_deferred_fields()
+        fields = [
+            raw_field for raw_field in self.NORMALIZED_CURVES
+            if raw_field not in deferred and (update_fields is None or raw_field in update_fields)
+        ]
+        updated = self.refresh_normalized_curves(fields)
+        if update_fields is not None and updated:
+            kwargs['update_fields'] = {*update_fields, *updated}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         cmp_obj = getattr(self, 'condition_measure_point', None)
         wc = getattr(cmp_obj, 'work_condition', '')
@@ -1,6 +1,13 @@
 from rest_framework import serializers
 
 from apps.acoustic_analysis.models import AcousticTestData, DynamicNoiseData
+from apps.acoustic_analysis.spectrum import (
+    GRID_LINEAR,
+    GRID_LOG,
+    RESOLUTION_NARROWBAND,
+    RESOLUTION_OCTAVE,
+    RESOLUTION_THIRD_OCTAVE,
+)
 from apps.modal.models import VehicleModel
 
 
@@ -55,6 +62,14 @@ class AcousticQuerySerializer(serializers.Serializer):
     measure_points = serializers.ListField(
         child=serializers.CharField(max_length=100), allow_empty=False
     )
+    # 每条曲线最多返回的点数，超出时按 min/max 降采样；不传则返回全部数据
+    max_points = serializers.IntegerField(required=False, allow_null=True, min_value=10, max_value=20000)
+    # 频谱分辨率：窄带原始数据 / 1/3 倍频程 / 倍频程
+    resolution = serializers.ChoiceField(
+        choices=[RESOLUTION_NARROWBAND, RESOLUTION_THIRD_OCTAVE, RESOLUTION_OCTAVE],
+        required=False,
+        default=RESOLUTION_NARROWBAND,
+    )
 
     def validate(self, attrs):
         vm_ids = attrs.get('vehicle_model_ids')
@@ -73,6 +88,71 @@ class AcousticQuerySerializer(serializers.Serializer):
         return attrs
 
 
+class AcousticCompareSerializer(serializers.Serializer):
+    """多车型频谱对比参数"""
+
+    vehicle_model_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), min_length=2, max_length=20
+    )
+    reference_vehicle_id = serializers.IntegerField(min_value=1)
+    work_conditions = serializers.ListField(
+        child=serializers.CharField(max_length=100), allow_empty=False
+    )
+    measure_points = serializers.ListField(
+        child=serializers.CharField(max_length=100), allow_empty=False
+    )
+    # 公共频率网格：点数与刻度（对数/线性），可选限定频率范围
+    num_points = serializers.IntegerField(required=False, default=1000, min_value=10, max_value=20000)
+    scale = serializers.ChoiceField(choices=[GRID_LOG, GRID_LINEAR], required=False, default=GRID_LOG)
+    f_min = serializers.FloatField(required=False, allow_null=True, min_value=0)
+    f_max = serializers.FloatField(required=False, allow_null=True, min_value=0)
+    # 差值极值统计使用的频带
+    band_resolution = serializers.ChoiceField(
+        choices=[RESOLUTION_THIRD_OCTAVE, RESOLUTION_OCTAVE],
+        required=False,
+        default=RESOLUTION_THIRD_OCTAVE,
+    )
+
+    def validate(self, attrs):
+        vm_ids = list(dict.fromkeys(attrs['vehicle_model_ids']))
+        if attrs['reference_vehicle_id'] not in vm_ids:
+            raise serializers.ValidationError('参考车型必须在所选车型中')
+        cnt = VehicleModel.objects.filter(id__in=vm_ids).count()
+        if cnt != len(vm_ids):
+            raise serializers.ValidationError('部分车型ID不存在')
+        f_min, f_max = attrs.get('f_min'), attrs.get('f_max')
+        if f_min is not None and f_max is not None and f_min >= f_max:
+            raise serializers.ValidationError('f_min 必须小于 f_max')
+
+        combos = len(vm_ids) * len(attrs['work_conditions']) * len(attrs['measure_points'])
+        if combos > 100:
+            raise serializers.ValidationError('每次对比的组合数量最多100条，请减少选择范围')
+        attrs['vehicle_model_ids'] = vm_ids
+        return attrs
+
+
+class AcousticEnvelopeQuerySerializer(serializers.Serializer):
+    """车队统计包络查询参数：工况测点ID 或 工况 + 测点 二选一"""
+
+    condition_point_id = serializers.IntegerField(required=False, min_value=1)
+    work_condition = serializers.CharField(required=False, max_length=100)
+    measure_point = serializers.CharField(required=False, max_length=100)
+    resolution = serializers.ChoiceField(
+        choices=[RESOLUTION_NARROWBAND, RESOLUTION_THIRD_OCTAVE, RESOLUTION_OCTAVE],
+        required=False,
+        default=RESOLUTION_NARROWBAND,
+    )
+    # 可选：叠加显示的车型（取其在该工况测点下的最新测试记录）
+    vehicle_model_id = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if attrs.get('condition_point_id'):
+            return attrs
+        if not attrs.get('work_condition') or not attrs.get('measure_point'):
+            raise serializers.ValidationError('请提供 condition_point_id，或同时提供 work_condition 与 measure_point')
+        return attrs
+
+
 class AcousticTableItemSerializer(serializers.ModelSerializer):
     vehicle_model_name = serializers.CharField(source='vehicle_model.vehicle_model_name', read_only=True)
     work_condition = serializers.CharField(source='condition_point.work_condition', read_only=True)
@@ -176,6 +256,8 @@ class DynamicNoiseQuerySerializer(serializers.Serializer):
     )
     page = serializers.IntegerField(required=False, default=1, min_value=1)
     page_size = serializers.IntegerField(required=False, default=10, min_value=1, max_value=100)
+    # 每条曲线最多返回的点数，超出时按 min/max 降采样；不传则返回全部数据
+    max_points = serializers.IntegerField(required=False, allow_null=True, min_value=10, max_value=20000)
 
     def validate(self, attrs):
         vm_ids = attrs.get('vehicle_model_ids') or []
@@ -190,6 +272,42 @@ class DynamicNoiseQuerySerializer(serializers.Serializer):
         return attrs
 
 
+class DynamicSpectrumSliceSerializer(serializers.Serializer):
+    """三维频谱切片查询参数"""
+
+    MODE_SPECTRUM = 'spectrum'
+    MODE_FREQUENCY = 'frequency'
+    MODE_BAND = 'band'
+    MODE_TILE = 'tile'
+
+    mode = serializers.ChoiceField(choices=[MODE_SPECTRUM, MODE_FREQUENCY, MODE_BAND, MODE_TILE])
+    # spectrum：指定车速/转速下的频谱
+    x = serializers.FloatField(required=False)
+    # frequency：指定频率随车速/转速的变化
+    frequency = serializers.FloatField(required=False, min_value=0)
+    f_min = serializers.FloatField(required=False, min_value=0)
+    f_max = serializers.FloatField(required=False, min_value=0)
+    x_min = serializers.FloatField(required=False)
+    x_max = serializers.FloatField(required=False)
+    max_points = serializers.IntegerField(required=False, min_value=10, max_value=20000)
+    # tile：降采样热力图尺寸
+    max_rows = serializers.IntegerField(required=False, default=200, min_value=10, max_value=1000)
+    max_cols = serializers.IntegerField(required=False, default=400, min_value=10, max_value=2000)
+
+    def validate(self, attrs):
+        mode = attrs['mode']
+        if mode == self.MODE_SPECTRUM and attrs.get('x') is None:
+            raise serializers.ValidationError('spectrum 模式需要参数 x')
+        if mode == self.MODE_FREQUENCY and attrs.get('frequency') is None:
+            raise serializers.ValidationError('frequency 模式需要参数 frequency')
+        if mode == self.MODE_BAND and (attrs.get('f_min') is None or attrs.get('f_max') is None):
+            raise serializers.ValidationError('band 模式需要参数 f_min 与 f_max')
+        for lower, upper in (('f_min', 'f_max'), ('x_min', 'x_max')):
+            if attrs.get(lower) is not None and attrs.get(upper) is not None and attrs[lower] > attrs[upper]:
+                raise serializers.ValidationError(f'{lower} 不能大于 {upper}')
+        return attrs
+
+
 class DynamicNoiseTableSerializer(serializers.ModelSerializer):
     vehicle_model_name = serializers.CharField(read_only=True)
     work_condition = serializers.CharField(source='condition_measure_point.work_condition', read_only=True)
@@ -0,0 +1,284 @@
+"""
+声学分析业务逻辑服务层
+封装：频谱派生数据生成、最新测试结果表维护、最新测试记录批量解析、多车型频谱对比
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from apps.acoustic_analysis.models import AcousticLatestResult, AcousticTestData, ConditionMeasurePoint
+from apps.acoustic_analysis.spectrum import (
+    band_extrema,
+    common_frequency_grid,
+    interpolate_curves,
+    load_spectrum_arrays,
+    to_json_floats,
+)
+
+
+# 最新测试结果表中冗余的标量字段
+LATEST_RESULT_FIELDS = ('rms_value', 'speech_clarity', 'test_date')
+
+
+# ==================== 频谱派生数据 ====================
+
+def refresh_spectrum_derivatives(ids: Sequence[int], batch_size: int = 200):
+    """
+    按主键分批重新生成频谱二进制数据与频带级数据，逐批返回已处理数
+
+    bulk_update 不触发保存信号，调用方负责标记车队包络待重建。
+    """
+    ids = list(ids)
+    processed = 0
+    for start in range(0, len(ids), batch_size):
+        rows = list(
+            AcousticTestData.objects
+            .select_related('condition_point')
+            .filter(id__in=ids[start:start + batch_size])
+            .only('id', 'spectrum_json', 'condition_point__measure_type')
+        )
+        for row in rows:
+            row.refresh_spectrum_data()
+        AcousticTestData.objects.bulk_update(rows, ['spectrum_blob', 'band_levels'])
+        processed += len(rows)
+        yield processed
+
+
+# ==================== 最新测试结果表维护 ====================
+
+def latest_per_pair(queryset):
+    """
+    为 queryset 中每个 (vehicle_model_id, condition_point_id) 仅保留最新一条记录
+
+    窗口函数按 (vehicle_model_id, condition_point_id) 分区，与索引 idx_vm_cp_date_id 对齐；
+    排序口径与 order_by('-test_date', '-id') 一致（MySQL 中 NULL 在降序时排在最后）。
+    """
+    return (
+        queryset
+        .order_by()
+        .annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F('vehicle_model_id'), F('condition_point_id')],
+                order_by=[F('test_date').desc(nulls_last=True), F('id').desc()],
+            )
+        )
+        .filter(row_number=1)
+    )
+
+
+def refresh_latest_result(vehicle_model_id: int, condition_point_id: int) -> None:
+    """重新计算单个 (车型, 工况测点) 的最新测试结果，无测试记录时删除对应行"""
+    latest = (
+        AcousticTestData.objects
+        .filter(vehicle_model_id=vehicle_model_id, condition_point_id=condition_point_id)
+        .order_by('-test_date', '-id')
+        .values('id', *LATEST_RESULT_FIELDS)
+        .first()
+    )
+    if latest is None:
+        AcousticLatestResult.objects.filter(
+            vehicle_model_id=vehicle_model_id,
+            condition_point_id=condition_point_id,
+        ).delete()
+        return
+
+    test_data_id = latest.pop('id')
+    with transaction.atomic():
+        # test_data 为一对一字段：先清理指向该记录的旧组合（记录被改到其他车型/测点时）
+        AcousticLatestResult.objects.filter(test_data_id=test_data_id).exclude(
+            vehicle_model_id=vehicle_model_id,
+            condition_point_id=condition_point_id,
+        ).delete()
+        AcousticLatestResult.objects.update_or_create(
+            vehicle_model_id=vehicle_model_id,
+            condition_point_id=condition_point_id,
+            defaults={'test_data_id': test_data_id, **latest},
+        )
+
+
+def refresh_latest_results(pairs: Iterable[Tuple[int, int]]) -> None:
+    """批量刷新多个 (车型, 工况测点) 组合"""
+    for vehicle_model_id, condition_point_id in set(pairs):
+        refresh_latest_result(vehicle_model_id, condition_point_id)
+
+
+def rebuild_latest_results(batch_size: int = 1000) -> int:
+    """全量重建最新测试结果表，返回写入行数"""
+    rows = latest_per_pair(AcousticTestData.objects.all()).values_list(
+        'id', 'vehicle_model_id', 'condition_point_id', *LATEST_RESULT_FIELDS
+    )
+    objs = [
+        AcousticLatestResult(
+            test_data_id=record_id,
+            vehicle_model_id=vm_id,
+            condition_point_id=cp_id,
+            rms_value=rms_value,
+            speech_clarity=speech_clarity,
+            test_date=test_date,
+        )
+        for record_id, vm_id, cp_id, rms_value, speech_clarity, test_date in rows
+    ]
+    with transaction.atomic():
+        AcousticLatestResult.objects.all().delete()
+        AcousticLatestResult.objects.bulk_create(objs, batch_size=batch_size)
+    return len(objs)
+
+
+# ==================== 最新记录解析 ====================
+
+def resolve_latest_test_ids(
+    vehicle_model_ids: Sequence[int],
+    work_conditions: Sequence[str],
+    measure_points: Sequence[str],
+) -> Dict[Tuple[int, str, str], int]:
+    """
+    一次查询解析每个 (车型, 工况, 测点) 组合的最新测试记录 ID
+
+    直接读取最新测试结果表，每个 (vehicle_model_id, condition_point_id) 已只有一行；
+    同一工况/测点对应多个 ConditionMeasurePoint 时，再在内存中按 (test_date, id) 取最新。
+    排序口径与 order_by('-test_date', '-id') 一致：test_date 为空的记录排在最后。
+    """
+    if not vehicle_model_ids or not work_conditions or not measure_points:
+        return {}
+
+    rows = (
+        AcousticLatestResult.objects
+        .filter(
+            vehicle_model_id__in=vehicle_model_ids,
+            condition_point__work_condition__in=work_conditions,
+            condition_point__measure_point__in=measure_points,
+        )
+        .values_list(
+            'test_data_id',
+            'vehicle_model_id',
+            'condition_point__work_condition',
+            'condition_point__measure_point',
+            'test_date',
+        )
+    )
+
+    latest: Dict[Tuple[int, str, str], Tuple[tuple, int]] = {}
+    for record_id, vm_id, wc, mp, test_date in rows:
+        sort_key = (test_date is not None, test_date or date.min, record_id)
+        combo_key = (vm_id, wc, mp)
+        current = latest.get(combo_key)
+        if current is None or sort_key > current[0]:
+            latest[combo_key] = (sort_key, record_id)
+    return {key: value[1] for key, value in latest.items()}
+
+
+def load_latest_test_records(
+    vehicle_model_ids: Sequence[int],
+    work_conditions: Sequence[str],
+    measure_points: Sequence[str],
+) -> Dict[Tuple[int, str, str], AcousticTestData]:
+    """
+    批量加载每个 (车型, 工况, 测点) 组合的最新测试记录
+
+    共两次查询：一次解析最新 ID，一次按 ID 加载数据，查询次数与组合数量无关。
+    频谱优先读取二进制数据，spectrum_json 延迟加载。
+    """
+    latest_ids = resolve_latest_test_ids(vehicle_model_ids, work_conditions, measure_points)
+    if not latest_ids:
+        return {}
+
+    records = (
+        AcousticTestData.objects
+        .select_related('vehicle_model', 'condition_point')
+        .defer('spectrum_json')
+        .order_by()
+        .in_bulk(list(latest_ids.values()))
+    )
+    return {
+        key: records[record_id]
+        for key, record_id in latest_ids.items()
+        if record_id in records
+    }
+
+
+# ==================== 多车型频谱对比 ====================
+
+def compare_spectra(
+    vehicle_model_ids: Sequence[int],
+    reference_vehicle_id: int,
+    work_conditions: Sequence[str],
+    measure_points: Sequence[str],
+    num_points: int,
+    scale: str,
+    band_resolution: str,
+    f_min=None,
+    f_max=None,
+) -> List[dict]:
+    """
+    按 (工况, 测点) 将各车型最新频谱插值到公共频率网格，计算相对参考车型的差值曲线及各频带差值极值
+
+    参考车型在某组合下无数据，或公共频率范围为空时，该组合记入 skipped 原因后跳过。
+    """
+    records = load_latest_test_records(vehicle_model_ids, work_conditions, measure_points)
+    comparisons = []
+    for wc in work_conditions:
+        for mp in measure_points:
+            comparison = {'work_condition': wc, 'measure_point': mp}
+            curves = []
+            vehicles = []
+            for vm_id in vehicle_model_ids:
+                obj = records.get((vm_id, wc, mp))
+                if obj is None:
+                    continue
+                freq, values = load_spectrum_arrays(obj)
+                if len(freq) < 2:
+                    continue
+                curves.append((freq, values))
+                vehicles.append(obj)
+
+            if not vehicles:
+                continue
+            vm_ids = [obj.vehicle_model_id for obj in vehicles]
+            measure_type = getattr(vehicles[0].condition_point, 'measure_type', ConditionMeasurePoint.MeasureType.NOISE)
+            comparison['measure_type'] = measure_type
+            if reference_vehicle_id not in vm_ids:
+                comparison['skipped'] = '参考车型在该工况测点下无频谱数据'
+                comparisons.append(comparison)
+                continue
+
+            grid = common_frequency_grid(curves, num_points, scale=scale, f_min=f_min, f_max=f_max)
+            if not len(grid):
+                comparison['skipped'] = '各车型频谱频率范围无交集'
+                comparisons.append(comparison)
+                continue
+
+            # 一次插值得到 [车型, 频率] 矩阵，差值与频带极值均在矩阵上整体计算
+            matrix = interpolate_curves(grid, curves)
+            ref_row = vm_ids.index(reference_vehicle_id)
+            deltas = matrix - matrix[ref_row]
+            centers, band_max, band_min = band_extrema(grid, deltas, band_resolution)
+
+            comparison['frequency'] = to_json_floats(grid)
+            comparison['band_frequency'] = centers
+            comparison['series'] = []
+            comparison['deltas'] = []
+            for row, obj in enumerate(vehicles):
+                name = getattr(obj.vehicle_model, 'vehicle_model_name', str(obj.vehicle_model_id))
+                comparison['series'].append({
+                    'vehicle_model_id': obj.vehicle_model_id,
+                    'name': name,
+                    'is_reference': row == ref_row,
+                    'values': to_json_floats(matrix[row]),
+                })
+                if row == ref_row:
+                    continue
+                comparison['deltas'].append({
+                    'vehicle_model_id': obj.vehicle_model_id,
+                    'name': name,
+                    'values': to_json_floats(deltas[row]),
+                    'band_max': to_json_floats(band_max[row]),
+                    'band_min': to_json_floats(band_min[row]),
+                    'max_delta': to_json_floats(deltas[row].max(keepdims=True))[0],
+                    'min_delta': to_json_floats(deltas[row].min(keepdims=True))[0],
+                })
+            comparisons.append(comparison)
+    return comparisons
@@ -0,0 +1,134 @@
+"""
+声学测试数据信号：维护最新测试结果表 AcousticLatestResult、筛选项索引表 AcousticFacet，
+标记车队统计包络 AcousticEnvelope 待重建，并在测点类型变更后重新生成频带级数据
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.acoustic_analysis.envelope import mark_envelopes_dirty
+from apps.acoustic_analysis.facets import bump_facet_version, sync_condition_point, sync_facets
+from apps.acoustic_analysis.models import (
+    AcousticFacet,
+    AcousticLatestResult,
+    AcousticTestData,
+    ConditionMeasurePoint,
+    DynamicNoiseData,
+)
+from apps.acoustic_analysis.services import (
+    refresh_latest_result,
+    refresh_latest_results,
+    refresh_spectrum_derivatives,
+)
+
+
+# 影响“最新结果”的字段；仅更新其他字段（如频谱派生数据）时无需刷新
+LATEST_RELEVANT_FIELDS = frozenset({
+    'vehicle_model', 'vehicle_model_id',
+    'condition_point', 'condition_point_id',
+    'rms_value', 'speech_clarity', 'test_date',
+})
+
+
+# 影响车队统计包络的字段：最新结果相关字段 + 频谱数据
+ENVELOPE_RELEVANT_FIELDS = LATEST_RELEVANT_FIELDS | {'spectrum_json', 'spectrum_blob', 'band_levels'}
+
+
+@receiver(post_save, sender=AcousticTestData)
+def sync_latest_result_on_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    pairs = [(instance.vehicle_model_id, instance.condition_point_id)]
+    if update_fields is None or LATEST_RELEVANT_FIELDS.intersection(update_fields):
+        if not created:
+            # 记录被改到其他车型/测点时，原组合也需要重新计算
+            pairs.extend(
+                AcousticLatestResult.objects
+                .filter(test_data_id=instance.pk)
+                .values_list('vehicle_model_id', 'condition_point_id')
+            )
+        refresh_latest_results(pairs)
+        sync_facets(AcousticFacet.Source.ACOUSTIC, pairs)
+    if update_fields is None or ENVELOPE_RELEVANT_FIELDS.intersection(update_fields):
+        mark_envelopes_dirty(cp_id for _, cp_id in pairs)
+
+
+@receiver(post_delete, sender=AcousticTestData)
+def sync_latest_result_on_delete(sender, instance, **kwargs):
+    refresh_latest_result(instance.vehicle_model_id, instance.condition_point_id)
+    sync_facets(AcousticFacet.Source.ACOUSTIC, [(instance.vehicle_model_id, instance.condition_point_id)])
+    mark_envelopes_dirty([instance.condition_point_id])
+
+
+@receiver(pre_save, sender=DynamicNoiseData)
+def remember_dynamic_noise_pair(sender, instance, raw=False, **kwargs):
+    # 记录保存前的 (车型, 工况测点)，以便记录被改到其他组合时清理原索引
+    instance._facet_old_pair = None
+    if raw or instance.pk is None:
+        return
+    instance._facet_old_pair = (
+        DynamicNoiseData.objects
+        .filter(pk=instance.pk)
+        .values_list('vehicle_model_id', 'condition_measure_point_id')
+        .first()
+    )
+
+
+@receiver(post_save, sender=DynamicNoiseData)
+def sync_dynamic_facet_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    pairs = [(instance.vehicle_model_id, instance.condition_measure_point_id)]
+    old_pair = getattr(instance, '_facet_old_pair', None)
+    if old_pair:
+        pairs.append(old_pair)
+    sync_facets(AcousticFacet.Source.DYNAMIC, pairs)
+
+
+@receiver(post_delete, sender=DynamicNoiseData)
+def sync_dynamic_facet_on_delete(sender, instance, **kwargs):
+    sync_facets(
+        AcousticFacet.Source.DYNAMIC,
+        [(instance.vehicle_model_id, instance.condition_measure_point_id)],
+    )
+
+
+@receiver(pre_save, sender=ConditionMeasurePoint)
+def remember_measure_type(sender, instance, raw=False, **kwargs):
+    instance._old_measure_type = None
+    if raw or instance.pk is None:
+        return
+    instance._old_measure_type = (
+        ConditionMeasurePoint.objects.filter(pk=instance.pk).values_list('measure_type', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=ConditionMeasurePoint)
+def sync_facet_condition_point(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    sync_condition_point(instance)
+
+
+@receiver(post_save, sender=ConditionMeasurePoint)
+def refresh_band_levels_on_measure_type_change(sender, instance, created, raw=False, **kwargs):
+    # 频带级按测点类型选择 dB 能量叠加或线性叠加，类型变更后该测点下的频带级全部失效
+    old_measure_type = getattr(instance, '_old_measure_type', None)
+    if raw or created or old_measure_type is None or old_measure_type == instance.measure_type:
+        return
+
+    def _refresh(cp_id=instance.pk):
+        ids = AcousticTestData.objects.filter(
+            condition_point_id=cp_id, spectrum_json__isnull=False
+        ).values_list('id', flat=True)
+        for _ in refresh_spectrum_derivatives(ids):
+            pass
+        mark_envelopes_dirty([cp_id])
+
+    transaction.on_commit(_refresh)
+
+
+@receiver(post_delete, sender=ConditionMeasurePoint)
+def bump_facet_on_condition_point_delete(sender, instance, **kwargs):
+    # 索引行已随工况测点级联删除，这里只需使进程内缓存失效
+    bump_facet_version()
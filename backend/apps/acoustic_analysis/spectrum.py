@@ -0,0 +1,265 @@
+"""
+声学频谱二进制存储与频带聚合
+
+spectrum_json 中约 12000 个频率/幅值点在每次查询时都要做 JSON 解码和逐点校验。
+入库时将其转换为 float32 二进制数组（频率在前、幅值在后，等长），
+查询时通过 np.frombuffer 直接还原为 NumPy 数组，JSON 仅作为历史数据的兜底。
+
+同时在入库时将窄带数据按能量叠加为 1/3 倍频程与倍频程频带级，
+频带对比只需几十个数值即可完成。
+"""
+import json
+
+import numpy as np
+
+
+SPECTRUM_DTYPE = np.dtype('<f4')
+
+# 频率/幅值可能使用的键名，按优先级排列
+FREQUENCY_KEYS = ['frequency', 'freq', 'Hz', 'hz', 'Frequency', 'FREQUENCY']
+SPECTRUM_VALUE_KEYS = ['dB', 'dB(A)', 'value', 'values', 'amplitude', 'amplitudes']
+
+# float32 可保证约 7 位有效数字，输出时按此精度取整，避免 20.1 变成 20.100000381469727
+FLOAT32_SIGNIFICANT_DIGITS = 7
+
+_EMPTY = np.empty(0, dtype=np.float64)
+
+
+def _pick_list(series_dict, keys):
+    for key in keys:
+        value = series_dict.get(key)
+        if isinstance(value, list) and len(value):
+            return value
+    return None
+
+
+def to_numeric_array(raw) -> np.ndarray:
+    """
+    将 JSON 数组转换为 float64 数组，剔除非数值项与 NaN
+
+    口径与视图中的 _normalize_numeric_list 一致；纯数值数组走向量化转换，
+    混有 None/空串等脏数据时才回退到逐项解析。
+    """
+    if not isinstance(raw, list) or not raw:
+        return _EMPTY
+    try:
+        arr = np.asarray(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = []
+        for item in raw:
+            if isinstance(item, (int, float)):
+                values.append(float(item))
+            elif isinstance(item, str):
+                text = item.strip()
+                if not text:
+                    continue
+                try:
+                    values.append(float(text))
+                except ValueError:
+                    continue
+        arr = np.asarray(values, dtype=np.float64)
+    if arr.ndim != 1:
+        return _EMPTY
+    return arr[~np.isnan(arr)]
+
+
+def parse_spectrum_arrays(spectrum):
+    """从 spectrum_json（dict 或 JSON 字符串）解析出等长的频率、幅值数组"""
+    if isinstance(spectrum, str):
+        try:
+            spectrum = json.loads(spectrum)
+        except ValueError:
+            return _EMPTY, _EMPTY
+    if not isinstance(spectrum, dict):
+        return _EMPTY, _EMPTY
+    freq = to_numeric_array(_pick_list(spectrum, FREQUENCY_KEYS))
+    values = to_numeric_array(_pick_list(spectrum, SPECTRUM_VALUE_KEYS))
+    length = min(len(freq), len(values))
+    return freq[:length], values[:length]
+
+
+def encode_spectrum_arrays(freq, values):
+    """将等长的频率、幅值数组编码为二进制；无有效数据时返回 None"""
+    if not len(freq):
+        return None
+    return freq.astype(SPECTRUM_DTYPE).tobytes() + values.astype(SPECTRUM_DTYPE).tobytes()
+
+
+def encode_spectrum(spectrum):
+    """将 spectrum_json 编码为二进制；无有效数据时返回 None"""
+    return encode_spectrum_arrays(*parse_spectrum_arrays(spectrum))
+
+
+def decode_spectrum(blob):
+    """将二进制还原为 (频率, 幅值) 两个 float64 数组"""
+    if not blob:
+        return _EMPTY, _EMPTY
+    data = np.frombuffer(blob, dtype=SPECTRUM_DTYPE)
+    length = len(data) // 2
+    return data[:length].astype(np.float64), data[length:length * 2].astype(np.float64)
+
+
+def load_spectrum_arrays(obj):
+    """
+    读取 AcousticTestData 的频谱数组：优先使用二进制数据，缺失时回退解析 JSON
+
+    查询时建议 defer('spectrum_json')，仅历史记录才会额外加载 JSON。
+    """
+    blob = getattr(obj, 'spectrum_blob', None)
+    if blob:
+        return decode_spectrum(blob)
+    return parse_spectrum_arrays(obj.spectrum_json)
+
+
+def round_significant(arr, digits=FLOAT32_SIGNIFICANT_DIGITS) -> np.ndarray:
+    """将数组按有效数字取整，返回 float64 数组（流式输出时可直接编码）"""
+    x = np.asarray(arr, dtype=np.float64)
+    if not len(x):
+        return x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude = np.floor(np.log10(np.abs(x)))
+    magnitude[~np.isfinite(magnitude)] = 0
+    scale = np.power(10.0, digits - 1 - magnitude)
+    return np.round(x * scale) / scale
+
+
+def to_json_floats(arr, digits=FLOAT32_SIGNIFICANT_DIGITS):
+    """将数组按有效数字取整后转为 Python float 列表，用于接口输出"""
+    return round_significant(arr, digits).tolist()
+
+
+# ==================== 倍频程频带聚合 ====================
+
+RESOLUTION_NARROWBAND = 'narrowband'
+RESOLUTION_THIRD_OCTAVE = 'third_octave'
+RESOLUTION_OCTAVE = 'octave'
+BAND_RESOLUTIONS = (RESOLUTION_THIRD_OCTAVE, RESOLUTION_OCTAVE)
+
+# 标称中心频率（GB/T 3241 / IEC 61260），精确中心频率按 1000 * 10^(n/10) 计算
+THIRD_OCTAVE_NOMINAL = [
+    10, 12.5, 16, 20, 25, 31.5, 40, 50, 63, 80, 100, 125, 160, 200, 250, 315, 400,
+    500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3150, 4000, 5000, 6300, 8000,
+    10000, 12500, 16000, 20000,
+]
+OCTAVE_NOMINAL = [16, 31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000, 16000]
+
+
+def _band_edges(first_index, count, step):
+    """按 10 为底的频带定义计算各频带的上下限频率（相邻频带共用边界）"""
+    exponents = (np.arange(count + 1) * step + first_index - step / 2) / 10
+    return 1000 * np.power(10.0, exponents)
+
+
+BAND_DEFINITIONS = {
+    RESOLUTION_THIRD_OCTAVE: (THIRD_OCTAVE_NOMINAL, _band_edges(-20, len(THIRD_OCTAVE_NOMINAL), 1)),
+    RESOLUTION_OCTAVE: (OCTAVE_NOMINAL, _band_edges(-18, len(OCTAVE_NOMINAL), 3)),
+}
+
+
+def compute_band_levels(freq, values, resolution, linear=False):
+    """
+    将窄带频谱按频带叠加
+
+    - 声压级（dB）按能量叠加：L = 10·lg(Σ10^(Li/10))
+    - 线性幅值（如振动 m/s²）按均方根叠加：A = sqrt(ΣAi²)
+    仅输出包含数据点的频带，返回 {'frequency': [...], 'values': [...]}。
+    """
+    nominal, edges = BAND_DEFINITIONS[resolution]
+    freq = np.asarray(freq, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if not len(freq):
+        return {'frequency': [], 'values': []}
+
+    band_index = np.searchsorted(edges, freq, side='right') - 1
+    in_range = (band_index >= 0) & (band_index < len(nominal))
+    band_index = band_index[in_range]
+    if linear:
+        energy = np.square(values[in_range])
+    else:
+        energy = np.power(10.0, values[in_range] / 10)
+
+    totals = np.bincount(band_index, weights=energy, minlength=len(nominal))
+    counts = np.bincount(band_index, minlength=len(nominal))
+    present = counts > 0
+    with np.errstate(divide='ignore'):
+        levels = np.sqrt(totals[present]) if linear else 10 * np.log10(totals[present])
+    return {
+        'frequency': [nominal[i] for i in np.flatnonzero(present).tolist()],
+        'values': to_json_floats(levels),
+    }
+
+
+def build_band_levels(freq, values, linear=False):
+    """计算所有频带分辨率的频带级，无有效数据时返回 None"""
+    if not len(freq):
+        return None
+    return {
+        resolution: compute_band_levels(freq, values, resolution, linear=linear)
+        for resolution in BAND_RESOLUTIONS
+    }
+
+
+# ==================== 多车型频谱对比 ====================
+
+GRID_LOG = 'log'
+GRID_LINEAR = 'linear'
+
+
+def common_frequency_grid(curves, num_points, scale=GRID_LOG, f_min=None, f_max=None):
+    """
+    计算多条频谱的公共频率网格：取各曲线频率范围的交集（可再由 f_min/f_max 收窄）
+
+    对数网格的下限需大于 0，交集不足两个点时返回空数组。
+    """
+    lower = max(float(freq.min()) for freq, _ in curves)
+    upper = min(float(freq.max()) for freq, _ in curves)
+    if f_min is not None:
+        lower = max(lower, f_min)
+    if f_max is not None:
+        upper = min(upper, f_max)
+    if scale == GRID_LOG and lower <= 0:
+        positive = [freq[freq > 0] for freq, _ in curves]
+        if any(not len(p) for p in positive):
+            return _EMPTY
+        lower = max(lower, max(float(p.min()) for p in positive))
+    if upper <= lower:
+        return _EMPTY
+    if scale == GRID_LOG:
+        return np.geomspace(lower, upper, num_points)
+    return np.linspace(lower, upper, num_points)
+
+
+def interpolate_curves(grid, curves):
+    """将各曲线线性插值到公共网格，返回 [曲线, 网格] 矩阵"""
+    matrix = np.empty((len(curves), len(grid)))
+    for row, (freq, values) in enumerate(curves):
+        if len(freq) > 1 and np.any(np.diff(freq) < 0):
+            order = np.argsort(freq, kind='stable')
+            freq, values = freq[order], values[order]
+        matrix[row] = np.interp(grid, freq, values)
+    return matrix
+
+
+def band_extrema(grid, matrix, resolution):
+    """
+    按频带统计矩阵各行的最大值与最小值（网格需升序）
+
+    返回 (频带标称中心频率列表, 最大值矩阵, 最小值矩阵)，仅包含网格覆盖到的频带。
+    """
+    nominal, edges = BAND_DEFINITIONS[resolution]
+    band_index = np.searchsorted(edges, grid, side='right') - 1
+    in_range = (band_index >= 0) & (band_index < len(nominal))
+    band_index = band_index[in_range]
+    values = matrix[:, in_range]
+    if not len(band_index):
+        empty = np.empty((matrix.shape[0], 0))
+        return [], empty, empty
+
+    # 网格升序，同一频带的点连续分布，reduceat 按频带起点一次完成分组归约
+    starts = np.flatnonzero(np.r_[True, np.diff(band_index) != 0])
+    centers = [nominal[i] for i in band_index[starts].tolist()]
+    return (
+        centers,
+        np.maximum.reduceat(values, starts, axis=1),
+        np.minimum.reduceat(values, starts, axis=1),
+    )
@@ -0,0 +1,213 @@
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+from django.db import DatabaseError
+from django.db.models.query import QuerySet
+from django.test import SimpleTestCase, TestCase
+
+from apps.modal.models import VehicleModel
+from utils import json_stream
+
+from .models import AcousticTestData, ConditionMeasurePoint
+from .spectrum import (
+    RESOLUTION_OCTAVE,
+    RESOLUTION_THIRD_OCTAVE,
+    build_band_levels,
+    compute_band_levels,
+    decode_spectrum,
+)
+
+
+QUERY_URL = '/api/acoustic-analysis/query/'
+
+NOISE_SPECTRUM = {'frequency': [20, 25, 100, 1000, 1010], 'dB(A)': [40, 40, 60, 70, 70]}
+VIBRATION_SPECTRUM = {'frequency': [100, 110], 'values': [3.0, 4.0]}
+
+
+def read_stream(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+# ==================== 频带级 ====================
+
+class BandLevelTests(SimpleTestCase):
+
+    def test_db_levels_add_by_energy(self):
+        # 1000Hz 与 1010Hz 同在 1000Hz 1/3 倍频程内：70dB + 70dB = 73.01dB
+        bands = compute_band_levels([1000, 1010], [70, 70], RESOLUTION_THIRD_OCTAVE)
+        self.assertEqual(bands['frequency'], [1000])
+        self.assertAlmostEqual(bands['values'][0], 70 + 10 * np.log10(2), places=3)
+
+    def test_linear_levels_add_by_rms(self):
+        bands = compute_band_levels([100, 110], [3.0, 4.0], RESOLUTION_THIRD_OCTAVE, linear=True)
+        self.assertEqual(bands['frequency'], [100])
+        self.assertAlmostEqual(bands['values'][0], 5.0, places=5)
+
+    def test_only_bands_with_data_and_out_of_range_dropped(self):
+        bands = compute_band_levels([1, 20, 1000, 50000], [10, 20, 30, 40], RESOLUTION_OCTAVE)
+        self.assertEqual(bands['frequency'], [16, 1000])
+
+    def test_empty_spectrum(self):
+        self.assertEqual(compute_band_levels([], [], RESOLUTION_OCTAVE), {'frequency': [], 'values': []})
+        self.assertIsNone(build_band_levels(np.array([]), np.array([])))
+
+
+class SpectrumDerivativeTests(TestCase):
+    """入库时生成的二进制频谱与频带级随 spectrum_json 与测点类型同步"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehicle = VehicleModel.objects.create(vehicle_model_name='测试车型', vin='TESTVIN0000000001')
+        cls.noise_point = ConditionMeasurePoint.objects.create(work_condition='怠速', measure_point='驾驶员右耳')
+        cls.vibration_point = ConditionMeasurePoint.objects.create(
+            work_condition='怠速', measure_point='座椅导轨', measure_type=ConditionMeasurePoint.MeasureType.VIBRATION
+        )
+
+    def create_data(self, condition_point, spectrum):
+        return AcousticTestData.objects.create(
+            vehicle_model=self.vehicle, condition_point=condition_point, spectrum_json=spectrum
+        )
+
+    def test_save_generates_blob_and_band_levels(self):
+        data = self.create_data(self.noise_point, NOISE_SPECTRUM)
+        data.refresh_from_db()
+        freq, values = decode_spectrum(data.spectrum_blob)
+        self.assertEqual(freq.tolist(), NOISE_SPECTRUM['frequency'])
+        self.assertEqual(values.tolist(), NOISE_SPECTRUM['dB(A)'])
+        expected = build_band_levels(np.array(freq, dtype=float), np.array(values, dtype=float))
+        self.assertEqual(data.band_levels, expected)
+
+    def test_vibration_point_uses_linear_levels(self):
+        data = self.create_data(self.vibration_point, VIBRATION_SPECTRUM)
+        self.assertAlmostEqual(data.band_levels[RESOLUTION_THIRD_OCTAVE]['values'][0], 5.0, places=5)
+
+    def test_moving_record_to_other_point_type_recomputes(self):
+        data = self.create_data(self.noise_point, VIBRATION_SPECTRUM)
+        loaded = AcousticTestData.objects.defer('spectrum_json').get(pk=data.pk)
+        loaded.condition_point = self.vibration_point
+        loaded.save(update_fields=['condition_point'])
+        loaded.refresh_from_db()
+        self.assertAlmostEqual(loaded.band_levels[RESOLUTION_THIRD_OCTAVE]['values'][0], 5.0, places=5)
+
+    def test_measure_type_change_refreshes_band_levels(self):
+        point = ConditionMeasurePoint.objects.create(work_condition='怠速', measure_point='方向盘')
+        data = self.create_data(point, VIBRATION_SPECTRUM)
+        noise_value = data.band_levels[RESOLUTION_THIRD_OCTAVE]['values'][0]
+        self.assertAlmostEqual(noise_value, 10 * np.log10(10 ** 0.3 + 10 ** 0.4), places=3)
+
+        with mock.patch('apps.acoustic_analysis.signals.mark_envelopes_dirty') as mark_dirty:
+            with self.captureOnCommitCallbacks(execute=True):
+                point.measure_type = ConditionMeasurePoint.MeasureType.VIBRATION
+                point.save()
+        data.refresh_from_db()
+        self.assertAlmostEqual(data.band_levels[RESOLUTION_THIRD_OCTAVE]['values'][0], 5.0, places=5)
+        mark_dirty.assert_called_with([point.pk])
+
+
+# ==================== 流式查询 ====================
+
+class JsonStreamEncodingTests(SimpleTestCase):
+    """NaN/Infinity 输出为 null，标准库回退路径与 orjson 一致"""
+
+    VALUE = {
+        'values': [1.5, float('nan'), float('inf')],
+        'array': np.array([1.0, np.nan]),
+        'scalar': np.float64('-inf'),
+        'level': Decimal('60.5'),
+        'nested': [{'x': float('nan')}],
+    }
+    EXPECTED = {'values': [1.5, None, None], 'array': [1.0, None], 'scalar': None, 'level': 60.5, 'nested': [{'x': None}]}
+
+    def test_fallback_encoder_writes_null(self):
+        self.assertEqual(json.loads(json_stream._dumps_json(self.VALUE)), self.EXPECTED)
+
+    def test_stream_writes_null(self):
+        body = b''.join(json_stream.stream_json({'series': iter([self.VALUE])}))
+        self.assertEqual(json.loads(body), {'series': [self.EXPECTED]})
+
+    def test_finite_values_unchanged(self):
+        self.assertEqual(json_stream._dumps_json({'a': [1, 2.5], 'b': '声压'}), '{"a":[1,2.5],"b":"声压"}'.encode('utf-8'))
+
+
+class AcousticQueryStreamTests(TestCase):
+    """数据库访问在返回流式响应前完成，输出阶段不再查询"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehicle = VehicleModel.objects.create(vehicle_model_name='测试车型', vin='TESTVIN0000000001')
+        cls.noise_point = ConditionMeasurePoint.objects.create(work_condition='匀速60', measure_point='驾驶员右耳')
+        cls.vibration_point = ConditionMeasurePoint.objects.create(
+            work_condition='匀速60', measure_point='座椅导轨', measure_type=ConditionMeasurePoint.MeasureType.VIBRATION
+        )
+        AcousticTestData.objects.create(
+            vehicle_model=cls.vehicle, condition_point=cls.noise_point,
+            spectrum_json={'frequency': [100], 'dB(A)': [10]}, test_date=date(2024, 1, 1),
+        )
+        cls.latest = AcousticTestData.objects.create(
+            vehicle_model=cls.vehicle, condition_point=cls.noise_point, spectrum_json=NOISE_SPECTRUM,
+            oa_json={'time': [0, 1], 'OA': [60, 62]}, test_date=date(2025, 1, 1),
+        )
+        AcousticTestData.objects.create(
+            vehicle_model=cls.vehicle, condition_point=cls.vibration_point, spectrum_json=VIBRATION_SPECTRUM,
+        )
+
+    def query(self, measure_points=('驾驶员右耳',), **payload):
+        return self.client.post(QUERY_URL, {
+            'vehicle_model_ids': [self.vehicle.id],
+            'work_conditions': ['匀速60'],
+            'measure_points': list(measure_points),
+            **payload,
+        }, content_type='application/json')
+
+    def make_legacy(self):
+        # 历史记录：尚未生成二进制频谱与频带级
+        AcousticTestData.objects.filter(pk=self.latest.pk).update(spectrum_blob=None, band_levels=None)
+
+    def assert_streams_without_queries(self, resolution):
+        response = self.query(resolution=resolution)
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            body = read_stream(response)
+        self.assertTrue(body['success'])
+        return body['data']
+
+    def test_narrowband_from_legacy_json(self):
+        self.make_legacy()
+        data = self.assert_streams_without_queries('narrowband')
+        series = data['spectrum_series']
+        self.assertEqual(len(series), 1)
+        self.assertEqual(series[0]['frequency'], NOISE_SPECTRUM['frequency'])
+        self.assertEqual(series[0]['values'], NOISE_SPECTRUM['dB(A)'])
+        self.assertEqual(data['oa_series'][0]['values'], [60.0, 62.0])
+        self.assertEqual(len(data['table']), 1)
+
+    def test_band_levels_from_legacy_json(self):
+        self.make_legacy()
+        data = self.assert_streams_without_queries(RESOLUTION_THIRD_OCTAVE)
+        self.assertEqual(data['spectrum_series'][0]['frequency'], [20, 25, 100, 1000])
+
+    def test_precomputed_band_levels(self):
+        data = self.assert_streams_without_queries(RESOLUTION_OCTAVE)
+        self.assertEqual(data['spectrum_series'][0]['values'], self.latest.band_levels[RESOLUTION_OCTAVE]['values'])
+
+    def test_database_error_raised_before_streaming(self):
+        self.make_legacy()
+        values_list = QuerySet.values_list
+
+        def failing_values_list(queryset, *fields, **kwargs):
+            if 'spectrum_json' in fields:
+                raise DatabaseError('connection lost')
+            return values_list(queryset, *fields, **kwargs)
+
+        # 频谱加载失败在视图返回前抛出（由框架返回 500），不会输出截断的 200 响应
+        with mock.patch.object(QuerySet, 'values_list', autospec=True, side_effect=failing_values_list):
+            with self.assertRaises(DatabaseError):
+                self.query()
+
+    def test_mixed_measure_types_rejected(self):
+        response = self.query(measure_points=['驾驶员右耳', '座椅导轨'])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.streaming)
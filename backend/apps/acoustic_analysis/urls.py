@@ -6,9 +6,12 @@ urlpatterns = [
     path('work-conditions/', views.get_work_conditions, name='acoustic-work-conditions'),
     path('measure-points/', views.get_measure_points, name='acoustic-measure-points'),
     path('query/', views.query_acoustic_data, name='acoustic-query'),
+    path('compare/', views.compare_acoustic_spectra, name='acoustic-compare'),
+    path('envelope/', views.get_acoustic_envelope, name='acoustic-envelope'),
     path('steady-state/query/', views.query_steady_state_data, name='steady-state-query'),
     path('dynamic/work-conditions/', views.get_dynamic_work_conditions, name='dynamic-work-conditions'),
     path('dynamic/measure-points/', views.get_dynamic_measure_points, name='dynamic-measure-points'),
     path('dynamic/query/', views.query_dynamic_noise, name='dynamic-query'),
     path('dynamic/<int:pk>/spectrum/', views.get_dynamic_spectrum_data, name='dynamic-spectrum-data'),
+    path('dynamic/<int:pk>/spectrum/slice/', views.get_dynamic_spectrum_slice, name='dynamic-spectrum-slice'),
 ]
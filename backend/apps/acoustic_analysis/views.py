@@ -1,29 +1,56 @@
 from collections import defaultdict
+from datetime import date
 import os
 from urllib.parse import quote
 
+import numpy as np
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework import status
 
-from django.conf import settings
 from django.db.models import Q
 from django.core.files.storage import default_storage
 from django.http import FileResponse
 
+from utils.curves import (
+    SOUND_PRESSURE_Y_KEYS,
+    SPEECH_CLARITY_Y_KEYS,
+    canonical_curve,
+    curve_to_pairs,
+    normalize_speed_curve,
+)
+from utils.downsample import downsample_pairs, downsample_xy
 from utils.response import Response
-from apps.acoustic_analysis.models import AcousticTestData, ConditionMeasurePoint, DynamicNoiseData
+from apps.acoustic_analysis.models import (
+    AcousticFacet,
+    AcousticLatestResult,
+    AcousticTestData,
+    ConditionMeasurePoint,
+    DynamicNoiseData,
+)
+from apps.acoustic_analysis.services import compare_spectra, load_latest_test_records
+from apps.acoustic_analysis.spectrum import (
+    RESOLUTION_NARROWBAND,
+    compute_band_levels,
+    load_spectrum_arrays,
+    round_significant,
+    to_json_floats,
+)
 from apps.acoustic_analysis.serializers import (
     WorkConditionListSerializer,
     MeasurePointListSerializer,
     AcousticQuerySerializer,
+    AcousticCompareSerializer,
+    AcousticEnvelopeQuerySerializer,
     AcousticTableItemSerializer,
     SteadyStateQuerySerializer,
     DynamicWorkConditionSerializer,
     DynamicMeasurePointSerializer,
     DynamicNoiseQuerySerializer,
     DynamicNoiseTableSerializer,
+    DynamicSpectrumSliceSerializer,
 )
+from apps.acoustic_analysis import dynamic_spectrum, envelope, facets
 from apps.modal.models import VehicleModel
 
 
@@ -94,13 +121,8 @@ def get_work_conditions(request):
         return Response.bad_request(message='参数错误', data=serializer.errors)
 
     vehicle_model_ids = serializer.validated_data['vehicle_model_ids']
-    qs = AcousticTestData.objects.filter(vehicle_model_id__in=vehicle_model_ids)
-    values = (
-        qs.values_list('condition_point__work_condition', flat=True)
-        .distinct()
-        .order_by('condition_point__work_condition')
-    )
-    return Response.success(data=list(values), message='获取工况选项成功')
+    values = facets.list_work_conditions(AcousticFacet.Source.ACOUSTIC, vehicle_model_ids)
+    return Response.success(data=values, message='获取工况选项成功')
 
 
 @api_view(['GET'])
@@ -113,23 +135,8 @@ def get_measure_points(request):
     vehicle_model_ids = serializer.validated_data['vehicle_model_ids']
     work_conditions = serializer.validated_data['work_conditions']
 
-    qs = AcousticTestData.objects.filter(
-        vehicle_model_id__in=vehicle_model_ids,
-        condition_point__work_condition__in=work_conditions,
-    )
     # 返回带有测点类型的信息，便于前端限制不同类型测点混选
-    values = (
-        qs.values('condition_point__measure_point', 'condition_point__measure_type')
-        .distinct()
-        .order_by('condition_point__measure_type', 'condition_point__measure_point')
-    )
-    data = [
-        {
-            'measure_point': item['condition_point__measure_point'],
-            'measure_type': item['condition_point__measure_type'],
-        }
-        for item in values
-    ]
+    data = facets.list_measure_points(AcousticFacet.Source.ACOUSTIC, vehicle_model_ids, work_conditions)
     return Response.success(data=data, message='获取测点选项成功')
 
 
@@ -181,17 +188,6 @@ def _pick_value_list(series_dict, preferred_keys):
     return None
 
 
-def _get_frequency_list(series_dict):
-    """从序列字典中提取频率列表，支持多种键名"""
-    if not isinstance(series_dict, dict):
-        return None
-    # 按优先级尝试不同的键名
-    for key in ['frequency', 'freq', 'Hz', 'hz', 'Frequency', 'FREQUENCY']:
-        value = series_dict.get(key)
-        if isinstance(value, list) and len(value):
-            return value
-    return None
-
 def _build_media_url(path, request):
     if not path:
         return ''
@@ -205,20 +201,18 @@ def _build_media_url(path, request):
         return url
 
 
-def _build_curve_pairs(curve_dict, x_keys, y_keys):
-    """从曲线字典中提取 x/y 列表并组装为 [x, y] 对"""
-    if isinstance(curve_dict, str):
-        try:
-            import json
-            curve_dict = json.loads(curve_dict)
-        except Exception:
-            return []
-    if not isinstance(curve_dict, dict):
-        return []
-    x_list = _normalize_numeric_list(_pick_value_list(curve_dict, x_keys))
-    y_list = _normalize_numeric_list(_pick_value_list(curve_dict, y_keys))
-    length = min(len(x_list), len(y_list))
-    return [[x_list[i], y_list[i]] for i in range(length)]
+def _get_band_levels(obj, measure_type, resolution):
+    """读取预计算的频带级数据；历史记录未生成时按窄带数据现场计算"""
+    band_levels = obj.band_levels or {}
+    if resolution in band_levels:
+        return band_levels[resolution]
+    freq, spectrum_values = load_spectrum_arrays(obj)
+    return compute_band_levels(
+        freq,
+        spectrum_values,
+        resolution,
+        linear=measure_type == ConditionMeasurePoint.MeasureType.VIBRATION,
+    )
 
 
 @api_view(['POST'])
@@ -231,40 +225,24 @@ def query_acoustic_data(request):
     vehicle_model_ids = serializer.validated_data['vehicle_model_ids']
     work_conditions = serializer.validated_data['work_conditions']
     measure_points = serializer.validated_data['measure_points']
+    max_points = serializer.validated_data.get('max_points')
+    resolution = serializer.validated_data['resolution']
 
-    spectrum_series = []
-    oa_series = []
-    table_items = []
     used_measure_types = set()
+    entries = []
+
+    # 批量解析所有组合的最新记录，查询次数与组合数量无关
+    latest_records = load_latest_test_records(vehicle_model_ids, work_conditions, measure_points)
 
+    # 先完成组合遍历与校验，曲线数据在流式输出时逐条生成
     for vm_id in vehicle_model_ids:
         for wc in work_conditions:
             for mp in measure_points:
-                latest_id = (
-                    AcousticTestData.objects
-                    .filter(
-                        vehicle_model_id=vm_id,
-                        condition_point__work_condition=wc,
-                        condition_point__measure_point=mp,
-                    )
-                    .order_by('-test_date', '-id')
-                    .values_list('id', flat=True)
-                    .first()
-                )
-                if not latest_id:
-                    continue
-
-                obj = (
-                    AcousticTestData.objects
-                    .select_related('vehicle_model', 'condition_point')
-                    .get(id=latest_id)
-                )
+                obj = latest_records.get((vm_id, wc, mp))
                 if not obj:
                     continue
 
                 vm_name = getattr(obj.vehicle_model, 'vehicle_model_name', str(vm_id))
-                series_name = f"{vm_name}-{wc}-{mp}"
-
                 measure_type = getattr(
                     obj.condition_point,
                     'measure_type',
@@ -281,82 +259,227 @@ def query_acoustic_data(request):
                     measure_type,
                     MEASURE_TYPE_META[ConditionMeasurePoint.MeasureType.NOISE]
                 )
+                entries.append((obj, f"{vm_name}-{wc}-{mp}", measure_type, meta))
 
-                # 修改这里：使用新的 _get_frequency_list 函数
-                spectrum = _safe_parse_series(obj.spectrum_json) or {}
-                freq_raw = _get_frequency_list(spectrum)  # 改用新函数
-                freq = _normalize_numeric_list(freq_raw)
-
-                spectrum_values_raw = _pick_value_list(
-                    spectrum,
-                    ['dB', 'dB(A)', 'value', 'values', 'amplitude', 'amplitudes']
-                )
-                spectrum_values = _normalize_numeric_list(spectrum_values_raw)
-
-                if (
-                        measure_type != ConditionMeasurePoint.MeasureType.SPEED
-                        and freq
-                        and spectrum_values
-                ):
-                    length = min(len(freq), len(spectrum_values))
-                    spectrum_series.append({
-                        'name': series_name,
-                        'measure_type': measure_type,
-                        'unit': meta['spectrum_unit'],
-                        'frequency': freq[:length],
-                        'values': spectrum_values[:length],
-                    })
-
-                # OA 数据处理（时间轴也可以类似处理）
-                oa = _safe_parse_series(obj.oa_json) or {}
-                # 如果需要，也可以为时间轴创建类似函数
-                times_raw = _pick_value_list(oa, ['time', 'Time', 't', 'T'])
-                times = _normalize_numeric_list(times_raw)
-
-                oa_values_raw = _pick_value_list(
-                    oa,
-                    ['OA', 'dB(A)', 'dBA', 'value', 'values']
-                )
-                oa_values = _normalize_numeric_list(oa_values_raw)
-
-                stats = None
-                if oa_values:
-                    try:
-                        max_val = max(oa_values)
-                        min_val = min(oa_values)
-                        avg_val = sum(oa_values) / len(oa_values)
-                        stats = {'max': max_val, 'min': min_val, 'avg': avg_val}
-                    except Exception:
-                        stats = None
-
-                if (
-                        measure_type != ConditionMeasurePoint.MeasureType.SPEED
-                        and times
-                        and oa_values
-                ):
-                    length = min(len(times), len(oa_values))
-                    oa_series.append({
-                        'name': series_name,
-                        'measure_type': measure_type,
-                        'unit': meta['oa_unit'],
-                        'time': times[:length],
-                        'values': oa_values[:length],
-                        'stats': stats,
-                    })
-
-                table_items.append(obj)
-
-    table_data = AcousticTableItemSerializer(table_items, many=True).data
-    return Response.success(
+    table_data = AcousticTableItemSerializer([entry[0] for entry in entries], many=True).data
+    # 流式输出在视图返回后执行，此时的数据库异常无法再返回错误信封：全部查询在此之前完成
+    _load_deferred_spectra(entries, resolution)
+    return Response.stream(
         data={
-            'spectrum_series': spectrum_series,
-            'oa_series': oa_series,
+            'spectrum_series': _iter_spectrum_series(entries, resolution, max_points),
+            'oa_series': _iter_oa_series(entries, max_points),
             'table': table_data
         },
         message='查询成功'
     )
 
 
+def _load_deferred_spectra(entries, resolution):
+    """为尚未生成频谱派生数据的历史记录一次性加载 spectrum_json，避免流式输出时逐条回查数据库"""
+    pending = {}
+    for obj, _series_name, measure_type, _meta in entries:
+        if measure_type == ConditionMeasurePoint.MeasureType.SPEED or obj.spectrum_blob:
+            continue
+        if resolution != RESOLUTION_NARROWBAND and resolution in (obj.band_levels or {}):
+            continue
+        if 'spectrum_json' in obj.get_deferred_fields():
+            pending[obj.pk] = obj
+    if not pending:
+        return
+    rows = AcousticTestData.objects.filter(pk__in=list(pending)).values_list('pk', 'spectrum_json')
+    for pk, spectrum_json in rows:
+        pending[pk].spectrum_json = spectrum_json
+
+
+def _iter_spectrum_series(entries, resolution, max_points):
+    """逐条生成频谱曲线，供流式响应按需编码"""
+    for obj, series_name, measure_type, meta in entries:
+        if measure_type == ConditionMeasurePoint.MeasureType.SPEED:
+            continue
+        if resolution == RESOLUTION_NARROWBAND:
+            freq, spectrum_values = load_spectrum_arrays(obj)
+            freq, spectrum_values = downsample_xy(freq, spectrum_values, max_points)
+            spectrum_data = {
+                'frequency': round_significant(freq),
+                'values': round_significant(spectrum_values),
+            }
+        else:
+            spectrum_data = _get_band_levels(obj, measure_type, resolution)
+        if len(spectrum_data['frequency']):
+            yield {
+                'name': series_name,
+                'measure_type': measure_type,
+                'unit': meta['spectrum_unit'],
+                'resolution': resolution,
+                **spectrum_data,
+            }
+
+
+def _iter_oa_series(entries, max_points):
+    """逐条生成总声压级曲线，供流式响应按需编码"""
+    for obj, series_name, measure_type, meta in entries:
+        if measure_type == ConditionMeasurePoint.MeasureType.SPEED:
+            continue
+
+        # OA 数据处理（时间轴也可以类似处理）
+        oa = _safe_parse_series(obj.oa_json) or {}
+        # 如果需要，也可以为时间轴创建类似函数
+        times_raw = _pick_value_list(oa, ['time', 'Time', 't', 'T'])
+        times = _normalize_numeric_list(times_raw)
+
+        oa_values_raw = _pick_value_list(
+            oa,
+            ['OA', 'dB(A)', 'dBA', 'value', 'values']
+        )
+        oa_values = _normalize_numeric_list(oa_values_raw)
+
+        if not times or not oa_values:
+            continue
+
+        stats = None
+        try:
+            max_val = max(oa_values)
+            min_val = min(oa_values)
+            avg_val = sum(oa_values) / len(oa_values)
+            stats = {'max': max_val, 'min': min_val, 'avg': avg_val}
+        except Exception:
+            stats = None
+
+        times_arr, oa_arr = downsample_xy(times, oa_values, max_points)
+        yield {
+            'name': series_name,
+            'measure_type': measure_type,
+            'unit': meta['oa_unit'],
+            'time': times_arr,
+            'values': oa_arr,
+            'stats': stats,
+        }
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def compare_acoustic_spectra(request):
+    """多车型频谱对比：插值到公共频率网格，返回相对参考车型的差值曲线与各频带差值极值"""
+    serializer = AcousticCompareSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response.bad_request(message='查询参数错误', data=serializer.errors)
+    params = serializer.validated_data
+
+    comparisons = compare_spectra(
+        vehicle_model_ids=params['vehicle_model_ids'],
+        reference_vehicle_id=params['reference_vehicle_id'],
+        work_conditions=params['work_conditions'],
+        measure_points=params['measure_points'],
+        num_points=params['num_points'],
+        scale=params['scale'],
+        band_resolution=params['band_resolution'],
+        f_min=params.get('f_min'),
+        f_max=params.get('f_max'),
+    )
+    for comparison in comparisons:
+        meta = MEASURE_TYPE_META.get(
+            comparison.get('measure_type'),
+            MEASURE_TYPE_META[ConditionMeasurePoint.MeasureType.NOISE]
+        )
+        comparison['unit'] = meta['spectrum_unit']
+
+    return Response.success(
+        data={
+            'reference_vehicle_id': params['reference_vehicle_id'],
+            'scale': params['scale'],
+            'band_resolution': params['band_resolution'],
+            'comparisons': comparisons,
+        },
+        message='对比成功'
+    )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_acoustic_envelope(request):
+    """车队统计包络：工况测点下全部车型的 P10/P50/P90 曲线，可叠加指定车型的曲线"""
+    serializer = AcousticEnvelopeQuerySerializer(data=request.GET)
+    if not serializer.is_valid():
+        return Response.bad_request(message='参数错误', data=serializer.errors)
+    params = serializer.validated_data
+    resolution = params['resolution']
+
+    cp_qs = ConditionMeasurePoint.objects.all()
+    if params.get('condition_point_id'):
+        cp = cp_qs.filter(pk=params['condition_point_id']).first()
+    else:
+        cp = cp_qs.filter(
+            work_condition=params['work_condition'],
+            measure_point=params['measure_point'],
+        ).order_by('id').first()
+    if cp is None:
+        return Response.not_found(message='工况测点不存在')
+
+    meta = MEASURE_TYPE_META.get(cp.measure_type, MEASURE_TYPE_META[ConditionMeasurePoint.MeasureType.NOISE])
+    env = envelope.get_envelope(cp.id)
+    data = {
+        'condition_point_id': cp.id,
+        'work_condition': cp.work_condition,
+        'measure_point': cp.measure_point,
+        'measure_type': cp.measure_type,
+        'unit': meta['spectrum_unit'],
+        'resolution': resolution,
+        'vehicle_count': env.vehicle_count,
+        'oa_percentiles': env.oa_percentiles,
+        'frequency': [],
+        **{key: [] for key in envelope.PERCENTILE_KEYS},
+    }
+
+    grid = None
+    if resolution == RESOLUTION_NARROWBAND:
+        decoded = envelope.decode_envelope(env.narrowband_blob)
+        if decoded is not None:
+            grid, percentiles = decoded
+            data['frequency'] = to_json_floats(grid)
+            for key, values in zip(envelope.PERCENTILE_KEYS, percentiles):
+                data[key] = _matrix_to_json(values)
+    else:
+        band = (env.band_envelopes or {}).get(resolution)
+        if band:
+            data.update(band)
+
+    vehicle_model_id = params.get('vehicle_model_id')
+    if vehicle_model_id:
+        latest = (
+            AcousticLatestResult.objects
+            .select_related('test_data', 'vehicle_model')
+            .defer('test_data__spectrum_json', 'test_data__oa_json')
+            .filter(vehicle_model_id=vehicle_model_id, condition_point_id=cp.id)
+            .first()
+        )
+        vehicle_series = None
+        if latest is not None:
+            obj = latest.test_data
+            if resolution == RESOLUTION_NARROWBAND:
+                values = []
+                if grid is not None:
+                    freq, spectrum_values = load_spectrum_arrays(obj)
+                    if len(freq) > 1:
+                        order = np.argsort(freq, kind='stable')
+                        values = _matrix_to_json(np.interp(
+                            grid, freq[order], spectrum_values[order], left=np.nan, right=np.nan,
+                        ))
+            else:
+                band = _get_band_levels(obj, cp.measure_type, resolution)
+                lookup = dict(zip(band['frequency'], band['values']))
+                values = [lookup.get(center) for center in data['frequency']]
+            vehicle_series = {
+                'vehicle_model_id': vehicle_model_id,
+                'name': latest.vehicle_model.vehicle_model_name,
+                'test_date': latest.test_date,
+                'rms_value': latest.rms_value,
+                'values': values,
+            }
+        data['vehicle'] = vehicle_series
+
+    return Response.success(data=data, message='获取车队统计包络成功')
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def query_steady_state_data(request):
@@ -371,34 +494,27 @@ def query_steady_state_data(request):
     if not work_conditions or not measure_points:
         return Response.success(data={'charts': []}, message='查询成功')
 
+    # 最新测试结果表中每个 (车型, 工况测点) 仅一行，无需排序去重
     qs = (
-        AcousticTestData.objects
+        AcousticLatestResult.objects
         .select_related('vehicle_model', 'condition_point')
-        # 避免在排序时将大体积 JSON 字段（频谱/总声压级）搬入临时表，降低内存占用
-        .defer('spectrum_json', 'oa_json')
         .filter(
             vehicle_model_id__in=vehicle_model_ids,
             condition_point__work_condition__in=work_conditions,
             condition_point__measure_point__in=measure_points,
         )
-        .order_by(
-            'vehicle_model_id',
-            # 与索引 idx_vm_cp_date_id 对齐，避免跨表字段排序导致的大排序与临时表
-            'condition_point_id',
-            '-test_date',
-            '-id',
-        )
     )
 
+    # 同一工况/测点对应多个 ConditionMeasurePoint 时按 (test_date, 记录ID) 取最新
     latest_records = {}
     for obj in qs:
         cp = obj.condition_point
-        if not cp:
-            continue
         combo_key = (obj.vehicle_model_id, cp.work_condition, cp.measure_point)
-        if combo_key in latest_records:
-            continue
-        latest_records[combo_key] = obj
+        sort_key = (obj.test_date is not None, obj.test_date or date.min, obj.test_data_id)
+        current = latest_records.get(combo_key)
+        if current is None or sort_key > current[0]:
+            latest_records[combo_key] = (sort_key, obj)
+    latest_records = {key: value[1] for key, value in latest_records.items()}
 
     series_buckets = defaultdict(dict)
     for obj in latest_records.values():
@@ -469,14 +585,8 @@ def get_dynamic_work_conditions(request):
     if not serializer.is_valid():
         return Response.bad_request(message='参数错误', data=serializer.errors)
     vehicle_model_ids = serializer.validated_data['vehicle_model_ids']
-    values = (
-        DynamicNoiseData.objects
-        .filter(vehicle_model_id__in=vehicle_model_ids)
-        .values_list('condition_measure_point__work_condition', flat=True)
-        .distinct()
-        .order_by('condition_measure_point__work_condition')
-    )
-    return Response.success(data=list(values), message='获取工况选项成功')
+    values = facets.list_work_conditions(AcousticFacet.Source.DYNAMIC, vehicle_model_ids)
+    return Response.success(data=values, message='获取工况选项成功')
 
 
 @api_view(['GET'])
@@ -487,26 +597,7 @@ def get_dynamic_measure_points(request):
         return Response.bad_request(message='参数错误', data=serializer.errors)
     vehicle_model_ids = serializer.validated_data['vehicle_model_ids']
     work_conditions = serializer.validated_data['work_conditions']
-    values = (
-        DynamicNoiseData.objects
-        .filter(
-            vehicle_model_id__in=vehicle_model_ids,
-            condition_measure_point__work_condition__in=work_conditions,
-        )
-        .values(
-            'condition_measure_point__measure_point',
-            'condition_measure_point__measure_type',
-        )
-        .distinct()
-        .order_by('condition_measure_point__measure_type', 'condition_measure_point__measure_point')
-    )
-    data = [
-        {
-            'measure_point': item['condition_measure_point__measure_point'],
-            'measure_type': item['condition_measure_point__measure_type'],
-        }
-        for item in values
-    ]
+    data = facets.list_measure_points(AcousticFacet.Source.DYNAMIC, vehicle_model_ids, work_conditions)
     return Response.success(data=data, message='获取测点选项成功')
 
 
@@ -522,10 +613,13 @@ def query_dynamic_noise(request):
     measure_points = serializer.validated_data['measure_points']
     page = serializer.validated_data['page']
     page_size = serializer.validated_data['page_size']
+    max_points = serializer.validated_data.get('max_points')
 
     qs = (
         DynamicNoiseData.objects
         .select_related('condition_measure_point')
+        # 原始曲线仅在历史记录缺少规范曲线时按需加载
+        .defer('sound_pressure_curve', 'speech_clarity_curve')
         .filter(
             vehicle_model_id__in=vehicle_model_ids,
             condition_measure_point__work_condition__in=work_conditions,
@@ -556,28 +650,26 @@ def query_dynamic_noise(request):
         if obj.x_axis_type:
             axis_types.add(obj.x_axis_type)
 
-        sp_pairs = _build_curve_pairs(
-            obj.sound_pressure_curve,
-            ['speed', 'rpm', 'speed/rpm', 'km/h'],
-            ['dB(A)', 'value', 'values'],
-        )
+        sp_pairs = curve_to_pairs(canonical_curve(
+            obj.sound_pressure_normalized,
+            lambda: normalize_speed_curve(obj.sound_pressure_curve, SOUND_PRESSURE_Y_KEYS),
+        ))
         if sp_pairs:
             sound_pressure_series.append({
                 'name': series_name,
                 'x_axis_type': obj.x_axis_type,
-                'data': sp_pairs,
+                'data': downsample_pairs(sp_pairs, max_points),
             })
 
-        sc_pairs = _build_curve_pairs(
-            obj.speech_clarity_curve,
-            ['speed', 'rpm', 'speed/rpm', 'km/h'],
-            ['%AI', 'value', 'values'],
-        )
+        sc_pairs = curve_to_pairs(canonical_curve(
+            obj.speech_clarity_normalized,
+            lambda: normalize_speed_curve(obj.speech_clarity_curve, SPEECH_CLARITY_Y_KEYS),
+        ))
         if sc_pairs:
             speech_clarity_series.append({
                 'name': series_name,
                 'x_axis_type': obj.x_axis_type,
-                'data': sc_pairs,
+                'data': downsample_pairs(sc_pairs, max_points),
             })
 
     table_data = DynamicNoiseTableSerializer(rows, many=True, context={'request': request}).data
@@ -615,21 +707,8 @@ def get_dynamic_spectrum_data(request, pk: int):
     if not obj.spectrum_file:
         return Response.bad_request(message='当前记录未上传频谱数据')
 
-    # 将数据库中存储的路径（可能包含 /media/ 前缀或起始斜杠）规范化为
-    # 相对于 MEDIA_ROOT 的路径，再拼接成磁盘绝对路径
-    raw_path = str(obj.spectrum_file)
-    rel_path = raw_path.replace('\\', '/').strip()
-    # 去掉开头的斜杠，避免在 Windows 上被当作磁盘根路径处理
-    rel_path = rel_path.lstrip('/')
-    media_prefix = (settings.MEDIA_URL or '').lstrip('/')  # 例如 'media/'
-    if media_prefix and rel_path.startswith(media_prefix):
-        rel_path = rel_path[len(media_prefix):]
-        rel_path = rel_path.lstrip('/')
-
-    media_root = os.path.abspath(settings.MEDIA_ROOT)
-    file_path = os.path.abspath(os.path.join(media_root, rel_path))
-    # 防止路径越界
-    if not file_path.startswith(media_root):
+    file_path = dynamic_spectrum.resolve_media_path(obj.spectrum_file)
+    if file_path is None:
         return Response.bad_request(message='频谱文件路径非法')
     if not os.path.exists(file_path):
         return Response.bad_request(message='频谱文件不存在')
@@ -654,3 +733,76 @@ def get_dynamic_spectrum_data(request, pk: int):
         f'attachment; filename="{quoted_name}"; filename*=UTF-8\'\'{quoted_name}'
     )
     return response
+
+
+def _matrix_to_json(arr):
+    """将切片结果按 float32 精度取整后转为列表，无效值（NaN/Inf）输出为 None"""
+    rounded = round_significant(arr)
+    if np.isfinite(rounded).all():
+        return rounded.tolist()
+    return np.where(np.isfinite(rounded), rounded, None).tolist()
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_dynamic_spectrum_slice(request, pk: int):
+    """
+    三维频谱（频率 × 车速/转速）切片查询
+
+    mode=spectrum  指定车速/转速下的频谱（x，可选 f_min/f_max/max_points）
+    mode=frequency 指定频率随车速/转速的变化（frequency，可选 x_min/x_max）
+    mode=band      频段能量叠加声压级随车速/转速的变化（f_min/f_max，可选 x_min/x_max）
+    mode=tile      指定范围的降采样热力图（可选 f_min/f_max/x_min/x_max/max_rows/max_cols）
+    """
+    serializer = DynamicSpectrumSliceSerializer(data=request.GET)
+    if not serializer.is_valid():
+        return Response.bad_request(message='参数错误', data=serializer.errors)
+    params = serializer.validated_data
+
+    obj = DynamicNoiseData.objects.filter(pk=pk).only('id', 'x_axis_type', 'spectrum_matrix_path').first()
+    if obj is None:
+        return Response.not_found(message='数据不存在')
+    if not obj.spectrum_matrix_path:
+        return Response.bad_request(message='当前记录未导入三维频谱矩阵')
+    matrix_dir = dynamic_spectrum.resolve_media_path(obj.spectrum_matrix_path)
+    if matrix_dir is None:
+        return Response.bad_request(message='频谱文件路径非法')
+
+    try:
+        frequencies, axis, levels = dynamic_spectrum.open_spectrum_matrix(matrix_dir)
+    except dynamic_spectrum.SpectrumMatrixError as exc:
+        return Response.bad_request(message=str(exc))
+
+    mode = params['mode']
+    if mode == DynamicSpectrumSliceSerializer.MODE_SPECTRUM:
+        result = dynamic_spectrum.spectrum_at(
+            frequencies, axis, levels, params['x'],
+            f_min=params.get('f_min'), f_max=params.get('f_max'), max_points=params.get('max_points'),
+        )
+    elif mode == DynamicSpectrumSliceSerializer.MODE_FREQUENCY:
+        result = dynamic_spectrum.frequency_line(
+            frequencies, axis, levels, params['frequency'],
+            x_min=params.get('x_min'), x_max=params.get('x_max'),
+        )
+    elif mode == DynamicSpectrumSliceSerializer.MODE_BAND:
+        result = dynamic_spectrum.band_level(
+            frequencies, axis, levels, params['f_min'], params['f_max'],
+            x_min=params.get('x_min'), x_max=params.get('x_max'),
+        )
+    else:
+        result = dynamic_spectrum.tile(
+            frequencies, axis, levels,
+            f_min=params.get('f_min'), f_max=params.get('f_max'),
+            x_min=params.get('x_min'), x_max=params.get('x_max'),
+            max_rows=params['max_rows'], max_cols=params['max_cols'],
+        )
+
+    data = {
+        'id': obj.id,
+        'mode': mode,
+        'x_axis_type': obj.x_axis_type,
+        'shape': [len(frequencies), len(axis)],
+    }
+    for key, value in result.items():
+        data[key] = _matrix_to_json(value) if isinstance(value, np.ndarray) else value
+    return Response.success(data=data, message='查询成功')
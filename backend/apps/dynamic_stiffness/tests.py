@@ -0,0 +1,79 @@
+import json
+from datetime import date
+from unittest import mock
+
+from django.db import DatabaseError
+from django.db.models.query import QuerySet
+from django.test import TestCase
+
+from apps.modal.models import VehicleModel
+
+from .models import MountIsolationData, VehicleMountIsolationTest
+
+
+QUERY_URL = '/api/dynamic-stiffness/isolation-data/query/'
+
+
+def read_stream(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+# ==================== 悬置隔振率流式查询 ====================
+
+class IsolationDataQueryTests(TestCase):
+    """数据库访问在返回流式响应前完成：查询异常返回错误信封，输出阶段不再查询"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehicle = VehicleModel.objects.create(vehicle_model_name='测试车型', vin='TESTVIN0000000001')
+        old_test = VehicleMountIsolationTest.objects.create(
+            vehicle_model=cls.vehicle, test_date=date(2024, 1, 1), test_engineer='张三'
+        )
+        new_test = VehicleMountIsolationTest.objects.create(
+            vehicle_model=cls.vehicle, test_date=date(2025, 1, 1), test_engineer='张三'
+        )
+        MountIsolationData.objects.create(
+            test=old_test, measuring_point='左悬置', speed_or_rpm=[10], x_isolation=[1.0]
+        )
+        MountIsolationData.objects.create(
+            test=new_test, measuring_point='左悬置', speed_or_rpm=[10, 20], x_isolation=[20.0, 25.0]
+        )
+        MountIsolationData.objects.create(
+            test=old_test, measuring_point='右悬置', speed_or_rpm=[30], z_active=[0.5]
+        )
+
+    def query(self, **payload):
+        return self.client.post(QUERY_URL, {'vehicle_ids': [self.vehicle.id], **payload}, content_type='application/json')
+
+    def test_latest_row_per_measuring_point(self):
+        response = self.query(directions=['X', 'z'])
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            body = read_stream(response)
+        self.assertTrue(body['success'])
+        self.assertEqual(body['data']['energy_type'], 0)
+        rows = {row['measuring_point']: row for row in body['data']['data']}
+        self.assertEqual(set(rows), {'左悬置', '右悬置'})
+        self.assertEqual(rows['左悬置']['speed_or_rpm'], [10, 20])
+        self.assertEqual(rows['左悬置']['x']['isolation'], [20.0, 25.0])
+        self.assertEqual(rows['右悬置']['z'], {'active': [0.5], 'passive': [], 'isolation': []})
+        self.assertNotIn('y', rows['右悬置'])
+
+    def test_measuring_point_filter(self):
+        body = read_stream(self.query(measuring_points=['右悬置']))
+        self.assertEqual([row['measuring_point'] for row in body['data']['data']], ['右悬置'])
+
+    def test_database_error_returns_error_envelope(self):
+        with mock.patch.object(QuerySet, 'iterator', side_effect=DatabaseError('connection lost')):
+            response = self.query()
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+        self.assertIn('connection lost', response.json()['message'])
+
+    def test_validation_errors(self):
+        response = self.client.post(QUERY_URL, {'vehicle_ids': []}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(QUERY_URL, {'vehicle_ids': [999999]}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('999999', response.json()['message'])
@@ -374,54 +374,45 @@ def isolation_data_query(request):
             .order_by('measuring_point', '-test__test_date')
         )
 
-        # 聚合为 vehicle_id + measuring_point 的最近一条
+        # 聚合为 vehicle_id + measuring_point 的最近一条。
+        # 查询与去重在返回响应前完成（数据库异常仍走下方错误信封），流式输出只负责逐条序列化
+        latest_rows = []
         seen = set()
-        results = []
-        dir_map = {'X': 'x', 'Y': 'y', 'Z': 'z'}
-        for row in queryset:
+        for row in queryset.iterator(chunk_size=200):
             key = (row['test__vehicle_model_id'], row['measuring_point'])
             if key in seen:
                 continue
             seen.add(key)
-
-            data_entry = {
-                'vehicle_id': row['test__vehicle_model_id'],
-                'vehicle_name': row['test__vehicle_model__vehicle_model_name'],
-                'measuring_point': row['measuring_point'],
-                'speed_or_rpm': row.get('speed_or_rpm') or [],
-                'layout_image_path': row.get('layout_image_path') or '',
-            }
-
-            # 仅返回所需方向（数组字段在未迁移前返回空数组占位）
-            for d in directions:
-                key_prefix = dir_map.get(d.upper())
-                if not key_prefix:
-                    continue
-                if key_prefix == 'x':
-                    data_entry[key_prefix] = {
-                        'active': row.get('x_active') or [],
-                        'passive': row.get('x_passive') or [],
-                        'isolation': row.get('x_isolation') or [],
-                    }
-                elif key_prefix == 'y':
-                    data_entry[key_prefix] = {
-                        'active': row.get('y_active') or [],
-                        'passive': row.get('y_passive') or [],
-                        'isolation': row.get('y_isolation') or [],
-                    }
-                elif key_prefix == 'z':
+            latest_rows.append(row)
+
+        def iter_results():
+            dir_map = {'X': 'x', 'Y': 'y', 'Z': 'z'}
+            for row in latest_rows:
+                data_entry = {
+                    'vehicle_id': row['test__vehicle_model_id'],
+                    'vehicle_name': row['test__vehicle_model__vehicle_model_name'],
+                    'measuring_point': row['measuring_point'],
+                    'speed_or_rpm': row.get('speed_or_rpm') or [],
+                    'layout_image_path': row.get('layout_image_path') or '',
+                }
+
+                # 仅返回所需方向（数组字段在未迁移前返回空数组占位）
+                for d in directions:
+                    key_prefix = dir_map.get(d.upper())
+                    if not key_prefix:
+                        continue
                     data_entry[key_prefix] = {
-                        'active': row.get('z_active') or [],
-                        'passive': row.get('z_passive') or [],
-                        'isolation': row.get('z_isolation') or [],
+                        'active': row.get(f'{key_prefix}_active') or [],
+                        'passive': row.get(f'{key_prefix}_passive') or [],
+                        'isolation': row.get(f'{key_prefix}_isolation') or [],
                     }
 
-            results.append(data_entry)
+                yield data_entry
 
-        return Response.success(data={
+        return Response.stream(data={
             'energy_type': energy_type,
             'x_axis_label': x_axis_label,
-            'data': results,
+            'data': iter_results(),
         }, message="查询成功")
     except Exception as e:
         return Response.error(message=f"查询失败: {str(e)}")
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ExportJobConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.export_job'
+    verbose_name = '后台导出任务'
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.export_job.services import (
+    claim_next_job,
+    default_worker_name,
+    fail_stale_jobs,
+    purge_expired_jobs,
+    run_job,
+)
+
+
+# 清理中断任务与过期文件的间隔（秒）
+MAINTENANCE_INTERVAL = 600
+
+
+class Command(BaseCommand):
+    help = '后台导出任务 worker：轮询并执行排队中的导出任务（可启动多个进程并行执行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2,
+            help='无排队任务时的轮询间隔（秒）',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='执行完当前排队中的任务后退出',
+        )
+
+    def handle(self, *args, **options):
+        worker = default_worker_name()
+        interval = max(0.1, options['interval'])
+        self.stdout.write(f'导出任务 worker {worker} 已启动')
+        last_maintenance = None
+        try:
+            while True:
+                # 长期运行的进程需自行关闭超时/失效的数据库连接
+                close_old_connections()
+                if last_maintenance is None or time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                    stale = fail_stale_jobs()
+                    purged = purge_expired_jobs()
+                    if stale or purged:
+                        self.stdout.write(f'标记中断任务 {stale} 个，清理过期任务 {purged} 个')
+                    last_maintenance = time.monotonic()
+
+                job = claim_next_job(worker)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(interval)
+                    continue
+
+                self.stdout.write(f'开始执行导出任务 {job.pk}（{job.kind}）')
+                job = run_job(job)
+                if job.status == job.Status.SUCCESS:
+                    self.stdout.write(self.style.SUCCESS(f'导出任务 {job.pk} 完成，共 {job.processed_rows} 行'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'导出任务 {job.pk} 失败: {job.error_message}'))
+        except KeyboardInterrupt:
+            self.stdout.write('导出任务 worker 已停止')
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='导出类型')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='导出参数')),
+                ('status', models.CharField(choices=[('pending', '排队中'), ('running', '导出中'), ('success', '已完成'), ('failed', '失败')], db_index=True, default='pending', max_length=20, verbose_name='状态')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='已导出行数')),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True, verbose_name='总行数')),
+                ('file', models.FileField(blank=True, max_length=255, upload_to='export_jobs/%Y%m%d/', verbose_name='导出文件')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='下载文件名')),
+                ('error_message', models.TextField(blank=True, verbose_name='错误信息')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='执行进程')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '后台导出任务',
+                'verbose_name_plural': '后台导出任务',
+                'db_table': 'export_job',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import models
+
+
+class ExportJob(models.Model):
+    """
+    后台导出任务
+
+    导出接口只创建任务（pending），由 run_export_worker 命令领取并生成文件，
+    前端轮询状态，完成后从媒体存储下载。updated_at 兼作心跳，长时间未更新的运行中任务视为中断。
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', '排队中'
+        RUNNING = 'running', '导出中'
+        SUCCESS = 'success', '已完成'
+        FAILED = 'failed', '失败'
+
+    kind = models.CharField(max_length=50, verbose_name='导出类型')
+    params = models.JSONField(default=dict, blank=True, verbose_name='导出参数')
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        db_index=True,
+        verbose_name='状态'
+    )
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name='已导出行数')
+    total_rows = models.PositiveIntegerField(null=True, blank=True, verbose_name='总行数')
+    file = models.FileField(upload_to='export_jobs/%Y%m%d/', max_length=255, blank=True, verbose_name='导出文件')
+    filename = models.CharField(max_length=255, blank=True, verbose_name='下载文件名')
+    error_message = models.TextField(blank=True, verbose_name='错误信息')
+    worker = models.CharField(max_length=100, blank=True, verbose_name='执行进程')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='完成时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'export_job'
+        verbose_name = '后台导出任务'
+        verbose_name_plural = '后台导出任务'
+        ordering = ['-id']
+
+    def __str__(self) -> str:
+        return f"{self.kind} - {self.status} - {self.id}"
@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+from .models import ExportJob
+from .services import EXPORT_KINDS
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=[(kind, label) for kind, (label, _) in EXPORT_KINDS.items()])
+    params = serializers.DictField(required=False, default=dict)
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """导出任务状态，progress 为百分比（总行数未知时为 None）"""
+
+    kind_display = serializers.SerializerMethodField()
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress = serializers.SerializerMethodField()
+    file_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id',
+            'kind',
+            'kind_display',
+            'status',
+            'status_display',
+            'processed_rows',
+            'total_rows',
+            'progress',
+            'filename',
+            'file_url',
+            'error_message',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+
+    def get_kind_display(self, obj):
+        return EXPORT_KINDS.get(obj.kind, (obj.kind, None))[0]
+
+    def get_progress(self, obj):
+        if obj.status == ExportJob.Status.SUCCESS:
+            return 100.0
+        if not obj.total_rows:
+            return None
+        return round(min(obj.processed_rows / obj.total_rows, 1) * 100, 1)
+
+    def get_file_url(self, obj):
+        if obj.status != ExportJob.Status.SUCCESS or not obj.file:
+            return None
+        request = self.context.get('request')
+        return request.build_absolute_uri(obj.file.url) if request else obj.file.url
@@ -0,0 +1,135 @@
+"""
+后台导出任务执行
+
+任务保存在 ExportJob 表中，不依赖外部消息队列：
+导出接口调用 enqueue_export 创建任务，run_export_worker 命令轮询领取（条件 UPDATE 抢占，
+多个 worker 并行时同一任务只会被一个进程领取），生成的文件保存到媒体存储。
+
+导出类型在 EXPORT_KINDS 中登记，入口函数签名为 run_export_job(params, report)，
+返回 (下载文件名, openpyxl 工作簿)；report(已导出行数, 总行数=None) 用于汇报进度。
+"""
+import logging
+import os
+import socket
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+try:
+    import openpyxl  # noqa: F401
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+from .models import ExportJob
+
+
+logger = logging.getLogger(__name__)
+
+# 导出类型 → (名称, 入口函数路径)
+EXPORT_KINDS = {
+    'nvh_task.main_records': ('试验任务单', 'apps.nvh_task.exports.run_export_job'),
+    'vehicle_body.voc': ('VOC气味数据', 'apps.vehicle_body.exports.run_export_job'),
+}
+
+ERROR_MESSAGE_MAX_LENGTH = 2000
+
+
+def default_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# ==================== 任务创建与领取 ====================
+
+def enqueue_export(kind: str, params: dict) -> ExportJob:
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f'不支持的导出类型: {kind}')
+    return ExportJob.objects.create(kind=kind, params=params or {})
+
+
+def claim_next_job(worker: str):
+    """按创建顺序领取一个排队中的任务，无任务时返回 None"""
+    pending_ids = list(
+        ExportJob.objects
+        .filter(status=ExportJob.Status.PENDING)
+        .order_by('id')
+        .values_list('id', flat=True)[:10]
+    )
+    for job_id in pending_ids:
+        now = timezone.now()
+        claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.Status.PENDING).update(
+            status=ExportJob.Status.RUNNING,
+            worker=worker,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return ExportJob.objects.get(pk=job_id)
+    return None
+
+
+# ==================== 任务执行 ====================
+
+def _progress_reporter(job: ExportJob):
+    def report(processed_rows, total_rows=None):
+        fields = {'processed_rows': processed_rows, 'updated_at': timezone.now()}
+        if total_rows is not None:
+            fields['total_rows'] = total_rows
+        ExportJob.objects.filter(pk=job.pk).update(**fields)
+    return report
+
+
+def run_job(job: ExportJob) -> ExportJob:
+    """执行已领取的任务；导出异常记录在任务上，不向外抛出"""
+    try:
+        run_export = import_string(EXPORT_KINDS[job.kind][1])
+        filename, workbook = run_export(job.params or {}, _progress_reporter(job))
+        with tempfile.TemporaryFile() as tmp:
+            workbook.save(tmp)
+            tmp.seek(0)
+            job.file.save(f'{job.pk}{os.path.splitext(filename)[1]}', File(tmp), save=False)
+        job.refresh_from_db(fields=['processed_rows', 'total_rows'])
+        job.filename = filename
+        job.status = ExportJob.Status.SUCCESS
+        job.finished_at = timezone.now()
+        job.save(update_fields=['file', 'filename', 'status', 'finished_at', 'updated_at'])
+    except Exception as exc:
+        logger.exception('导出任务 %s 执行失败', job.pk)
+        job.status = ExportJob.Status.FAILED
+        job.error_message = str(exc)[:ERROR_MESSAGE_MAX_LENGTH] or exc.__class__.__name__
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+    return job
+
+
+# ==================== 任务维护 ====================
+
+def fail_stale_jobs() -> int:
+    """将长时间未更新进度的运行中任务标记为失败（worker 进程异常退出）"""
+    deadline = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_TIMEOUT)
+    return ExportJob.objects.filter(status=ExportJob.Status.RUNNING, updated_at__lt=deadline).update(
+        status=ExportJob.Status.FAILED,
+        error_message='导出进程中断，请重新导出',
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+def purge_expired_jobs() -> int:
+    """删除超过保留期的已结束任务及其文件"""
+    deadline = timezone.now() - timedelta(days=settings.EXPORT_JOB_RETENTION_DAYS)
+    expired = ExportJob.objects.filter(
+        status__in=[ExportJob.Status.SUCCESS, ExportJob.Status.FAILED],
+        finished_at__lt=deadline,
+    )
+    count = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
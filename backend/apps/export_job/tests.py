@@ -0,0 +1,148 @@
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from apps.nvh_task.models import MainRecord
+
+from . import services
+from .models import ExportJob
+
+
+TASK_KIND = 'nvh_task.main_records'
+
+
+def failing_export(params, report):
+    report(0, 10)
+    raise RuntimeError('磁盘空间不足')
+
+
+class ExportJobTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+
+# ==================== 任务领取 ====================
+
+class ClaimNextJobTests(ExportJobTestCase):
+
+    def test_claims_in_creation_order(self):
+        first = services.enqueue_export(TASK_KIND, {})
+        second = services.enqueue_export(TASK_KIND, {})
+        self.assertEqual(services.claim_next_job('w1').pk, first.pk)
+        job = services.claim_next_job('w2')
+        self.assertEqual(job.pk, second.pk)
+        self.assertEqual(job.status, ExportJob.Status.RUNNING)
+        self.assertEqual(job.worker, 'w2')
+        self.assertIsNotNone(job.started_at)
+        self.assertIsNone(services.claim_next_job('w3'))
+
+    def test_job_claimed_by_other_worker_is_skipped(self):
+        first = services.enqueue_export(TASK_KIND, {})
+        second = services.enqueue_export(TASK_KIND, {})
+        real_now = timezone.now
+        competed = []
+
+        def now_after_competitor():
+            # 在读取排队任务之后、条件 UPDATE 之前，另一个 worker 抢先领取了第一个任务
+            if not competed:
+                competed.append(True)
+                ExportJob.objects.filter(pk=first.pk).update(status=ExportJob.Status.RUNNING, worker='other')
+            return real_now()
+
+        with mock.patch('apps.export_job.services.timezone.now', side_effect=now_after_competitor):
+            job = services.claim_next_job('w1')
+
+        self.assertEqual(job.pk, second.pk)
+        self.assertEqual(job.worker, 'w1')
+        first.refresh_from_db()
+        self.assertEqual(first.worker, 'other')
+
+    def test_unknown_kind_rejected(self):
+        with self.assertRaises(ValueError):
+            services.enqueue_export('unknown', {})
+
+
+# ==================== 任务执行 ====================
+
+class RunJobTests(ExportJobTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(3):
+            MainRecord.objects.create(
+                model='A1' if index else 'B2',
+                vin_or_part_no=f'VIN{index}',
+                test_name='整车噪声',
+                warning_system_status='无需',
+                requester_name='张三',
+                schedule_start=timezone.make_aware(datetime(2025, 1, 1 + index)),
+            )
+
+    def test_success_writes_file_and_progress(self):
+        services.enqueue_export(TASK_KIND, {'model': 'a1', 'is_closed': False})
+        job = services.run_job(services.claim_next_job('w1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.SUCCESS)
+        self.assertEqual(job.total_rows, 2)
+        self.assertEqual(job.processed_rows, 2)
+        self.assertTrue(job.filename.endswith('.xlsx'))
+        with job.file.open('rb') as fp:
+            sheet = load_workbook(fp).active
+            # 表头 + 2 行数据
+            self.assertEqual(sheet.max_row, 3)
+
+    def test_failure_recorded_on_job(self):
+        services.enqueue_export(TASK_KIND, {})
+        kinds = {TASK_KIND: ('试验任务单', f'{__name__}.failing_export')}
+        with mock.patch.dict(services.EXPORT_KINDS, kinds), self.assertLogs('apps.export_job.services', level='ERROR'):
+            job = services.run_job(services.claim_next_job('w1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+        self.assertEqual(job.error_message, '磁盘空间不足')
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(job.file)
+
+    def test_stale_running_job_marked_failed(self):
+        services.enqueue_export(TASK_KIND, {})
+        job = services.claim_next_job('w1')
+        ExportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(services.fail_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+
+    def test_api_create_poll_and_download(self):
+        response = self.client.post('/api/export-jobs/', {'kind': TASK_KIND, 'params': {}}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        job_id = response.json()['data']['id']
+
+        response = self.client.get(f'/api/export-jobs/{job_id}/download/')
+        self.assertEqual(response.status_code, 400)
+
+        services.run_job(services.claim_next_job('w1'))
+        data = self.client.get(f'/api/export-jobs/{job_id}/').json()['data']
+        self.assertEqual(data['status'], ExportJob.Status.SUCCESS)
+        self.assertEqual(data['progress'], 100.0)
+
+        response = self.client.get(f'/api/export-jobs/{job_id}/download/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("filename*=utf-8''", response['Content-Disposition'])
+        response.close()
+
+        response = self.client.post('/api/export-jobs/', {'kind': 'unknown'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
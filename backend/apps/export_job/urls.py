@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', views.export_job_list, name='export-job-list'),
+    path('<int:pk>/', views.export_job_detail, name='export-job-detail'),
+    path('<int:pk>/download/', views.export_job_download, name='export-job-download'),
+]
@@ -0,0 +1,75 @@
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+
+from utils.response import Response
+
+from . import services
+from .models import ExportJob
+from .serializers import ExportJobCreateSerializer, ExportJobSerializer
+
+
+RECENT_JOB_LIMIT = 20
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def export_job_list(request):
+    """
+    GET: 最近的导出任务（可按 ids=1,2,3 批量查询状态）
+    POST: 创建导出任务，由后台 worker 执行
+    """
+    if request.method == 'POST':
+        serializer = ExportJobCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response.bad_request(message='参数错误', data=serializer.errors)
+        if not services.HAS_OPENPYXL:
+            return Response.bad_request(message='服务器未安装 openpyxl 库，无法导出 Excel')
+        job = services.enqueue_export(serializer.validated_data['kind'], serializer.validated_data['params'])
+        return Response.success(
+            data=ExportJobSerializer(job, context={'request': request}).data,
+            message='导出任务已创建',
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    queryset = ExportJob.objects.defer('params').order_by('-id')
+    ids = request.GET.get('ids')
+    if ids:
+        try:
+            queryset = queryset.filter(id__in=[int(i) for i in ids.split(',') if i.strip()])
+        except ValueError:
+            return Response.bad_request(message='ids 参数格式错误')
+    else:
+        kind = request.GET.get('kind')
+        if kind:
+            queryset = queryset.filter(kind=kind)
+        queryset = queryset[:RECENT_JOB_LIMIT]
+    serializer = ExportJobSerializer(queryset, many=True, context={'request': request})
+    return Response.success(data=serializer.data, message='获取导出任务成功')
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def export_job_detail(request, pk):
+    """导出任务状态与进度"""
+    job = ExportJob.objects.filter(pk=pk).first()
+    if job is None:
+        return Response.not_found(message='导出任务不存在')
+    return Response.success(data=ExportJobSerializer(job, context={'request': request}).data, message='获取导出任务成功')
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def export_job_download(request, pk):
+    """下载已完成任务的文件（以导出时的中文文件名下载）"""
+    job = ExportJob.objects.filter(pk=pk).first()
+    if job is None:
+        return Response.not_found(message='导出任务不存在')
+    if job.status != ExportJob.Status.SUCCESS or not job.file:
+        return Response.bad_request(message='导出任务尚未完成')
+    try:
+        file = job.file.open('rb')
+    except FileNotFoundError:
+        return Response.not_found(message='导出文件已过期，请重新导出')
+    return FileResponse(file, as_attachment=True, filename=job.filename)
@@ -5,3 +5,6 @@ class NvhBenchmarkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.nvh_benchmark'
     verbose_name = 'NVH对标分析'
+
+    def ready(self):
+        from apps.nvh_benchmark import signals  # noqa: F401
@@ -36,3 +36,27 @@ SUSPENSION_MEASURE_POINTS = SUSPENSION_FRONT_POINT_CANDIDATES + SUSPENSION_REAR_
 SOUND_INSULATION_FREQ_FIELDS = [
     400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3150, 4000, 5000, 6300, 8000, 10000,
 ]
+
+# 全车队排名指标：键 → (名称, 是否数值越大越好)
+FLEET_METRICS = {
+    'cruise_rms_front_right': ('匀速前排右耳声压级均值', False),
+    'cruise_rms_rear_left': ('匀速后排左耳声压级均值', False),
+    'speech_clarity_100': ('100km/h语音清晰度', True),
+    'speech_clarity_120': ('120km/h语音清晰度', True),
+    'uncontrolled_leakage': ('不受控泄漏量', False),
+    'sound_insulation_performance': ('隔声量', True),
+    'suspension_isolation_front': ('前减振器隔振率均值', True),
+    'suspension_isolation_rear': ('后减振器隔振率均值', True),
+}
+
+# 加速噪声公共横轴：重采样步长与分段统计宽度（按横轴类型）
+ACCELERATION_AXIS_STEPS = {
+    'speed': 1.0,
+    'rpm': 50.0,
+}
+ACCELERATION_BAND_WIDTHS = {
+    'speed': 20.0,
+    'rpm': 1000.0,
+}
+# 公共横轴的最大点数，超出时按比例放大步长
+ACCELERATION_AXIS_MAX_POINTS = 2000
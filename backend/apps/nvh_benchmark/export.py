@@ -0,0 +1,195 @@
+"""
+NVH 对标数据导出（Excel / CSV）
+
+export_sheets 将对标数据拆分为若干工作表（表头 + 行迭代器），两种格式共用：
+
+- CSV：逐行生成，各工作表之间以空行和 “# 表名” 分隔；
+- Excel：openpyxl 只写模式，经 utils.xlsx_stream 逐块发送，内存占用与曲线点数无关。
+"""
+import csv
+from typing import Iterable, Iterator, List, Tuple
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+from utils.xlsx_stream import XLSX_CONTENT_TYPE, iter_workbook
+
+from .constants import SOUND_INSULATION_FREQ_FIELDS
+
+
+POSITION_LABELS = {
+    'front_right': '前排右耳',
+    'rear_left': '后排左耳',
+}
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+
+
+# ==================== 工作表内容 ====================
+
+def _value_at(values, index):
+    return values[index] if values and index < len(values) else None
+
+
+def _vehicle_sheet(payload):
+    header = ['车型ID', '车型', '车型代号', '驱动形式', '能源类型', '悬架形式', '副车架形式', '前挡玻璃', '侧门玻璃']
+    fields = ['id', 'vehicle_model_name', 'cle_model_code', 'drive_type', 'energy_type',
+              'suspension_type', 'subframe_type', 'front_windshield', 'side_door_glass']
+    rows = ([vehicle.get(field) for field in fields] for vehicle in payload['vehicles']['all'])
+    return '车型信息', header, rows
+
+
+def _radar_sheet(payload):
+    sections = payload.get('cruise_radar') or {}
+    vehicles = payload['vehicles']['all']
+    header = ['位置', '工况', '测点'] + [vehicle['vehicle_model_name'] for vehicle in vehicles]
+
+    def rows():
+        for key, section in sections.items():
+            values_by_vehicle = {item['vehicle_id']: item['values'] for item in section['series']}
+            for index, indicator in enumerate(section['indicators']):
+                yield [POSITION_LABELS.get(key, key), indicator.get('work_condition'), indicator.get('label')] + [
+                    _value_at(values_by_vehicle.get(vehicle['id']), index) for vehicle in vehicles
+                ]
+    return '匀速声压级', header, rows()
+
+
+def _air_condition_sheet(payload):
+    sections = payload.get('air_condition') or {}
+    vehicles = payload['vehicles']['all']
+    header = ['位置', '档位'] + [vehicle['vehicle_model_name'] for vehicle in vehicles]
+
+    def rows():
+        for key, section in sections.items():
+            values_by_vehicle = {item['vehicle_id']: item['values'] for item in section['series']}
+            for index, gear in enumerate(section['gears']):
+                yield [POSITION_LABELS.get(key, key), gear] + [
+                    _value_at(values_by_vehicle.get(vehicle['id']), index) for vehicle in vehicles
+                ]
+    return '空调噪声', header, rows()
+
+
+def _acceleration_sheet(payload):
+    sections = payload.get('acceleration') or {}
+    header = ['位置', '测点', '车型', '横轴类型', '车速/转速', '声压级 dB(A)']
+
+    def rows():
+        for key, section in sections.items():
+            for series in section.get('series', []):
+                prefix = [
+                    POSITION_LABELS.get(key, key),
+                    section.get('condition_point_name'),
+                    series['vehicle_model_name'],
+                    series.get('x_axis_type'),
+                ]
+                for x, y in series['data']:
+                    yield prefix + [x, y]
+    return '加速噪声曲线', header, rows()
+
+
+def _chassis_sheets(payload):
+    chassis = payload.get('chassis')
+    if not chassis:
+        return []
+    parameter_header = ['车型', '悬架形式', '副车架形式', '轮胎品牌', '轮胎型号', '是否静音胎', '轮辋侧向刚度']
+    parameter_fields = ['vehicle_model_name', 'suspension_type', 'subframe_type', 'tire_brand',
+                        'tire_model', 'is_silent', 'rim_lateral_stiffness']
+    parameter_rows = ([row.get(field) for field in parameter_fields] for row in chassis['parameters'])
+
+    def force_rows():
+        for series in chassis['force_transfer']:
+            for x, y in series['data']:
+                yield [series['vehicle_model_name'], x, y]
+
+    isolation = chassis['suspension_isolation']
+    isolation_rows = ([series['vehicle_model_name']] + list(series['data']) for series in isolation['series'])
+    return [
+        ('底盘参数', parameter_header, parameter_rows),
+        ('力传递曲线', ['车型', '频率 Hz', 'dB'], force_rows()),
+        ('悬架隔振率', ['车型'] + list(isolation['categories']), isolation_rows),
+    ]
+
+
+def _acoustic_package_sheets(payload):
+    package = payload.get('acoustic_package')
+    if not package:
+        return []
+    table_header = ['车型', '悬架形式', '前挡玻璃', '侧门玻璃', '隔声量', '不受控泄漏量',
+                    '语音清晰度(100km/h)', '语音清晰度(120km/h)']
+    table_fields = ['vehicle_model_name', 'suspension_type', 'front_windshield', 'side_door_glass',
+                    'sound_insulation_performance', 'uncontrolled_leakage',
+                    'speech_clarity_100', 'speech_clarity_120']
+    table_rows = ([row.get(field) for field in table_fields] for row in package['table'])
+
+    curve = package['insulation_curve']
+    curve_rows = ([series['vehicle_model_name']] + list(series['values']) for series in curve['series'])
+    return [
+        ('声学包', table_header, table_rows),
+        ('隔声量曲线', ['车型'] + [f'{freq}Hz' for freq in curve.get('frequencies', SOUND_INSULATION_FREQ_FIELDS)],
+         curve_rows),
+    ]
+
+
+def export_sheets(payload) -> List[Tuple[str, list, Iterable[list]]]:
+    """[(表名, 表头, 行迭代器)]；payload 中未包含的数据块不输出"""
+    sheets = [
+        _vehicle_sheet(payload),
+        _radar_sheet(payload),
+        _air_condition_sheet(payload),
+        _acceleration_sheet(payload),
+    ]
+    sheets.extend(_chassis_sheets(payload))
+    sheets.extend(_acoustic_package_sheets(payload))
+    return sheets
+
+
+# ==================== CSV ====================
+
+class _Echo:
+    """csv.writer 的伪文件对象，write 直接返回写入的内容"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(payload) -> Iterator[bytes]:
+    writer = csv.writer(_Echo())
+    # BOM 使 Excel 按 UTF-8 识别中文
+    yield '\ufeff'.encode('utf-8')
+    for index, (title, header, rows) in enumerate(export_sheets(payload)):
+        lines = [] if index == 0 else ['\r\n']
+        lines.append(writer.writerow([f'# {title}']))
+        lines.append(writer.writerow(header))
+        for row in rows:
+            lines.append(writer.writerow(row))
+            if len(lines) >= 500:
+                yield ''.join(lines).encode('utf-8')
+                lines = []
+        if lines:
+            yield ''.join(lines).encode('utf-8')
+
+
+# ==================== Excel ====================
+
+def _build_workbook(payload):
+    wb = openpyxl.Workbook(write_only=True)
+    bold = Font(bold=True)
+    for title, header, rows in export_sheets(payload):
+        ws = wb.create_sheet(title=title)
+        header_cells = []
+        for value in header:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = bold
+            header_cells.append(cell)
+        ws.append(header_cells)
+        for row in rows:
+            ws.append(row)
+    return wb
+
+
+def iter_xlsx(payload) -> Iterator[bytes]:
+    return iter_workbook(lambda: _build_workbook(payload), thread_name='nvh-benchmark-export')
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.nvh_benchmark.ranking import rebuild_fleet_metrics
+
+
+class Command(BaseCommand):
+    help = '全量重建车队对标指标表（全车队排名）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='每批计算的车型数',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('开始重建车队对标指标...')
+        count = rebuild_fleet_metrics(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(f'成功写入 {count} 条指标值'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('modal', '0015_alter_airtightnessimage_door_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FleetMetricValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50, verbose_name='指标')),
+                ('value', models.FloatField(verbose_name='指标值')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('vehicle_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fleet_metric_values', to='modal.vehiclemodel', verbose_name='车型信息')),
+            ],
+            options={
+                'verbose_name': '车队对标指标值',
+                'verbose_name_plural': '车队对标指标值',
+                'db_table': 'nvh_fleet_metric_value',
+                'indexes': [models.Index(fields=['metric', 'value'], name='idx_fleet_metric_value')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'vehicle_model'), name='uniq_fleet_metric_vm')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class FleetMetricValue(models.Model):
+    """
+    车队对标指标值：每个在用车型每项对标指标一行
+
+    供全车队排名使用（见 ranking.py），由对标数据源的保存/删除信号按车型增量刷新，
+    批量写入后需执行 rebuild_fleet_metrics 重建。
+    """
+
+    metric = models.CharField(max_length=50, verbose_name='指标')
+    vehicle_model = models.ForeignKey(
+        'modal.VehicleModel',
+        on_delete=models.CASCADE,
+        related_name='fleet_metric_values',
+        verbose_name='车型信息'
+    )
+    value = models.FloatField(verbose_name='指标值')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'nvh_fleet_metric_value'
+        verbose_name = '车队对标指标值'
+        verbose_name_plural = '车队对标指标值'
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'vehicle_model'], name='uniq_fleet_metric_vm'),
+        ]
+        indexes = [
+            models.Index(fields=['metric', 'value'], name='idx_fleet_metric_value'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.metric} - {self.vehicle_model_id} - {self.value}"
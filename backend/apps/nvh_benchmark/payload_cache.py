@@ -0,0 +1,103 @@
+"""
+NVH 对标数据缓存
+
+对标页面的组合（主车型 + 对标车型 + 是否包含底盘/声学包）在评审会上会被反复查询，
+每次完整组装都需要数十次查询和曲线解析。这里按组合缓存 build_benchmark_payload 的结果，
+缓存键中带有各车型的“代号”：数据源（声学/动态噪声/轮胎/悬架隔振/隔声量/气密性/车型信息）
+写入时由信号在事务提交后为涉及的车型生成新代号，旧组合的缓存随即不再命中；
+工况测点名称变更则更新全局代号。
+
+代号使用随机串而非自增数字，缓存条目被淘汰后重新生成也不会与旧缓存键重合。
+
+限制：
+- 代号保存在 Django 默认缓存中，必须使用进程间共享的缓存后端（见 settings.CACHES，
+  数据库缓存或 Redis）。若改为进程内 LocMemCache，管理命令、其他 worker 进程的写入无法通知到
+  本进程，对标数据最多会陈旧 PAYLOAD_CACHE_TIMEOUT 秒；
+- 代号依赖模型保存/删除信号，bulk_create / bulk_update / queryset.update() 等批量写入不会触发，
+  批量写入数据源的管理命令（如 backfill_normalized_curves、rebuild_latest_acoustic_results）
+  须在结束时调用 bump_global_generation()；直接改库后同样需要手动调用。
+"""
+import hashlib
+import json
+import uuid
+from typing import Iterable, List, Sequence
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .services import build_benchmark_payload
+
+
+PAYLOAD_CACHE_TIMEOUT = 600
+GLOBAL_GENERATION_KEY = 'nvh_benchmark:generation'
+VEHICLE_GENERATION_KEY = 'nvh_benchmark:vehicle:{}'
+PAYLOAD_KEY_PREFIX = 'nvh_benchmark:payload:'
+
+
+# ==================== 代号 ====================
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+def _generation_keys(vehicle_ids: Sequence[int]) -> List[str]:
+    return [GLOBAL_GENERATION_KEY] + [VEHICLE_GENERATION_KEY.format(vid) for vid in vehicle_ids]
+
+
+def _current_generations(vehicle_ids: Sequence[int]) -> List[str]:
+    keys = _generation_keys(vehicle_ids)
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_token(), None)
+        values.update(cache.get_many(missing))
+    return [values.get(key) for key in keys]
+
+
+def bump_vehicle_generations(vehicle_ids: Iterable[int]) -> None:
+    """车型相关数据变更后使包含这些车型的缓存失效；在事务提交后执行"""
+    ids = {vid for vid in vehicle_ids if vid is not None}
+    if not ids:
+        return
+    transaction.on_commit(lambda: cache.set_many(
+        {VEHICLE_GENERATION_KEY.format(vid): _new_token() for vid in ids}, None
+    ))
+
+
+def bump_global_generation() -> None:
+    """使全部对标缓存失效（工况测点名称等全局数据变更）"""
+    transaction.on_commit(lambda: cache.set(GLOBAL_GENERATION_KEY, _new_token(), None))
+
+
+# ==================== 缓存读取 ====================
+
+def canonical_vehicle_ids(main_vehicle_id: int, vehicle_ids: Sequence[int]) -> List[int]:
+    """主车型在首位，对标车型按 ID 升序（与前端提交顺序一致），保证同一组合只对应一份缓存"""
+    return [main_vehicle_id] + sorted({vid for vid in vehicle_ids if vid != main_vehicle_id})
+
+
+def get_benchmark_payload(main_vehicle_id: int, vehicle_ids: Sequence[int], include_chassis: bool, include_acoustic: bool):
+    vehicle_ids = canonical_vehicle_ids(main_vehicle_id, vehicle_ids)
+    # 先读取代号再组装：组装期间发生的写入会更新代号，本次结果写入的是旧键，不会被后续请求读到
+    generations = _current_generations(vehicle_ids)
+    digest = hashlib.sha1(
+        json.dumps([vehicle_ids, bool(include_chassis), bool(include_acoustic), generations]).encode()
+    ).hexdigest()
+    key = PAYLOAD_KEY_PREFIX + digest
+
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_benchmark_payload(
+            main_vehicle_id=main_vehicle_id,
+            vehicle_ids=vehicle_ids,
+            include_chassis=include_chassis,
+            include_acoustic=include_acoustic,
+        )
+        # 存在超时数据块的结果不缓存，下次请求重新组装
+        if payload['meta']['complete']:
+            cache.set(key, payload, PAYLOAD_CACHE_TIMEOUT)
+        payload['meta']['cached'] = False
+    else:
+        payload['meta']['cached'] = True
+    return payload
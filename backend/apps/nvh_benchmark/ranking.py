@@ -0,0 +1,203 @@
+"""
+全车队对标指标排名
+
+每个在用车型的各项对标指标（匀速声压级、语音清晰度、不受控泄漏量、隔声量、悬架隔振率）
+保存在 FleetMetricValue 中，数据源写入后由信号按车型增量刷新。
+查询时整表加载为“指标 → 升序数值列表”的进程内索引，按版本号失效（与 facets.py 相同），
+单个车型的排名通过二分查找得到，无需逐次扫描数据源表。
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.modal.models import VehicleModel
+from apps.sound_module.models import VehicleSoundInsulationData
+
+from .constants import CRUISE_RADAR_POINTS, FLEET_METRICS, SPEECH_CLARITY_POINTS
+from .models import FleetMetricValue
+from .services import load_airtight_leakage, load_latest_acoustic_values, load_suspension_points, to_float
+
+
+FLEET_RANK_VERSION_KEY = 'nvh_benchmark:fleet_rank:version'
+FLEET_RANK_LOCAL_TTL = 60
+
+_lock = threading.Lock()
+# (版本号, 加载时间, 索引)；整体替换，读取无需加锁
+_local = (None, 0.0, None)
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+# ==================== 指标计算 ====================
+
+def compute_vehicle_metrics(vehicle_ids: Sequence[int]) -> Dict[int, Dict[str, float]]:
+    """{车型ID: {指标: 值}}，取值规则与对标页面一致（各数据源取最新记录）"""
+    metrics: Dict[int, Dict[str, float]] = defaultdict(dict)
+
+    cruise_ids = {pid for point_ids in CRUISE_RADAR_POINTS.values() for pid in point_ids}
+    clarity_ids = set(SPEECH_CLARITY_POINTS.values())
+    latest = load_latest_acoustic_values(vehicle_ids, cruise_ids | clarity_ids, ('rms_value', 'speech_clarity'))
+
+    def latest_value(vid, pid, field):
+        return latest[field].get((vid, pid))
+
+    for vid in vehicle_ids:
+        for key, point_ids in CRUISE_RADAR_POINTS.items():
+            metrics[vid][f'cruise_rms_{key}'] = _mean(latest_value(vid, pid, 'rms_value') for pid in point_ids)
+        for key, pid in SPEECH_CLARITY_POINTS.items():
+            metrics[vid][f'speech_clarity_{key[len("speed_"):]}'] = latest_value(vid, pid, 'speech_clarity')
+
+    for vid, leakage in load_airtight_leakage(vehicle_ids).items():
+        metrics[vid]['uncontrolled_leakage'] = leakage
+
+    sound_rows = VehicleSoundInsulationData.objects.filter(vehicle_model_id__in=vehicle_ids).values_list(
+        'vehicle_model_id', 'sound_insulation_performance'
+    )
+    for vid, performance in sound_rows:
+        metrics[vid]['sound_insulation_performance'] = to_float(performance)
+
+    for vid, (front_data, rear_data) in load_suspension_points(vehicle_ids).items():
+        for key, data in (('front', front_data), ('rear', rear_data)):
+            if data is not None:
+                metrics[vid][f'suspension_isolation_{key}'] = _mean(
+                    to_float(getattr(data, f'{axis}_isolation_rate', None)) for axis in 'xyz'
+                )
+
+    return {
+        vid: {metric: value for metric, value in values.items() if metric in FLEET_METRICS and value is not None}
+        for vid, values in metrics.items()
+    }
+
+
+def _metric_rows(vehicle_ids: Sequence[int]) -> List[FleetMetricValue]:
+    return [
+        FleetMetricValue(metric=metric, vehicle_model_id=vid, value=value)
+        for vid, values in compute_vehicle_metrics(vehicle_ids).items()
+        for metric, value in values.items()
+    ]
+
+
+# ==================== 指标维护 ====================
+
+def _current_version():
+    version = cache.get(FLEET_RANK_VERSION_KEY)
+    if version is None:
+        cache.add(FLEET_RANK_VERSION_KEY, 1, None)
+        version = cache.get(FLEET_RANK_VERSION_KEY, 1)
+    return version
+
+
+def bump_fleet_rank_version():
+    def _bump():
+        try:
+            cache.incr(FLEET_RANK_VERSION_KEY)
+        except ValueError:
+            cache.set(FLEET_RANK_VERSION_KEY, 1, None)
+    transaction.on_commit(_bump)
+
+
+def refresh_fleet_metrics(vehicle_ids: Iterable[int]) -> None:
+    """重新计算指定车型的指标值；停用或已删除的车型移出排名"""
+    ids = {vid for vid in vehicle_ids if vid is not None}
+    if not ids:
+        return
+    active_ids = list(VehicleModel.objects.filter(id__in=ids, status='active').values_list('id', flat=True))
+    rows = _metric_rows(active_ids)
+    with transaction.atomic():
+        FleetMetricValue.objects.filter(vehicle_model_id__in=ids).delete()
+        FleetMetricValue.objects.bulk_create(rows)
+        bump_fleet_rank_version()
+
+
+def schedule_fleet_metric_refresh(vehicle_ids: Iterable[int]) -> None:
+    """数据源变更后在事务提交后刷新，保证读取到已提交的数据"""
+    ids = {vid for vid in vehicle_ids if vid is not None}
+    if ids:
+        transaction.on_commit(lambda: refresh_fleet_metrics(ids))
+
+
+def rebuild_fleet_metrics(batch_size: int = 200) -> int:
+    """按全部在用车型重建指标表，返回写入行数"""
+    active_ids = list(VehicleModel.objects.filter(status='active').order_by('id').values_list('id', flat=True))
+    rows = []
+    for start in range(0, len(active_ids), batch_size):
+        rows.extend(_metric_rows(active_ids[start:start + batch_size]))
+    with transaction.atomic():
+        FleetMetricValue.objects.all().delete()
+        FleetMetricValue.objects.bulk_create(rows, batch_size=1000)
+        bump_fleet_rank_version()
+    return len(rows)
+
+
+# ==================== 排名查询 ====================
+
+def _load_index():
+    """{指标: (升序数值列表, {车型ID: 值})}"""
+    sorted_values = defaultdict(list)
+    by_vehicle = defaultdict(dict)
+    rows = FleetMetricValue.objects.order_by('metric', 'value').values_list('metric', 'vehicle_model_id', 'value')
+    for metric, vid, value in rows:
+        sorted_values[metric].append(value)
+        by_vehicle[metric][vid] = value
+    return {metric: (sorted_values[metric], by_vehicle[metric]) for metric in sorted_values}
+
+
+def get_rank_index():
+    global _local
+    version = _current_version()
+    cached_version, loaded_at, index = _local
+    if index is not None and cached_version == version and time.monotonic() - loaded_at < FLEET_RANK_LOCAL_TTL:
+        return index
+    with _lock:
+        cached_version, loaded_at, index = _local
+        if index is not None and cached_version == version and time.monotonic() - loaded_at < FLEET_RANK_LOCAL_TTL:
+            return index
+        index = _load_index()
+        _local = (version, time.monotonic(), index)
+        return index
+
+
+def rank_vehicle(vehicle_id: int, metrics: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    车型在全车队中的排名
+
+    rank 为名次（1 为最好，并列取最好名次），percentile 为优于的车型占其余车型的百分比（100 为最好）。
+    车型无该项数据时 value/rank/percentile 为 None。
+    """
+    index = get_rank_index()
+    results = []
+    for metric in metrics or FLEET_METRICS:
+        label, higher_is_better = FLEET_METRICS[metric]
+        values, by_vehicle = index.get(metric, ([], {}))
+        total = len(values)
+        value = by_vehicle.get(vehicle_id)
+        rank = percentile = None
+        if value is not None:
+            if higher_is_better:
+                better = total - bisect_right(values, value)
+                worse = bisect_left(values, value)
+            else:
+                better = bisect_left(values, value)
+                worse = total - bisect_right(values, value)
+            rank = better + 1
+            percentile = round(worse / (total - 1) * 100, 1) if total > 1 else 100.0
+        results.append({
+            'metric': metric,
+            'label': label,
+            'higher_is_better': higher_is_better,
+            'value': value,
+            'rank': rank,
+            'total': total,
+            'percentile': percentile,
+            'best': (values[-1] if higher_is_better else values[0]) if values else None,
+            'median': values[total // 2] if values else None,
+        })
+    return results
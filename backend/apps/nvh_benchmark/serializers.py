@@ -4,6 +4,8 @@ from rest_framework import serializers
 
 from apps.modal.models import VehicleModel
 
+from .constants import FLEET_METRICS
+
 
 class VehicleOptionSerializer(serializers.ModelSerializer):
     """车型下拉列表序列化器，附带默认对标车型"""
@@ -60,3 +62,23 @@ class NVHBenchmarkQuerySerializer(serializers.Serializer):
             vid for vid in benchmark_vehicle_ids if vid != main_vehicle_id
         ]
         return attrs
+
+
+class NVHBenchmarkExportSerializer(NVHBenchmarkQuerySerializer):
+    FORMAT_XLSX = 'xlsx'
+    FORMAT_CSV = 'csv'
+
+    format = serializers.ChoiceField(choices=[FORMAT_XLSX, FORMAT_CSV], required=False, default=FORMAT_XLSX)
+
+
+class FleetRankQuerySerializer(serializers.Serializer):
+    vehicle_id = serializers.IntegerField(min_value=1)
+    # 逗号分隔的指标键，为空时返回全部指标
+    metrics = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate_metrics(self, value):
+        metrics = [item.strip() for item in value.split(',') if item.strip()]
+        unknown = [item for item in metrics if item not in FLEET_METRICS]
+        if unknown:
+            raise serializers.ValidationError(f"未知指标: {', '.join(unknown)}")
+        return list(OrderedDict.fromkeys(metrics))
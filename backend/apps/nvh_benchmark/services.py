@@ -1,17 +1,34 @@
-import json
-from collections import OrderedDict, defaultdict
-from decimal import Decimal
-from typing import Dict, Iterable, List, Sequence, Tuple
-
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
 from django.db.models import Q
 
 from apps.acoustic_analysis.models import AcousticTestData, ConditionMeasurePoint, DynamicNoiseData
+from apps.acoustic_analysis.services import latest_per_pair
 from apps.dynamic_stiffness.models import SuspensionIsolationData
 from apps.modal.models import AirtightnessTest, VehicleModel
 from apps.sound_module.models import VehicleSoundInsulationData
 from apps.wheel_performance.models import WheelPerformance
 
+from utils.curves import (
+    SOUND_PRESSURE_Y_KEYS,
+    canonical_curve,
+    curve_to_pairs,
+    normalize_force_transfer_signal,
+    normalize_speed_curve,
+    to_float,
+)
+
 from .constants import (
+    ACCELERATION_AXIS_MAX_POINTS,
+    ACCELERATION_AXIS_STEPS,
+    ACCELERATION_BAND_WIDTHS,
     ACCELERATION_POINT_CANDIDATES,
     AIR_CONDITION_POINTS,
     CRUISE_RADAR_POINTS,
@@ -23,142 +40,6 @@ from .constants import (
 )
 
 
-def to_float(value):
-    if value in (None, ''):
-        return None
-    if isinstance(value, Decimal):
-        return float(value)
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        text = value.strip()
-        if not text:
-            return None
-        try:
-            return float(text)
-        except ValueError:
-            return None
-    return None
-
-
-def parse_json_field(value):
-    if isinstance(value, (dict, list)):
-        return value
-    if isinstance(value, str):
-        text = value.strip()
-        if not text:
-            return None
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return None
-    return None
-
-
-def normalize_numeric_list(values):
-    if not isinstance(values, list):
-        return []
-    normalized = []
-    for item in values:
-        val = to_float(item)
-        if val is None:
-            continue
-        normalized.append(val)
-    return normalized
-
-
-def pick_value_list(series_dict, candidate_keys: Sequence[str]):
-    if not isinstance(series_dict, dict):
-        return None
-    for key in candidate_keys:
-        value = series_dict.get(key)
-        if isinstance(value, list) and value:
-            return value
-    for value in series_dict.values():
-        if isinstance(value, list) and value:
-            return value
-    return None
-
-
-def build_curve_pairs(series_data, x_keys: Sequence[str], y_keys: Sequence[str]):
-    if series_data is None:
-        return []
-    if isinstance(series_data, list):
-        pairs = []
-        for entry in series_data:
-            if isinstance(entry, (list, tuple)) and len(entry) >= 2:
-                x_val = to_float(entry[0])
-                y_val = to_float(entry[1])
-            elif isinstance(entry, dict):
-                x_val = to_float(entry.get('x') or entry.get('frequency') or entry.get('Hz')or entry.get('speed'))
-                y_val = to_float(entry.get('y') or entry.get('value') or entry.get('dB') or entry.get('dB(A)'))
-            else:
-                continue
-            if x_val is None or y_val is None:
-                continue
-            pairs.append([x_val, y_val])
-        return pairs
-    if isinstance(series_data, dict):
-        x_list = normalize_numeric_list(pick_value_list(series_data, x_keys))
-        y_list = normalize_numeric_list(pick_value_list(series_data, y_keys))
-        length = min(len(x_list), len(y_list))
-        return [[x_list[i], y_list[i]] for i in range(length)]
-    return []
-
-
-def parse_force_transfer_signal(signal):
-    data = parse_json_field(signal)
-    if data is None:
-        return []
-
-    # 先按通用规则解析为 [x, y] 数对
-    pairs = build_curve_pairs(
-        data,
-        x_keys=['frequency','Hz', 'freq', 'speed', 'rpm'],
-        y_keys=['dB', 'db', 'dB(A)', 'value', 'values'],
-    )
-
-    if not pairs:
-        return []
-
-    # 为兼容 WheelPerformance 查询页，对可能出现的「频率 / dB 维度对调」做一次自动纠正：
-    # - 频率通常在 [0, 300]（或更高），最大值 >= 80
-    # - dB 幅值通常在 [-100, 100]，整体跨度不超过 ~120dB
-    xs = [to_float(p[0]) for p in pairs if to_float(p[0]) is not None]
-    ys = [to_float(p[1]) for p in pairs if to_float(p[1]) is not None]
-
-    if xs and ys:
-        x_min, x_max = min(xs), max(xs)
-        y_min, y_max = min(ys), max(ys)
-        x_range = x_max - x_min
-        y_range = y_max - y_min
-
-        def looks_like_freq(v_min, v_max):
-            return v_max >= 80 and v_max <= 1000
-
-        def looks_like_db(v_min, v_max, v_range):
-            return v_range <= 120 and v_max <= 120 and v_min >= -120
-
-        freq_looks_db = looks_like_db(x_min, x_max, x_range)
-        db_looks_freq = y_max >= 80
-        x_is_freq = looks_like_freq(x_min, x_max)
-        y_is_db = looks_like_db(y_min, y_max, y_range)
-
-        # 若当前 x 更像 dB、y 更像频率，则整体对调坐标轴
-        if (not x_is_freq) and (not y_is_db) and freq_looks_db and db_looks_freq:
-            pairs = [[p[1], p[0]] for p in pairs]
-
-    # 若频率最大值在 30~40 之间，视为以 0.5 为步长但单位偏小，按 10 倍缩放到 0-300 区间
-    max_freq = max((to_float(item[0]) or 0 for item in pairs), default=0)
-    if 0 < max_freq <= 40:
-        scaled = []
-        for freq, value in pairs:
-            scaled.append([round(freq * 10, 4), value])
-        pairs = scaled
-    pairs.sort(key=lambda item: item[0])
-    return pairs
-
-
 def load_vehicle_map(vehicle_ids: Sequence[int]) -> Dict[int, dict]:
     vehicles = (
         VehicleModel.objects.filter(id__in=vehicle_ids)
@@ -187,56 +68,143 @@ def load_condition_points(condition_point_ids: Iterable[int]) -> Dict[int, dict]
     return lookup
 
 
-def fetch_latest_acoustic_values(
-    vehicle_ids: Sequence[int], condition_point_ids: Sequence[int], value_field: str
-) -> Dict[Tuple[int, int], float]:
-    if not condition_point_ids:
-        return {}
-    qs = (
-        AcousticTestData.objects.filter(
-            vehicle_model_id__in=vehicle_ids,
-            condition_point_id__in=condition_point_ids,
+def load_suspension_points(vehicle_ids: Sequence[int]) -> Dict[int, tuple]:
+    """{车型ID: (前减振器数据, 后减振器数据)}，各测点取最新测试，按候选测点优先级选取"""
+    susp_qs = (
+        SuspensionIsolationData.objects
+        .filter(
+            test__vehicle_model_id__in=vehicle_ids,
+            measuring_point__in=SUSPENSION_MEASURE_POINTS,
+        )
+        .select_related('test__vehicle_model')
+        .order_by(
+            'test__vehicle_model_id',
+            'measuring_point',
+            '-test__test_date',
+            '-id',
         )
-        .order_by('vehicle_model_id', 'condition_point_id', '-test_date', '-id')
-        .values('vehicle_model_id', 'condition_point_id', value_field)
     )
-    results: Dict[Tuple[int, int], float] = {}
-    for row in qs:
-        key = (row['vehicle_model_id'], row['condition_point_id'])
-        if key in results:
-            continue
-        value = to_float(row.get(value_field))
-        if value is None:
+    by_point = defaultdict(dict)
+    for item in susp_qs:
+        by_point[item.test.vehicle_model_id].setdefault(item.measuring_point, item)
+
+    result = {}
+    for vid, mp_data in by_point.items():
+        front_data = next(
+            (mp_data[mp] for mp in SUSPENSION_FRONT_POINT_CANDIDATES if mp in mp_data), None
+        )
+        rear_data = next(
+            (mp_data[mp] for mp in SUSPENSION_REAR_POINT_CANDIDATES if mp in mp_data), None
+        )
+        result[vid] = (front_data, rear_data)
+    return result
+
+
+def load_airtight_leakage(vehicle_ids: Sequence[int]) -> Dict[int, float]:
+    """{车型ID: 最新气密性测试的不受控泄漏量}"""
+    airtight_map = OrderedDict()
+    airtight_qs = (
+        AirtightnessTest.objects.filter(vehicle_model_id__in=vehicle_ids)
+        .order_by('vehicle_model_id', '-test_date', '-id')
+        .values('vehicle_model_id', 'uncontrolled_leakage')
+    )
+    for item in airtight_qs:
+        if item['vehicle_model_id'] in airtight_map:
             continue
-        results[key] = value
+        airtight_map[item['vehicle_model_id']] = to_float(item['uncontrolled_leakage'])
+    return airtight_map
+
+
+def load_latest_acoustic_values(
+    vehicle_ids: Sequence[int], condition_point_ids: Iterable[int], fields: Sequence[str]
+) -> Dict[str, Dict[Tuple[int, int], float]]:
+    """
+    {字段: {(车型ID, 工况测点ID): 值}}，每个字段取该组合最新一条非空记录
+
+    最新测试可能只录入了部分指标，因此逐字段过滤空值后再取最新，每个字段 1 次查询。
+    """
+    condition_point_ids = list(condition_point_ids)
+    results = {}
+    for field in fields:
+        rows = latest_per_pair(
+            AcousticTestData.objects.filter(
+                vehicle_model_id__in=vehicle_ids,
+                condition_point_id__in=condition_point_ids,
+                **{f'{field}__isnull': False},
+            )
+        ).values_list('vehicle_model_id', 'condition_point_id', field)
+        results[field] = {(vid, pid): to_float(value) for vid, pid, value in rows}
     return results
 
 
-def fetch_radar_rms_map(
-    vehicle_ids: Sequence[int], condition_point_ids: Sequence[int]
-) -> Dict[int, Dict[int, float]]:
-    if not vehicle_ids or not condition_point_ids:
-        return {}
+def collect_condition_point_ids() -> set:
+    """对标页面涉及的全部工况测点"""
+    ids = set(SPEECH_CLARITY_POINTS.values())
+    for group in (CRUISE_RADAR_POINTS, AIR_CONDITION_POINTS, ACCELERATION_POINT_CANDIDATES):
+        for point_ids in group.values():
+            ids.update(point_ids)
+    return ids
 
-    rows = (
-        AcousticTestData.objects.filter(
-            vehicle_model_id__in=vehicle_ids,
-            condition_point_id__in=condition_point_ids,
-            rms_value__isnull=False,
-        )
-        .values('vehicle_model_id', 'condition_point_id', 'rms_value')
-    )
 
-    values_map: Dict[int, Dict[int, float]] = defaultdict(dict)
-    for row in rows:
-        value = to_float(row.get('rms_value'))
-        if value is None:
-            continue
-        values_map[row['vehicle_model_id']][row['condition_point_id']] = value
-    return values_map
+class BenchmarkDataLoader:
+    """
+    一次性加载对标页面所需的车型、工况测点、声学最新数值与动态噪声数据
 
+    各数据块只在内存中按工况测点切片，查询次数与 constants.py 中的测点配置无关：
+    车型 1 次、工况测点 1 次、声学最新数值每个字段 1 次（rms_value、speech_clarity）、
+    动态噪声 2 次（先确定候选测点，再读取曲线）。
+    """
 
-def build_radar_section(vehicle_ids, vehicle_map, condition_lookup):
+    def __init__(self, vehicle_ids: Sequence[int]):
+        self.vehicle_ids = list(vehicle_ids)
+        condition_point_ids = collect_condition_point_ids()
+        self.vehicle_map = load_vehicle_map(self.vehicle_ids)
+        self.condition_lookup = load_condition_points(condition_point_ids)
+        self.latest_rows = load_latest_acoustic_values(
+            self.vehicle_ids, condition_point_ids, ('rms_value', 'speech_clarity')
+        )
+        self.acceleration_targets, self.acceleration_rows = self._load_acceleration()
+
+    def _load_acceleration(self):
+        """按优先级为每组候选测点选出有数据的测点，返回 ({组: 测点ID}, {测点ID: [记录]})"""
+        candidate_ids = set()
+        for candidates in ACCELERATION_POINT_CANDIDATES.values():
+            candidate_ids.update(candidates)
+        existing_ids = set(
+            DynamicNoiseData.objects.filter(
+                vehicle_model_id__in=self.vehicle_ids,
+                condition_measure_point_id__in=candidate_ids,
+            ).order_by().values_list('condition_measure_point_id', flat=True).distinct()
+        )
+        targets = {
+            key: next((candidate for candidate in candidates if candidate in existing_ids), None)
+            for key, candidates in ACCELERATION_POINT_CANDIDATES.items()
+        }
+        target_ids = {target for target in targets.values() if target}
+        rows = defaultdict(list)
+        if target_ids:
+            queryset = DynamicNoiseData.objects.filter(
+                vehicle_model_id__in=self.vehicle_ids,
+                condition_measure_point_id__in=target_ids,
+            ).only('id', 'vehicle_model_id', 'condition_measure_point_id', 'x_axis_type', 'sound_pressure_normalized')
+            for row in queryset:
+                rows[row.condition_measure_point_id].append(row)
+        return targets, rows
+
+    def latest_values(self, condition_point_ids: Sequence[int], value_field: str) -> Dict[Tuple[int, int], float]:
+        """{(车型ID, 工况测点ID): 值}，值为空的组合不返回"""
+        latest = self.latest_rows[value_field]
+        results: Dict[Tuple[int, int], float] = {}
+        for vid in self.vehicle_ids:
+            for pid in condition_point_ids:
+                value = latest.get((vid, pid))
+                if value is not None:
+                    results[(vid, pid)] = value
+        return results
+
+
+def build_radar_section(loader: BenchmarkDataLoader):
+    vehicle_ids, vehicle_map, condition_lookup = loader.vehicle_ids, loader.vehicle_map, loader.condition_lookup
     sections = {}
     for key, point_ids in CRUISE_RADAR_POINTS.items():
         if not point_ids:
@@ -255,11 +223,10 @@ def build_radar_section(vehicle_ids, vehicle_map, condition_lookup):
                 }
             )
 
-        values_map = fetch_radar_rms_map(vehicle_ids, point_ids)
+        values_map = loader.latest_values(point_ids, 'rms_value')
         series = []
         for vid in vehicle_ids:
-            vehicle_values = values_map.get(vid, {})
-            ordered_values = [vehicle_values.get(pid) for pid in point_ids]
+            ordered_values = [values_map.get((vid, pid)) for pid in point_ids]
             if not any(value is not None for value in ordered_values):
                 continue
             series.append(
@@ -278,13 +245,14 @@ def build_radar_section(vehicle_ids, vehicle_map, condition_lookup):
     return sections
 
 
-def build_air_condition_section(vehicle_ids, vehicle_map, condition_lookup):
+def build_air_condition_section(loader: BenchmarkDataLoader):
+    vehicle_ids, vehicle_map = loader.vehicle_ids, loader.vehicle_map
     sections = {}
     for key, point_ids in AIR_CONDITION_POINTS.items():
         # 按测点顺序直接映射为空调档位：第1个测点为1档，第2个为2档，以此类推
         gear_labels = [f'{index + 1}档' for index in range(len(point_ids))]
 
-        values_map = fetch_latest_acoustic_values(vehicle_ids, point_ids, 'rms_value')
+        values_map = loader.latest_values(point_ids, 'rms_value')
         series = []
         for vid in vehicle_ids:
             series.append({
@@ -300,45 +268,40 @@ def build_air_condition_section(vehicle_ids, vehicle_map, condition_lookup):
     return sections
 
 
-def build_acceleration_section(vehicle_ids, main_vehicle_id, vehicle_map, condition_lookup):
+def resolve_axis_type(rows, main_vehicle_id) -> Optional[str]:
+    """横轴类型以主车型为准；主车型无数据时取各车型中最多的类型（数量相同取先出现者）"""
+    axis_types = Counter()
+    for row in rows:
+        if not row.x_axis_type:
+            continue
+        if row.vehicle_model_id == main_vehicle_id:
+            return row.x_axis_type.lower()
+        axis_types[row.x_axis_type.lower()] += 1
+    return axis_types.most_common(1)[0][0] if axis_types else None
+
+
+def build_acceleration_section(loader: BenchmarkDataLoader, main_vehicle_id):
+    vehicle_map, condition_lookup = loader.vehicle_map, loader.condition_lookup
     sections = {}
-    for key, candidates in ACCELERATION_POINT_CANDIDATES.items():
-        existing_ids = set(
-            DynamicNoiseData.objects.filter(
-                vehicle_model_id__in=vehicle_ids,
-                condition_measure_point_id__in=candidates,
-            ).values_list('condition_measure_point_id', flat=True)
-        )
-        target_id = None
-        for candidate in candidates:
-            if candidate in existing_ids:
-                target_id = candidate
-                break
+    for key in ACCELERATION_POINT_CANDIDATES:
+        target_id = loader.acceleration_targets.get(key)
         if not target_id:
             sections[key] = {'series': [], 'x_axis_type': None}
             continue
 
-        rows = list(
-            DynamicNoiseData.objects.filter(
-                vehicle_model_id__in=vehicle_ids,
-                condition_measure_point_id=target_id,
-            ).select_related('condition_measure_point')
-        )
-        axis_type = None
-        for row in rows:
-            if row.vehicle_model_id == main_vehicle_id and row.x_axis_type:
-                axis_type = row.x_axis_type.lower()
-                break
+        rows = loader.acceleration_rows.get(target_id, [])
+        axis_type = resolve_axis_type(rows, main_vehicle_id)
         series = []
+        excluded_ids = []
         for row in rows:
-            # 仅展示单位与主车型一致的数据
+            # 仅展示单位与主车型一致的数据（车速与转速之间无法换算）
             if axis_type and row.x_axis_type and row.x_axis_type.lower() != axis_type:
+                excluded_ids.append(row.vehicle_model_id)
                 continue
-            pairs = build_curve_pairs(
-                parse_json_field(row.sound_pressure_curve),
-                x_keys=['speed', 'rpm', 'speed/rpm', 'Speed', 'km/h'],
-                y_keys=['dB(A)', 'value', 'values', 'sound_pressure', 'Sound Pressure'],
-            )
+            pairs = curve_to_pairs(canonical_curve(
+                row.sound_pressure_normalized,
+                lambda: normalize_speed_curve(row.sound_pressure_curve, SOUND_PRESSURE_Y_KEYS),
+            ))
             if not pairs:
                 continue
             series.append({
@@ -352,14 +315,83 @@ def build_acceleration_section(vehicle_ids, main_vehicle_id, vehicle_map, condit
             'condition_point_name': condition_lookup.get(target_id, {}).get('measure_point'),
             'x_axis_type': axis_type,
             'series': series,
+            'excluded_vehicle_ids': excluded_ids,
+            'common_axis': build_common_axis(series, main_vehicle_id, axis_type),
         }
     return sections
 
 
-def build_chassis_section(vehicle_ids, vehicle_map):
+def _nullable(matrix):
+    """NaN 转为 None 并保留两位小数，供 JSON 输出"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return np.where(np.isnan(matrix), None, np.round(matrix, 2)).tolist()
+
+
+def build_common_axis(series: List[dict], main_vehicle_id: int, axis_type) -> Optional[dict]:
+    """
+    将各车型的加速噪声曲线重采样到公共横轴，并计算与主车型的差值及分段均值
+
+    横轴取各曲线范围的并集，按 ACCELERATION_AXIS_STEPS 对齐取点，超出某条曲线范围的点为 None；
+    差值与分段均值对 [车型, 横轴] 矩阵整体计算。无曲线或横轴类型未知时返回 None。
+    """
+    axis_key = (axis_type or '').lower()
+    series = [item for item in series if len(item['data']) > 1]
+    if not series or axis_key not in ACCELERATION_AXIS_STEPS:
+        return None
+    curves = [np.asarray(item['data'], dtype=np.float64) for item in series]
+
+    step = ACCELERATION_AXIS_STEPS[axis_key]
+    lower = min(float(curve[:, 0].min()) for curve in curves)
+    upper = max(float(curve[:, 0].max()) for curve in curves)
+    # 起点向下对齐到步长整数倍，端点最多多出两个，按 MAX_POINTS - 2 个间隔放大步长
+    step = max(step, (upper - lower) / (ACCELERATION_AXIS_MAX_POINTS - 2))
+    start = np.floor(lower / step) * step
+    grid = np.arange(start, upper + step / 2, step)
+
+    # 曲线已按横轴升序存储（见 utils/curves.py），超出范围的点置为 NaN
+    matrix = np.vstack([
+        np.interp(grid, curve[:, 0], curve[:, 1], left=np.nan, right=np.nan) for curve in curves
+    ])
+
+    vehicle_ids = [item['vehicle_id'] for item in series]
+    deltas = None
+    if main_vehicle_id in vehicle_ids:
+        deltas = matrix - matrix[vehicle_ids.index(main_vehicle_id)]
+
+    width = ACCELERATION_BAND_WIDTHS[axis_key]
+    band_index = np.floor(grid / width).astype(np.int64)
+    # 横轴升序，同一分段的点连续分布，reduceat 一次完成全部车型的分组求和
+    starts = np.flatnonzero(np.r_[True, np.diff(band_index) != 0])
+    valid = ~np.isnan(matrix)
+    sums = np.add.reduceat(np.where(valid, matrix, 0.0), starts, axis=1)
+    counts = np.add.reduceat(valid, starts, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        band_means = np.where(counts > 0, sums / counts, np.nan)
+    band_lower = band_index[starts] * width
+
+    return {
+        'x_axis_type': axis_type,
+        'step': float(step),
+        'x': np.round(grid, 4).tolist(),
+        'vehicle_ids': vehicle_ids,
+        'values': _nullable(matrix),
+        'reference_vehicle_id': main_vehicle_id if deltas is not None else None,
+        'deltas': _nullable(deltas) if deltas is not None else [],
+        'bands': {
+            'width': width,
+            'ranges': [[float(low), float(low + width)] for low in band_lower.tolist()],
+            'values': _nullable(band_means),
+        },
+    }
+
+
+def build_chassis_section(loader: BenchmarkDataLoader):
+    vehicle_ids, vehicle_map = loader.vehicle_ids, loader.vehicle_map
     wheel_records = (
         WheelPerformance.objects.filter(vehicle_model_id__in=vehicle_ids)
         .select_related('vehicle_model')
+        # 原始力传递曲线体积较大，仅尚未回填规范曲线的记录在 canonical_curve 中按需加载
+        .defer('force_transfer_signal')
         .order_by('vehicle_model_id', 'id')
     )
     record_map = {}
@@ -383,8 +415,11 @@ def build_chassis_section(vehicle_ids, vehicle_map):
             'is_silent': getattr(wheel, 'is_silent', None),
             'rim_lateral_stiffness': to_float(getattr(wheel, 'rim_lateral_stiffness', None)),
         })
-        if wheel and wheel.force_transfer_signal:
-            series_data = parse_force_transfer_signal(wheel.force_transfer_signal)
+        if wheel:
+            series_data = curve_to_pairs(canonical_curve(
+                wheel.force_transfer_normalized,
+                lambda: normalize_force_transfer_signal(wheel.force_transfer_signal),
+            ))
             if series_data:
                 chart_series.append({
                     'vehicle_id': vid,
@@ -393,26 +428,7 @@ def build_chassis_section(vehicle_ids, vehicle_map):
                 })
 
     # 悬架隔振率
-    susp_qs = (
-        SuspensionIsolationData.objects
-        .filter(
-            test__vehicle_model_id__in=vehicle_ids,
-            measuring_point__in=SUSPENSION_MEASURE_POINTS,
-        )
-        .select_related('test__vehicle_model')
-        .order_by(
-            'test__vehicle_model_id',
-            'measuring_point',
-            '-test__test_date',
-            '-id',
-        )
-    )
-    suspension_map = defaultdict(dict)
-    for item in susp_qs:
-        key = (item.test.vehicle_model_id, item.measuring_point)
-        if key in suspension_map[item.test.vehicle_model_id]:
-            continue
-        suspension_map[item.test.vehicle_model_id][item.measuring_point] = item
+    suspension_map = load_suspension_points(vehicle_ids)
 
     categories = [
         '前减振器-X',
@@ -425,21 +441,8 @@ def build_chassis_section(vehicle_ids, vehicle_map):
 
     suspension_series = []
     for vid in vehicle_ids:
-        mp_data = suspension_map.get(vid, {})
         values = []
-        front_data = None
-        for measure_point in SUSPENSION_FRONT_POINT_CANDIDATES:
-            if measure_point in mp_data:
-                front_data = mp_data[measure_point]
-                break
-
-        rear_data = None
-        for measure_point in SUSPENSION_REAR_POINT_CANDIDATES:
-            if measure_point in mp_data:
-                rear_data = mp_data[measure_point]
-                break
-
-        for data in (front_data, rear_data):
+        for data in suspension_map.get(vid, (None, None)):
             if data is None:
                 values.extend([None, None, None])
             else:
@@ -464,27 +467,15 @@ def build_chassis_section(vehicle_ids, vehicle_map):
     }
 
 
-def build_acoustic_package_section(vehicle_ids, vehicle_map, condition_lookup):
+def build_acoustic_package_section(loader: BenchmarkDataLoader):
+    vehicle_ids, vehicle_map, condition_lookup = loader.vehicle_ids, loader.vehicle_map, loader.condition_lookup
     sound_map = {
         item.vehicle_model_id: item
         for item in VehicleSoundInsulationData.objects.filter(vehicle_model_id__in=vehicle_ids)
     }
-    airtight_map = OrderedDict()
-    airtight_qs = (
-        AirtightnessTest.objects.filter(vehicle_model_id__in=vehicle_ids)
-        .order_by('vehicle_model_id', '-test_date', '-id')
-        .values('vehicle_model_id', 'uncontrolled_leakage')
-    )
-    for item in airtight_qs:
-        if item['vehicle_model_id'] in airtight_map:
-            continue
-        airtight_map[item['vehicle_model_id']] = to_float(item['uncontrolled_leakage'])
+    airtight_map = load_airtight_leakage(vehicle_ids)
 
-    clarity_values = fetch_latest_acoustic_values(
-        vehicle_ids,
-        list(SPEECH_CLARITY_POINTS.values()),
-        'speech_clarity',
-    )
+    clarity_values = loader.latest_values(list(SPEECH_CLARITY_POINTS.values()), 'speech_clarity')
 
     table_rows = []
     for vid in vehicle_ids:
@@ -537,17 +528,170 @@ def build_acoustic_package_section(vehicle_ids, vehicle_map, condition_lookup):
     }
 
 
-def build_benchmark_payload(main_vehicle_id: int, vehicle_ids: Sequence[int], include_chassis: bool, include_acoustic: bool):
-    vehicle_map = load_vehicle_map(vehicle_ids)
-    all_condition_ids = set()
-    for ids in CRUISE_RADAR_POINTS.values():
-        all_condition_ids.update(ids)
-    for ids in AIR_CONDITION_POINTS.values():
-        all_condition_ids.update(ids)
-    for ids in ACCELERATION_POINT_CANDIDATES.values():
-        all_condition_ids.update(ids)
-    all_condition_ids.update(SPEECH_CLARITY_POINTS.values())
-    condition_lookup = load_condition_points(all_condition_ids)
+# ==================== 并发组装 ====================
+
+# 未开始的数据块在等待线程时的轮询间隔（秒）
+_POLL_INTERVAL = 0.05
+
+_thread_slots = None
+_thread_slots_lock = threading.Lock()
+
+
+def _get_thread_slots():
+    """进程内全部请求共享的组装线程配额，限制并发请求下的总线程数与数据库连接数"""
+    global _thread_slots
+    if _thread_slots is None:
+        with _thread_slots_lock:
+            if _thread_slots is None:
+                _thread_slots = threading.BoundedSemaphore(settings.NVH_BENCHMARK_THREAD_LIMIT)
+    return _thread_slots
+
+
+def _acquire_slots(wanted: int) -> int:
+    """不等待地申请至多 wanted 个线程配额，返回实际申请到的数量"""
+    slots = _get_thread_slots()
+    acquired = 0
+    while acquired < wanted and slots.acquire(blocking=False):
+        acquired += 1
+    return acquired
+
+
+def _release_slots(count: int) -> None:
+    slots = _get_thread_slots()
+    for _ in range(count):
+        slots.release()
+
+
+def _timed(builder):
+    start = time.perf_counter()
+    result = builder()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _run_in_worker(name, builder, started):
+    # 记录开始执行的时间，超时从线程开始执行时计算；
+    # 工作线程使用独立的数据库连接，执行完毕即关闭，避免连接随线程长期占用
+    started[name] = time.perf_counter()
+    try:
+        return _timed(builder)
+    finally:
+        connections.close_all()
+
+
+def _run_sequential(builders):
+    results = {}
+    timings = {}
+    for name, builder in builders.items():
+        results[name], elapsed = _timed(builder)
+        timings[name] = {'status': 'ok', 'elapsed_ms': round(elapsed, 1)}
+    return results, timings
+
+
+def run_sections(builders: Dict[str, Callable[[], object]]):
+    """
+    执行各数据块的组装函数，返回 (结果, 耗时信息)
+
+    每个请求使用独立的线程池（至多 NVH_BENCHMARK_MAX_WORKERS 个线程），线程数计入进程级配额
+    NVH_BENCHMARK_THREAD_LIMIT，配额在该请求的全部数据块结束（含超时后在后台继续执行的）后归还；
+    配额不足时不等待，直接在请求线程中顺序组装（不设超时）。
+
+    单个数据块自开始执行起超过 NVH_BENCHMARK_SECTION_TIMEOUT 秒未完成时结果为 None，状态记为 timeout
+    （线程无法中断，该数据块会在后台执行完毕后丢弃）；线程全部被超时数据块占用时，尚未开始的数据块
+    同样记为 timeout 并取消。组装函数抛出的异常原样抛出。
+    """
+    workers = min(len(builders), settings.NVH_BENCHMARK_MAX_WORKERS)
+    if workers <= 1:
+        return _run_sequential(builders)
+    workers = _acquire_slots(workers)
+    if workers == 0:
+        return _run_sequential(builders)
+
+    timeout = settings.NVH_BENCHMARK_SECTION_TIMEOUT
+    started = {}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nvh-benchmark')
+    futures = {
+        executor.submit(_run_in_worker, name, builder, started): name
+        for name, builder in builders.items()
+    }
+    executor.shutdown(wait=False)
+
+    remaining = [len(futures)]
+    remaining_lock = threading.Lock()
+
+    def _on_done(_future):
+        with remaining_lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            _release_slots(workers)
+
+    for future in futures:
+        future.add_done_callback(_on_done)
+
+    results = {}
+    timings = {}
+    abandoned = set()
+    waiting_since = time.perf_counter()
+    while len(timings) < len(futures):
+        now = time.perf_counter()
+        deadlines = []
+        unstarted = []
+        for future, name in futures.items():
+            if name in timings:
+                continue
+            if future.done():
+                results[name], elapsed = future.result()
+                timings[name] = {'status': 'ok', 'elapsed_ms': round(elapsed, 1)}
+            elif name in started:
+                if now - started[name] >= timeout:
+                    abandoned.add(future)
+                    results[name] = None
+                    timings[name] = {'status': 'timeout', 'elapsed_ms': round(timeout * 1000, 1)}
+                else:
+                    deadlines.append(started[name] + timeout)
+            else:
+                unstarted.append((future, name))
+
+        if unstarted and sum(1 for future in abandoned if not future.done()) >= workers:
+            # 线程均被超时数据块占用，剩余数据块无法开始
+            for future, name in unstarted:
+                if future.cancel():
+                    results[name] = None
+                    timings[name] = {
+                        'status': 'timeout',
+                        'elapsed_ms': round((now - waiting_since) * 1000, 1),
+                    }
+            continue
+
+        if len(timings) < len(futures):
+            if unstarted:
+                deadlines.append(now + _POLL_INTERVAL)
+            pending = [future for future, name in futures.items() if name not in timings]
+            wait(pending, timeout=max(0.0, min(deadlines) - now), return_when=FIRST_COMPLETED)
+    return results, timings
+
+
+def build_benchmark_payload(
+    main_vehicle_id: int,
+    vehicle_ids: Sequence[int],
+    include_chassis: bool,
+    include_acoustic: bool,
+    sequential: bool = False,
+):
+    """sequential=True 时在当前线程顺序组装且不设超时（导出等需要完整结果的场景）"""
+    loader = BenchmarkDataLoader(vehicle_ids)
+    vehicle_map = loader.vehicle_map
+
+    builders = {
+        'cruise_radar': lambda: build_radar_section(loader),
+        'air_condition': lambda: build_air_condition_section(loader),
+        'acceleration': lambda: build_acceleration_section(loader, main_vehicle_id),
+    }
+    if include_chassis:
+        builders['chassis'] = lambda: build_chassis_section(loader)
+    if include_acoustic:
+        builders['acoustic_package'] = lambda: build_acoustic_package_section(loader)
+    sections, timings = _run_sequential(builders) if sequential else run_sections(builders)
 
     payload = {
         'vehicles': {
@@ -557,13 +701,10 @@ def build_benchmark_payload(main_vehicle_id: int, vehicle_ids: Sequence[int], in
             ],
             'all': [vehicle_map[vid] for vid in vehicle_ids if vid in vehicle_map],
         },
-        'cruise_radar': build_radar_section(vehicle_ids, vehicle_map, condition_lookup),
-        'air_condition': build_air_condition_section(vehicle_ids, vehicle_map, condition_lookup),
-        'acceleration': build_acceleration_section(vehicle_ids, main_vehicle_id, vehicle_map, condition_lookup),
     }
-
-    if include_chassis:
-        payload['chassis'] = build_chassis_section(vehicle_ids, vehicle_map)
-    if include_acoustic:
-        payload['acoustic_package'] = build_acoustic_package_section(vehicle_ids, vehicle_map, condition_lookup)
+    payload.update(sections)
+    payload['meta'] = {
+        'complete': all(item['status'] == 'ok' for item in timings.values()),
+        'sections': timings,
+    }
     return payload
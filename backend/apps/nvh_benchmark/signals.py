@@ -0,0 +1,100 @@
+"""
+对标数据源写入信号：按涉及的车型使对标缓存失效，并刷新全车队排名指标
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from apps.acoustic_analysis.models import AcousticTestData, ConditionMeasurePoint, DynamicNoiseData
+from apps.dynamic_stiffness.models import SuspensionIsolationData, VehicleSuspensionIsolationTest
+from apps.modal.models import AirtightnessTest, VehicleModel
+from apps.sound_module.models import VehicleSoundInsulationData
+from apps.wheel_performance.models import WheelPerformance
+
+from .payload_cache import bump_global_generation, bump_vehicle_generations
+from .ranking import schedule_fleet_metric_refresh
+
+
+# 数据源模型 → 车型ID字段路径
+VEHICLE_FIELD_PATHS = {
+    AcousticTestData: 'vehicle_model_id',
+    DynamicNoiseData: 'vehicle_model_id',
+    WheelPerformance: 'vehicle_model_id',
+    VehicleSuspensionIsolationTest: 'vehicle_model_id',
+    SuspensionIsolationData: 'test__vehicle_model_id',
+    VehicleSoundInsulationData: 'vehicle_model_id',
+    AirtightnessTest: 'vehicle_model_id',
+    VehicleModel: 'id',
+}
+
+# 参与全车队排名指标计算的数据源（VehicleModel 的启用状态决定是否参与排名）
+METRIC_SOURCE_MODELS = {
+    AcousticTestData,
+    VehicleSuspensionIsolationTest,
+    SuspensionIsolationData,
+    VehicleSoundInsulationData,
+    AirtightnessTest,
+    VehicleModel,
+}
+
+
+def _invalidate(sender, vehicle_ids):
+    bump_vehicle_generations(vehicle_ids)
+    if sender in METRIC_SOURCE_MODELS:
+        schedule_fleet_metric_refresh(vehicle_ids)
+
+
+def _stored_vehicle_id(sender, pk):
+    return (
+        sender.objects
+        .filter(pk=pk)
+        .values_list(VEHICLE_FIELD_PATHS[sender], flat=True)
+        .first()
+    )
+
+
+def _vehicle_id(sender, instance):
+    path = VEHICLE_FIELD_PATHS[sender]
+    if '__' not in path:
+        return getattr(instance, path)
+    return _stored_vehicle_id(sender, instance.pk)
+
+
+def remember_vehicle_id(sender, instance, raw=False, **kwargs):
+    # 记录保存前所属车型，记录被改到其他车型时原车型的缓存也需失效
+    instance._benchmark_old_vehicle_id = None
+    if raw or instance.pk is None:
+        return
+    instance._benchmark_old_vehicle_id = _stored_vehicle_id(sender, instance.pk)
+
+
+def invalidate_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _invalidate(sender, [
+        _vehicle_id(sender, instance),
+        getattr(instance, '_benchmark_old_vehicle_id', None),
+    ])
+
+
+def invalidate_on_delete(sender, instance, **kwargs):
+    # 在删除前解析车型：悬架隔振数据需经测试记录关联到车型
+    _invalidate(sender, [_vehicle_id(sender, instance)])
+
+
+for model in VEHICLE_FIELD_PATHS:
+    uid = f'nvh_benchmark:{model._meta.label_lower}'
+    pre_save.connect(remember_vehicle_id, sender=model, dispatch_uid=uid)
+    post_save.connect(invalidate_on_save, sender=model, dispatch_uid=uid)
+    pre_delete.connect(invalidate_on_delete, sender=model, dispatch_uid=uid)
+
+
+def invalidate_on_condition_point_change(sender, instance, raw=False, **kwargs):
+    # 工况测点名称出现在所有组合的指标标签中
+    if raw:
+        return
+    bump_global_generation()
+
+
+post_save.connect(invalidate_on_condition_point_change, sender=ConditionMeasurePoint,
+                  dispatch_uid='nvh_benchmark:condition_point')
+post_delete.connect(invalidate_on_condition_point_change, sender=ConditionMeasurePoint,
+                    dispatch_uid='nvh_benchmark:condition_point')
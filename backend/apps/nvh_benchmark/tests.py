@@ -0,0 +1,173 @@
+from datetime import date
+
+from django.test import SimpleTestCase, TestCase
+
+from apps.acoustic_analysis.models import AcousticTestData, ConditionMeasurePoint, DynamicNoiseData
+from apps.modal.models import VehicleModel
+
+from .constants import ACCELERATION_AXIS_MAX_POINTS, ACCELERATION_POINT_CANDIDATES, SPEECH_CLARITY_POINTS
+from .ranking import compute_vehicle_metrics
+from .services import BenchmarkDataLoader, build_acceleration_section, build_common_axis
+
+
+def make_series(vehicle_id, data):
+    return {'vehicle_id': vehicle_id, 'vehicle_model_name': f'车型{vehicle_id}', 'x_axis_type': 'speed', 'data': data}
+
+
+def interp(data, x):
+    """逐点线性插值（对照实现），超出曲线范围返回 None"""
+    for (x0, y0), (x1, y1) in zip(data, data[1:]):
+        if x0 <= x <= x1:
+            return y0 if x1 == x0 else y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+    return None
+
+
+# ==================== 加速噪声公共横轴 ====================
+
+class CommonAxisTests(SimpleTestCase):
+
+    def setUp(self):
+        self.main = make_series(1, [[10, 50], [30, 70], [45, 72]])
+        self.other = make_series(2, [[20, 50], [50, 80]])
+
+    def test_grid_covers_union_of_ranges(self):
+        axis = build_common_axis([self.main, self.other], 1, 'speed')
+        self.assertEqual(axis['step'], 1.0)
+        self.assertEqual(axis['x'][0], 10.0)
+        self.assertEqual(axis['x'][-1], 50.0)
+        self.assertEqual(len(axis['x']), 41)
+        self.assertEqual(axis['vehicle_ids'], [1, 2])
+
+    def test_values_and_deltas_match_pointwise_interpolation(self):
+        axis = build_common_axis([self.main, self.other], 1, 'speed')
+        for column, x in enumerate(axis['x']):
+            main_value = interp(self.main['data'], x)
+            other_value = interp(self.other['data'], x)
+            for row, expected in enumerate([main_value, other_value]):
+                actual = axis['values'][row][column]
+                if expected is None:
+                    self.assertIsNone(actual, x)
+                else:
+                    self.assertAlmostEqual(actual, round(expected, 2), places=2)
+            delta = axis['deltas'][1][column]
+            if main_value is None or other_value is None:
+                self.assertIsNone(delta, x)
+            else:
+                self.assertAlmostEqual(delta, round(other_value - main_value, 2), places=2)
+        self.assertEqual(axis['reference_vehicle_id'], 1)
+
+    def test_band_means_ignore_missing_points(self):
+        axis = build_common_axis([self.main, self.other], 1, 'speed')
+        width = axis['bands']['width']
+        self.assertEqual(axis['bands']['ranges'], [[0.0, 20.0], [20.0, 40.0], [40.0, 60.0]])
+        for row, item in enumerate([self.main, self.other]):
+            for band, (low, high) in enumerate(axis['bands']['ranges']):
+                points = [interp(item['data'], x) for x in axis['x'] if low <= x < high]
+                points = [value for value in points if value is not None]
+                actual = axis['bands']['values'][row][band]
+                if points:
+                    self.assertAlmostEqual(actual, round(sum(points) / len(points), 2), places=2)
+                else:
+                    self.assertIsNone(actual)
+        self.assertEqual(width, 20.0)
+
+    def test_without_main_vehicle(self):
+        axis = build_common_axis([self.other], 1, 'speed')
+        self.assertIsNone(axis['reference_vehicle_id'])
+        self.assertEqual(axis['deltas'], [])
+
+    def test_unknown_axis_type(self):
+        self.assertIsNone(build_common_axis([self.main, self.other], 1, None))
+        self.assertIsNone(build_common_axis([self.main, self.other], 1, 'time'))
+
+    def test_short_series_skipped(self):
+        self.assertIsNone(build_common_axis([make_series(1, [[10, 50]])], 1, 'speed'))
+        axis = build_common_axis([make_series(1, [[10, 50]]), self.other], 1, 'speed')
+        self.assertEqual(axis['vehicle_ids'], [2])
+
+    def test_step_grows_for_wide_range(self):
+        for lower, upper in [(800, 600000), (1, 99999.5), (123.4, 400000)]:
+            with self.subTest(lower=lower, upper=upper):
+                axis = build_common_axis([make_series(1, [[lower, 60], [upper, 90]])], 1, 'rpm')
+                self.assertGreater(axis['step'], 50.0)
+                self.assertLessEqual(len(axis['x']), ACCELERATION_AXIS_MAX_POINTS)
+                self.assertLessEqual(axis['x'][0], lower)
+                self.assertGreaterEqual(axis['x'][-1], upper - axis['step'] / 2)
+
+
+class AccelerationSectionTests(TestCase):
+    """主车型无加速数据时按多数车型的横轴类型对齐，其余类型不混入公共横轴"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.point = ConditionMeasurePoint.objects.create(
+            id=ACCELERATION_POINT_CANDIDATES['front_right'][0], work_condition='全油门加速', measure_point='驾驶员右耳'
+        )
+        cls.vehicles = [
+            VehicleModel.objects.create(vehicle_model_name=f'车型{index}', vin=f'TESTVIN000000000{index}')
+            for index in range(4)
+        ]
+        curves = [
+            ('rpm', {'rpm': [1000, 3000, 5000], 'dB(A)': [60, 70, 80]}),
+            ('speed', {'speed': [10, 40], 'dB(A)': [50, 60]}),
+            ('speed', {'speed': [20, 60], 'dB(A)': [55, 70]}),
+        ]
+        for vehicle, (axis_type, curve) in zip(cls.vehicles[1:], curves):
+            DynamicNoiseData.objects.create(
+                vehicle_model_id=vehicle.id, condition_measure_point=cls.point, x_axis_type=axis_type,
+                sound_pressure_curve=curve, speech_clarity_curve={},
+            )
+
+    def build(self, main_vehicle):
+        loader = BenchmarkDataLoader([vehicle.id for vehicle in self.vehicles])
+        return build_acceleration_section(loader, main_vehicle.id)['front_right']
+
+    def test_majority_axis_type_without_main_vehicle_row(self):
+        section = self.build(self.vehicles[0])
+        rpm_vehicle, speed_ids = self.vehicles[1].id, [self.vehicles[2].id, self.vehicles[3].id]
+        self.assertEqual(section['x_axis_type'], 'speed')
+        self.assertEqual(section['excluded_vehicle_ids'], [rpm_vehicle])
+        self.assertEqual([item['vehicle_id'] for item in section['series']], speed_ids)
+
+        axis = section['common_axis']
+        self.assertEqual(axis['x_axis_type'], 'speed')
+        self.assertEqual(axis['step'], 1.0)
+        self.assertEqual(axis['vehicle_ids'], speed_ids)
+        self.assertEqual([axis['x'][0], axis['x'][-1]], [10.0, 60.0])
+        self.assertIsNone(axis['reference_vehicle_id'])
+
+    def test_main_vehicle_axis_type_wins(self):
+        section = self.build(self.vehicles[1])
+        self.assertEqual(section['x_axis_type'], 'rpm')
+        self.assertEqual(section['excluded_vehicle_ids'], [self.vehicles[2].id, self.vehicles[3].id])
+        self.assertEqual(section['common_axis']['step'], 50.0)
+        self.assertEqual(section['common_axis']['reference_vehicle_id'], self.vehicles[1].id)
+
+
+# ==================== 声学最新数值 ====================
+
+class LatestAcousticValueTests(TestCase):
+    """各字段取最新一条非空记录：最新测试只录入了部分指标时不丢失测点"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehicle = VehicleModel.objects.create(vehicle_model_name='测试车型', vin='TESTVIN0000000001')
+        cls.point_id = SPEECH_CLARITY_POINTS['speed_100']
+        point = ConditionMeasurePoint.objects.create(id=cls.point_id, work_condition='匀速100', measure_point='驾驶员右耳')
+        AcousticTestData.objects.create(
+            vehicle_model=cls.vehicle, condition_point=point, rms_value=60, speech_clarity=50, test_date=date(2024, 1, 1)
+        )
+        AcousticTestData.objects.create(
+            vehicle_model=cls.vehicle, condition_point=point, rms_value=None, speech_clarity=80, test_date=date(2025, 1, 1)
+        )
+
+    def test_loader_falls_back_to_older_non_null_value(self):
+        loader = BenchmarkDataLoader([self.vehicle.id])
+        key = (self.vehicle.id, self.point_id)
+        self.assertEqual(loader.latest_values([self.point_id], 'rms_value'), {key: 60.0})
+        self.assertEqual(loader.latest_values([self.point_id], 'speech_clarity'), {key: 80.0})
+
+    def test_fleet_metrics_use_same_values(self):
+        metrics = compute_vehicle_metrics([self.vehicle.id])[self.vehicle.id]
+        self.assertEqual(metrics['cruise_rms_front_right'], 60.0)
+        self.assertEqual(metrics['speech_clarity_100'], 80.0)
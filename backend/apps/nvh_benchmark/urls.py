@@ -5,4 +5,6 @@ from . import views
 urlpatterns = [
     path('vehicle-models/', views.list_vehicle_models, name='nvh-benchmark-vehicle-models'),
     path('overview/', views.get_benchmark_overview, name='nvh-benchmark-overview'),
+    path('export/', views.export_benchmark, name='nvh-benchmark-export'),
+    path('fleet-rank/', views.get_fleet_rank, name='nvh-benchmark-fleet-rank'),
 ]
@@ -1,11 +1,23 @@
+from datetime import datetime
+from urllib.parse import quote
+
+from django.http import StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 
 from apps.modal.models import VehicleModel
 from utils.response import Response
 
-from .serializers import NVHBenchmarkQuerySerializer, VehicleOptionSerializer
+from . import export
+from .payload_cache import canonical_vehicle_ids, get_benchmark_payload
+from .ranking import rank_vehicle
 from .services import build_benchmark_payload
+from .serializers import (
+    FleetRankQuerySerializer,
+    NVHBenchmarkExportSerializer,
+    NVHBenchmarkQuerySerializer,
+    VehicleOptionSerializer,
+)
 
 
 @api_view(['GET'])
@@ -24,10 +36,71 @@ def get_benchmark_overview(request):
         return Response.bad_request(message='查询参数错误', data=serializer.errors)
 
     data = serializer.validated_data
-    payload = build_benchmark_payload(
+    payload = get_benchmark_payload(
         main_vehicle_id=data['main_vehicle_id'],
         vehicle_ids=data['vehicle_ids'],
         include_chassis=data['include_chassis'],
         include_acoustic=data['include_acoustic_package'],
     )
     return Response.success(data=payload, message='获取NVH对标数据成功')
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def export_benchmark(request):
+    """导出对标数据（多工作表 Excel 或 CSV），边生成边发送"""
+    serializer = NVHBenchmarkExportSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response.bad_request(message='查询参数错误', data=serializer.errors)
+
+    data = serializer.validated_data
+    file_format = data['format']
+    if file_format == NVHBenchmarkExportSerializer.FORMAT_XLSX and not export.HAS_OPENPYXL:
+        return Response.bad_request(message='服务器未安装 openpyxl 库，无法导出 Excel')
+
+    payload = get_benchmark_payload(
+        main_vehicle_id=data['main_vehicle_id'],
+        vehicle_ids=data['vehicle_ids'],
+        include_chassis=data['include_chassis'],
+        include_acoustic=data['include_acoustic_package'],
+    )
+    if not payload['meta']['complete']:
+        # 存在超时数据块时导出结果会缺少工作表：不设超时重新完整组装
+        payload = build_benchmark_payload(
+            main_vehicle_id=data['main_vehicle_id'],
+            vehicle_ids=canonical_vehicle_ids(data['main_vehicle_id'], data['vehicle_ids']),
+            include_chassis=data['include_chassis'],
+            include_acoustic=data['include_acoustic_package'],
+            sequential=True,
+        )
+    if file_format == NVHBenchmarkExportSerializer.FORMAT_XLSX:
+        response = StreamingHttpResponse(export.iter_xlsx(payload), content_type=export.XLSX_CONTENT_TYPE)
+    else:
+        response = StreamingHttpResponse(export.iter_csv(payload), content_type=export.CSV_CONTENT_TYPE)
+
+    main_name = (payload['vehicles']['main'] or {}).get('vehicle_model_name') or data['main_vehicle_id']
+    filename = quote(f"NVH对标_{main_name}_{datetime.now().strftime('%Y%m%d')}.{file_format}")
+    # 使用 RFC 5987 编码处理中文文件名
+    response['Content-Disposition'] = f"attachment; filename*=UTF-8''{filename}"
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_fleet_rank(request):
+    """车型各项对标指标在全部在用车型中的排名与百分位"""
+    serializer = FleetRankQuerySerializer(data=request.GET)
+    if not serializer.is_valid():
+        return Response.bad_request(message='查询参数错误', data=serializer.errors)
+
+    data = serializer.validated_data
+    vehicle = VehicleModel.objects.filter(pk=data['vehicle_id']).values('id', 'vehicle_model_name', 'status').first()
+    if vehicle is None:
+        return Response.not_found(message='车型不存在')
+    return Response.success(
+        data={
+            'vehicle': vehicle,
+            'metrics': rank_vehicle(vehicle['id'], data['metrics']),
+        },
+        message='获取车队排名成功',
+    )
@@ -1,7 +1,7 @@
 from collections import Counter, defaultdict
 from datetime import date
 
-from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models import Count, F, OuterRef, Q, Subquery
 from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
@@ -15,6 +15,7 @@ from apps.sound_module.models import (
     VehicleReverberationData,
 )
 from apps.acoustic_analysis.models import AcousticTestData, ConditionMeasurePoint
+from apps.acoustic_analysis.services import latest_per_pair
 from apps.NTF.models import NTFInfo
 from apps.vehicle_body.models import SampleInfo
 
@@ -217,25 +218,27 @@ def home_dashboard(request):
     }
 
     if ordered_condition_ids:
-        latest_records = (
-            AcousticTestData.objects.filter(
-                condition_point_id__in=ordered_condition_ids,
-                rms_value__isnull=False,
+        # 每个 (车型, 工况测点) 取最近一条有效值非空的测试记录（窗口函数，一次查询），
+        # 按测试日期倒序同时得到车型顺序与雷达数值
+        latest_results = (
+            latest_per_pair(
+                AcousticTestData.objects.filter(
+                    condition_point_id__in=ordered_condition_ids,
+                    rms_value__isnull=False,
+                )
             )
-            .order_by('-test_date', '-id')
-            .values('vehicle_model_id', 'test_date')
+            .order_by(F('test_date').desc(nulls_last=True), '-id')
+            .values_list('vehicle_model_id', 'condition_point_id', 'rms_value')
         )
 
         picked_vehicle_ids = []
-        seen = set()
-        for item in latest_records:
-            vm_id = item['vehicle_model_id']
-            if vm_id in seen:
-                continue
-            seen.add(vm_id)
-            picked_vehicle_ids.append(vm_id)
-            if len(picked_vehicle_ids) >= 3:
-                break
+        vm_point_values: dict[int, dict[int, float]] = defaultdict(dict)
+        for vm_id, cp_id, rms_value in latest_results:
+            if vm_id not in vm_point_values:
+                if len(picked_vehicle_ids) >= 3:
+                    continue
+                picked_vehicle_ids.append(vm_id)
+            vm_point_values[vm_id][cp_id] = float(rms_value)
 
         if picked_vehicle_ids:
             vehicle_names = dict(
@@ -243,22 +246,6 @@ def home_dashboard(request):
                     'id', 'vehicle_model_name'
                 )
             )
-            vm_point_values: dict[int, dict[int, float]] = defaultdict(dict)
-            for vm_id in picked_vehicle_ids:
-                for cp_id in ordered_condition_ids:
-                    latest_value = (
-                        AcousticTestData.objects.filter(
-                            vehicle_model_id=vm_id,
-                            condition_point_id=cp_id,
-                            rms_value__isnull=False,
-                        )
-                        .order_by('-test_date', '-id')
-                        .values_list('rms_value', flat=True)
-                        .first()
-                    )
-                    if latest_value is not None:
-                        vm_point_values[vm_id][cp_id] = float(latest_value)
-
             for vm_id in picked_vehicle_ids:
                 vm_values = vm_point_values.get(vm_id, {})
                 values = [vm_values.get(cid) for cid in ordered_condition_ids]
@@ -5,3 +5,6 @@ class NvhTaskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.nvh_task'
     verbose_name = '试验任务管理'
+
+    def ready(self):
+        from apps.nvh_task import signals  # noqa: F401
@@ -0,0 +1,226 @@
+"""
+试验任务单导出
+
+filter_export_records 按列表页筛选条件构建查询集，build_workbook 以 openpyxl 只写模式生成工作簿：
+表头与数据行共用两个命名样式（只在工作簿中登记一次，单元格仅引用样式名），
+查询集按 EXPORT_CHUNK_SIZE 分批读取，导出多年任务时内存占用不随行数增长。
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+from .models import MainRecord
+from .search import apply_text_filters
+
+
+EXPORT_SHEET_TITLE = '试验任务单'
+EXPORT_CHUNK_SIZE = 2000
+HEADER_STYLE = 'nvh_task_header'
+BODY_STYLE = 'nvh_task_body'
+
+# 表头与列宽（与前端表格列顺序一致）
+EXPORT_COLUMNS = [
+    ('闭环状态', 10),
+    ('样品状态', 10),
+    ('预警', 10),
+    ('车型', 12),
+    ('VIN/零件编号', 20),
+    ('试验名称', 30),
+    ('测试人员', 12),
+    ('协助人员', 12),
+    ('提出人', 12),
+    ('排期开始', 12),
+    ('排期结束', 12),
+    ('排期备注', 15),
+    ('地点', 15),
+    ('报告', 8),
+    ('合同编号', 12),
+    ('备注', 15),
+]
+
+EXPORT_FIELDS = [
+    'id', 'is_closed', 'warning_system_status', 'model', 'vin_or_part_no', 'test_name',
+    'tester_name', 'assistants', 'requester_name', 'schedule_start', 'schedule_end',
+    'schedule_remark', 'test_location', 'report_required', 'contract_no', 'remark',
+    'entry_exit__dispose_type', 'entry_exit__is_deleted',
+]
+
+
+def _is_true(value):
+    return str(value).lower() in ['true', '1', 'yes']
+
+
+def _parse_date(value, days=0):
+    try:
+        dt = datetime.strptime(value, '%Y-%m-%d') + timedelta(days=days)
+    except ValueError:
+        return None
+    if settings.USE_TZ:
+        dt = timezone.make_aware(dt, timezone.get_current_timezone())
+    return dt
+
+
+def filter_export_records(params):
+    """按列表页筛选条件过滤主记录；params 为 request.GET 或普通字典"""
+    queryset = MainRecord.objects.order_by('tester_name', '-schedule_start', '-id')
+
+    # 模糊匹配：车型 / VIN/零件编号 / 试验名称 / 任务提出人 / 测试人员
+    queryset = apply_text_filters(queryset, params)
+
+    # 加入预警系统状态
+    warning_status = params.get('warning_system_status')
+    if warning_status:
+        queryset = queryset.filter(warning_system_status=warning_status)
+
+    # 合同编号是否有内容
+    has_contract_no = params.get('has_contract_no')
+    if has_contract_no is not None and has_contract_no != '':
+        if _is_true(has_contract_no):
+            queryset = queryset.exclude(contract_no__isnull=True).exclude(contract_no__exact='')
+        else:
+            queryset = queryset.filter(Q(contract_no__isnull=True) | Q(contract_no__exact=''))
+
+    # 是否闭环
+    is_closed = params.get('is_closed')
+    if is_closed is not None and is_closed != '':
+        queryset = queryset.filter(is_closed=_is_true(is_closed))
+
+    # 样品状态
+    entry_exit_dispose_type = params.get('entry_exit_dispose_type')
+    if entry_exit_dispose_type is not None and entry_exit_dispose_type != '':
+        if entry_exit_dispose_type == 'null' or entry_exit_dispose_type == '--':
+            queryset = queryset.filter(
+                Q(entry_exit__isnull=True) | Q(entry_exit__dispose_type__isnull=True) | Q(entry_exit__dispose_type__exact='')
+            )
+        else:
+            queryset = queryset.filter(entry_exit__dispose_type=entry_exit_dispose_type)
+
+    # 出具报告
+    report_required = params.get('report_required')
+    if report_required is not None and report_required != '':
+        queryset = queryset.filter(report_required=report_required)
+
+    # 排期开始时间范围（格式错误的日期忽略）
+    start_date = params.get('schedule_start_from')
+    if start_date:
+        start_dt = _parse_date(start_date)
+        if start_dt is not None:
+            queryset = queryset.filter(schedule_start__gte=start_dt)
+    end_date = params.get('schedule_start_to')
+    if end_date:
+        end_dt = _parse_date(end_date, days=1)
+        if end_dt is not None:
+            queryset = queryset.filter(schedule_start__lt=end_dt)
+
+    return queryset
+
+
+def _format_date(value):
+    return value.strftime('%Y-%m-%d') if value else '--'
+
+
+def export_row(row):
+    """将 EXPORT_FIELDS 取出的字典转为一行单元格值"""
+    if row['entry_exit__is_deleted'] is False:
+        dispose_type = row['entry_exit__dispose_type'] or '--'
+    else:
+        # 未关联进出记录（LEFT JOIN 为 None）或进出记录已删除
+        dispose_type = '--'
+    return [
+        '已闭环' if row['is_closed'] else '未闭环',
+        dispose_type,
+        row['warning_system_status'] or '',
+        row['model'] or '',
+        row['vin_or_part_no'] or '',
+        row['test_name'] or '',
+        row['tester_name'] or '',
+        row['assistants'] or '--',
+        row['requester_name'] or '',
+        _format_date(row['schedule_start']),
+        _format_date(row['schedule_end']),
+        row['schedule_remark'] or '--',
+        row['test_location'] or '',
+        row['report_required'] or '',
+        row['contract_no'] or '否',
+        row['remark'] or '--',
+    ]
+
+
+def iter_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """按批读取查询集，逐行生成单元格值"""
+    for row in queryset.values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        yield export_row(row)
+
+
+def _register_styles(wb):
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin'),
+    )
+    alignment = Alignment(horizontal='center', vertical='center')
+    wb.add_named_style(NamedStyle(
+        name=HEADER_STYLE,
+        font=Font(bold=True, color='FFFFFF'),
+        fill=PatternFill(start_color='409EFF', end_color='409EFF', fill_type='solid'),
+        alignment=alignment,
+        border=border,
+    ))
+    wb.add_named_style(NamedStyle(name=BODY_STYLE, alignment=alignment, border=border))
+
+
+def _styled_row(ws, values, style):
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+
+def build_workbook(queryset, on_progress=None):
+    """生成只写模式工作簿；on_progress(已写入行数) 每 EXPORT_CHUNK_SIZE 行及写完时调用"""
+    wb = openpyxl.Workbook(write_only=True)
+    _register_styles(wb)
+    ws = wb.create_sheet(title=EXPORT_SHEET_TITLE)
+    # 只写模式下列宽需在写入数据前设置
+    for col_idx, (_, width) in enumerate(EXPORT_COLUMNS, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    ws.append(_styled_row(ws, [header for header, _ in EXPORT_COLUMNS], HEADER_STYLE))
+    count = 0
+    for values in iter_export_rows(queryset):
+        ws.append(_styled_row(ws, values, BODY_STYLE))
+        count += 1
+        if on_progress and count % EXPORT_CHUNK_SIZE == 0:
+            on_progress(count)
+    if on_progress:
+        on_progress(count)
+    return wb
+
+
+def export_filename():
+    return f'{EXPORT_SHEET_TITLE}_{datetime.now().strftime("%Y%m%d")}.xlsx'
+
+
+def run_export_job(params, report):
+    """
+    导出任务入口（见 apps.export_job）
+
+    params 为列表页筛选条件字典，返回 (文件名, 工作簿)。
+    """
+    queryset = filter_export_records(params)
+    report(0, queryset.count())
+    return export_filename(), build_workbook(queryset, on_progress=report)
@@ -0,0 +1,109 @@
+"""
+任务附件图片衍生版本
+
+上传接口只保存原图（最大 5MB），页面直接加载原图时附件较多的任务页面体积很大。
+这里在附件确认上传（confirm_file_upload 移动到最终目录）后，由进程内后台线程池
+用 Pillow 生成固定尺寸的 WebP 衍生图，供前端列表/缩略展示和大图预览使用：
+
+- thumbnail：最长边 320px，用于表单和列表中的缩略图；
+- webp：最长边 1920px，用于点击预览。
+
+衍生图保存在原图所在目录的 _variants 子目录下，文件名由原图文件名推导，
+不需要额外的数据库字段；生成时先写临时文件再原子替换，序列化时仅在文件存在时返回
+衍生图路径，尚未生成（或生成失败）时回退为原图路径。
+线程池随进程退出丢失的任务及历史附件，执行 generate_task_image_variants 补生成。
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = '_variants'
+# 衍生版本 → 最长边尺寸，按尺寸从大到小生成（后一个在前一个的缩放结果上继续缩放）
+VARIANTS = {
+    'webp': 1920,
+    'thumbnail': 320,
+}
+WEBP_QUALITY = 80
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='nvh-task-image')
+
+
+# ==================== 路径 ====================
+
+def variant_path(name: str, variant: str) -> str:
+    """原图相对路径 → 衍生图相对路径（如 nvh_task/nvh_test_process/_variants/abc_thumbnail.webp）"""
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return '/'.join(part for part in (directory, VARIANT_DIR, f'{stem}_{variant}.webp') if part)
+
+
+def _full_path(name: str) -> str:
+    return os.path.join(settings.MEDIA_ROOT, name)
+
+
+def variant_urls(name) -> dict:
+    """序列化用：各衍生图相对路径，衍生图不存在时回退为原图路径，原图为空时均为空字符串"""
+    name = str(name or '')
+    if not name:
+        return dict.fromkeys(VARIANTS, '')
+    result = {}
+    for variant in VARIANTS:
+        path = variant_path(name, variant)
+        result[variant] = path if os.path.exists(_full_path(path)) else name
+    return result
+
+
+# ==================== 生成 ====================
+
+def _normalize_mode(image):
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    target = 'RGBA' if has_alpha else 'RGB'
+    return image if image.mode == target else image.convert(target)
+
+
+def generate_variants(name: str, overwrite: bool = False) -> int:
+    """
+    为原图生成全部衍生图，返回本次生成的数量
+
+    已存在的衍生图默认跳过；GIF 等多帧图片取第一帧。
+    """
+    source = _full_path(name)
+    targets = {variant: variant_path(name, variant) for variant in VARIANTS}
+    if not overwrite and all(os.path.exists(_full_path(path)) for path in targets.values()):
+        return 0
+
+    generated = 0
+    with Image.open(source) as original:
+        # JPEG 按目标尺寸降采样解码，减少大图解码耗时与内存
+        original.draft('RGB', (max(VARIANTS.values()),) * 2)
+        image = _normalize_mode(ImageOps.exif_transpose(original))
+        os.makedirs(os.path.dirname(_full_path(targets['thumbnail'])), exist_ok=True)
+        for variant, size in VARIANTS.items():
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            dest = _full_path(targets[variant])
+            if not overwrite and os.path.exists(dest):
+                continue
+            tmp = f'{dest}.tmp'
+            image.save(tmp, 'WEBP', quality=WEBP_QUALITY, method=4)
+            os.replace(tmp, dest)
+            generated += 1
+    return generated
+
+
+def _generate_quietly(name: str):
+    try:
+        generate_variants(name)
+    except Exception:
+        logger.exception('生成附件衍生图失败: %s', name)
+
+
+def schedule_variants(name: str):
+    """提交到后台线程池生成衍生图（不阻塞请求）"""
+    if name and os.path.exists(_full_path(name)):
+        _executor.submit(_generate_quietly, name)
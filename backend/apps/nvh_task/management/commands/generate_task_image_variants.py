@@ -0,0 +1,50 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.nvh_task.images import generate_variants
+from apps.nvh_task.models import DocApproval, TestInfo, TestProcessAttachment
+
+
+# 模型 → 图片字段
+IMAGE_FIELDS = [
+    (TestProcessAttachment, 'file_url'),
+    (TestInfo, 'teardown_attachment_url'),
+    (DocApproval, 'file_url'),
+]
+
+
+class Command(BaseCommand):
+    help = '为任务附件图片补生成缩略图与 WebP 衍生图（历史附件或后台线程未完成的附件）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='重新生成已存在的衍生图',
+        )
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, field in IMAGE_FIELDS:
+            names.update(
+                model.all_objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .values_list(field, flat=True)
+            )
+
+        self.stdout.write(f'共 {len(names)} 张附件图片，开始生成衍生图...')
+        generated = missing = failed = 0
+        for name in sorted(names):
+            if not os.path.exists(os.path.join(settings.MEDIA_ROOT, name)):
+                missing += 1
+                continue
+            try:
+                generated += generate_variants(name, overwrite=options['overwrite'])
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'{name} 处理失败: {e}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'生成 {generated} 张衍生图，原图缺失 {missing} 张，失败 {failed} 张'
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.nvh_task.services import rebuild_closed
+
+
+class Command(BaseCommand):
+    help = '按当前闭环规则重新计算全部任务主记录的闭环状态（闭环规则调整后执行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批处理的记录数',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('开始重新计算任务闭环状态...')
+        processed = total = 0
+        for processed, total in rebuild_closed(batch_size=max(1, options['batch_size'])):
+            self.stdout.write(f'已处理 {processed}/{total}')
+        self.stdout.write(self.style.SUCCESS(f'成功刷新 {processed} 条任务主记录的闭环状态'))
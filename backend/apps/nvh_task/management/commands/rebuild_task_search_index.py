@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.nvh_task.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = '重建任务主记录文本检索词元（批量导入等绕过 save() 的写入后执行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='每批处理的记录数',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('开始重建任务检索词元...')
+        processed = total = 0
+        for processed, total in rebuild_search_index(batch_size=max(1, options['batch_size'])):
+            self.stdout.write(f'已处理 {processed}/{total}')
+        self.stdout.write(self.style.SUCCESS(f'成功重建 {processed} 条任务主记录的检索词元'))
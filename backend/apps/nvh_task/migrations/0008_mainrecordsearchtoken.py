@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_search_tokens(apps, schema_editor):
+    from apps.nvh_task.search import rebuild_search_index
+
+    for _ in rebuild_search_index(
+        token_model=apps.get_model('nvh_task', 'MainRecordSearchToken'),
+        main_model=apps.get_model('nvh_task', 'MainRecord'),
+    ):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nvh_task', '0007_commonrequester'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MainRecordSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.PositiveSmallIntegerField(verbose_name='字段编号')),
+                ('token', models.CharField(max_length=2, verbose_name='词元')),
+                ('main', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='nvh_task.mainrecord', verbose_name='关联主任务')),
+            ],
+            options={
+                'verbose_name': '主记录检索词元',
+                'verbose_name_plural': '主记录检索词元',
+                'constraints': [models.UniqueConstraint(fields=('field', 'token', 'main'), name='uniq_main_search_token')],
+            },
+        ),
+        migrations.RunPython(build_search_tokens, migrations.RunPython.noop),
+    ]
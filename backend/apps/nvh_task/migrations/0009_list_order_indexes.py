@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nvh_task', '0008_mainrecordsearchtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entryexit',
+            index=models.Index(fields=['is_deleted', '-created_at', '-id'], name='idx_entry_exit_created'),
+        ),
+        migrations.AddIndex(
+            model_name='entryexit',
+            index=models.Index(fields=['is_deleted', '-enter_time', '-id'], name='idx_entry_exit_enter'),
+        ),
+        migrations.AddIndex(
+            model_name='mainrecord',
+            index=models.Index(fields=['is_deleted', '-schedule_start', 'tester_name', 'assistants', '-id'], name='idx_main_record_list'),
+        ),
+    ]
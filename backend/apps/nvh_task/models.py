@@ -26,8 +26,10 @@ class SoftDeleteQuerySet(models.QuerySet):
 class SoftDeleteManager(models.Manager):
     """默认只返回未删除数据"""
 
+    _queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).filter(is_deleted=False)
+        return self._queryset_class(self.model, using=self._db).filter(is_deleted=False)
 
 
 class SoftDeleteModel(models.Model):
@@ -75,6 +77,24 @@ STATUS_SUBMITTED = "SUBMITTED"
 
 # ==================== 业务模型 ====================
 
+class EntryExitQuerySet(SoftDeleteQuerySet):
+
+    def with_main_record_summary(self):
+        """
+        附加引用主记录摘要，列表序列化时无需逐行查询：
+        - main_record_model / main_record_vin_or_part_no：第一条（id 最小）未删除主记录的车型与 VIN/零件编号
+        - active_main_count：未删除主记录数量
+        """
+        first_main = MainRecord.objects.filter(entry_exit=models.OuterRef('pk')).order_by('pk')
+        return self.annotate(
+            main_record_model=models.Subquery(first_main.values('model')[:1]),
+            main_record_vin_or_part_no=models.Subquery(first_main.values('vin_or_part_no')[:1]),
+            active_main_count=models.Count(
+                'main_records', filter=models.Q(main_records__is_deleted=False)
+            ),
+        )
+
+
 class EntryExit(SoftDeleteModel):
     """车辆及零件进出登记（可被多个 MainRecord 共用）"""
 
@@ -93,15 +113,24 @@ class EntryExit(SoftDeleteModel):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="创建时间")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
 
+    objects = SoftDeleteManager.from_queryset(EntryExitQuerySet)()
+
     class Meta:
         verbose_name = "车辆及零件进出登记"
         verbose_name_plural = "车辆及零件进出登记"
+        indexes = [
+            # 与列表排序一致，支撑游标分页
+            models.Index(fields=["is_deleted", "-created_at", "-id"], name="idx_entry_exit_created"),
+            models.Index(fields=["is_deleted", "-enter_time", "-id"], name="idx_entry_exit_enter"),
+        ]
 
     def __str__(self):
         return f"EntryExit#{self.id}"
 
     def active_mainrecord_count(self) -> int:
-        """返回引用此进出登记的未删除主记录数量"""
+        """返回引用此进出登记的未删除主记录数量（经 with_main_record_summary 查询时直接取注解值）"""
+        if hasattr(self, 'active_main_count'):
+            return self.active_main_count
         return self.main_records.count()
 
     def soft_delete(self, using=None, keep_parents=False):
@@ -155,6 +184,13 @@ class MainRecord(SoftDeleteModel):
     class Meta:
         verbose_name = "任务主记录"
         verbose_name_plural = "任务主记录"
+        indexes = [
+            # 与任务列表排序一致，支撑游标分页
+            models.Index(
+                fields=["is_deleted", "-schedule_start", "tester_name", "assistants", "-id"],
+                name="idx_main_record_list",
+            ),
+        ]
 
     def __str__(self):
         return f"MainRecord#{self.id} {self.vin_or_part_no} {self.test_name}"
@@ -173,6 +209,33 @@ class MainRecord(SoftDeleteModel):
             return super().soft_delete(using=using, keep_parents=keep_parents)
 
 
+class MainRecordSearchToken(models.Model):
+    """
+    主记录文本检索词元（单字/双字 n-gram，小写），用于列表模糊筛选，见 search.py
+
+    field 为 search.SEARCH_FIELDS 中的字段编号，由主记录保存信号维护。
+    """
+
+    main = models.ForeignKey(
+        "MainRecord",
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+        verbose_name="关联主任务",
+    )
+    field = models.PositiveSmallIntegerField(verbose_name="字段编号")
+    token = models.CharField(max_length=2, verbose_name="词元")
+
+    class Meta:
+        verbose_name = "主记录检索词元"
+        verbose_name_plural = "主记录检索词元"
+        constraints = [
+            models.UniqueConstraint(fields=["field", "token", "main"], name="uniq_main_search_token"),
+        ]
+
+    def __str__(self):
+        return f"{self.main_id}:{self.field}:{self.token}"
+
+
 class TestInfo(SoftDeleteModel):
     """试验信息登记（与 MainRecord 一对一）"""
 
@@ -0,0 +1,132 @@
+"""
+任务列表文本检索索引
+
+车型、VIN/零件编号、试验名称、提出人、测试人员的模糊筛选原为前置通配的 icontains，
+MySQL 无法使用索引，每次查询都全表扫描。这里为这些字段维护一张字符 n-gram 词元表
+（MainRecordSearchToken，单字 + 相邻双字，统一小写），适用于中文等无分词边界的文本：
+
+- 检索词长度为 1 时按单字词元、否则按其全部双字词元查找，同时包含全部词元的记录为候选；
+- 候选集上仍执行原 icontains 条件，结果与原筛选完全一致（词元只用于缩小范围）。
+
+词元在 MainRecord 保存后由信号同步；批量导入等绕过 save() 的写入需执行 rebuild_task_search_index。
+未使用 MySQL FULLTEXT ngram 索引：其受停用词与分隔符规则影响，VIN/零件编号中的字母、连字符
+无法保证与 icontains 等价，且仅适用于 MySQL。
+"""
+from typing import Iterable, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import MainRecord, MainRecordSearchToken
+
+
+# 可检索字段 → 词元表中的字段编号
+SEARCH_FIELDS = {
+    'model': 1,
+    'vin_or_part_no': 2,
+    'test_name': 3,
+    'requester_name': 4,
+    'tester_name': 5,
+}
+
+
+# ==================== 分词 ====================
+
+def text_tokens(value) -> Set[str]:
+    """字段值的全部单字与双字词元"""
+    if not value:
+        return set()
+    text = str(value).lower()
+    tokens = set(text)
+    tokens.update(text[i:i + 2] for i in range(len(text) - 1))
+    return tokens
+
+
+def term_tokens(term: str) -> Set[str]:
+    """检索词需全部命中的词元：单字检索词取自身，其余取相邻双字"""
+    text = term.lower()
+    if len(text) == 1:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def record_tokens(values: dict) -> Set[Tuple[int, str]]:
+    return {
+        (code, token)
+        for field, code in SEARCH_FIELDS.items()
+        for token in text_tokens(values.get(field))
+    }
+
+
+# ==================== 索引维护 ====================
+
+def sync_search_tokens(main: MainRecord) -> None:
+    """按当前字段值增量更新单条记录的词元"""
+    desired = record_tokens({field: getattr(main, field) for field in SEARCH_FIELDS})
+    existing = set(
+        MainRecordSearchToken.objects.filter(main_id=main.pk).values_list('field', 'token')
+    )
+    removed = existing - desired
+    added = desired - existing
+    if not removed and not added:
+        return
+    with transaction.atomic():
+        for code in {code for code, _ in removed}:
+            MainRecordSearchToken.objects.filter(
+                main_id=main.pk, field=code, token__in=[token for c, token in removed if c == code]
+            ).delete()
+        # 大小写/重音不敏感的排序规则下不同字符可能被视为同一词元，冲突时保留已有行即可
+        MainRecordSearchToken.objects.bulk_create(
+            [MainRecordSearchToken(main_id=main.pk, field=code, token=token) for code, token in added],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_search_index(batch_size: int = 500, token_model=MainRecordSearchToken, main_model=MainRecord):
+    """
+    按主键分批重建全部主记录（含已删除）的词元，逐批返回 (已处理数, 总数)
+
+    token_model/main_model 供数据迁移传入历史模型。
+    """
+    manager = getattr(main_model, 'all_objects', main_model._base_manager)
+    ids = list(manager.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        rows = manager.filter(pk__in=chunk).values('pk', *SEARCH_FIELDS)
+        with transaction.atomic():
+            token_model.objects.filter(main_id__in=chunk).delete()
+            token_model.objects.bulk_create(
+                [
+                    token_model(main_id=row['pk'], field=code, token=token)
+                    for row in rows
+                    for code, token in record_tokens(row)
+                ],
+                batch_size=5000,
+                ignore_conflicts=True,
+            )
+        yield start + len(chunk), len(ids)
+
+
+# ==================== 检索 ====================
+
+def filter_text(queryset, field: str, term: str):
+    """等价于 queryset.filter(<field>__icontains=term)，先经词元表缩小候选范围"""
+    tokens = term_tokens(term)
+    candidates = (
+        MainRecordSearchToken.objects
+        .filter(field=SEARCH_FIELDS[field], token__in=tokens)
+        .values('main_id')
+        .annotate(matched=Count('token', distinct=True))
+        .filter(matched=len(tokens))
+        .values('main_id')
+    )
+    return queryset.filter(pk__in=candidates, **{f'{field}__icontains': term})
+
+
+def apply_text_filters(queryset, params, fields: Iterable[str] = SEARCH_FIELDS):
+    """按请求参数（与字段同名）应用文本模糊筛选"""
+    for field in fields:
+        term = params.get(field)
+        if term:
+            queryset = filter_text(queryset, field, term)
+    return queryset
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .images import variant_urls
 from .models import (
     MainRecord, EntryExit, TestInfo, DocApproval,
     TestProcessAttachment, TestProcessList, CommonRequester
@@ -24,12 +25,16 @@ class EntryExitSerializer(serializers.ModelSerializer):
         return obj.active_mainrecord_count()
 
     def get_vin_or_part_no(self, obj):
-        """返回关联的第一个主记录的 vin_or_part_no"""
+        """返回关联的第一个主记录的 vin_or_part_no（列表查询使用 with_main_record_summary 注解）"""
+        if hasattr(obj, 'main_record_vin_or_part_no'):
+            return obj.main_record_vin_or_part_no
         main_record = obj.main_records.first()
         return main_record.vin_or_part_no if main_record else None
 
     def get_model(self, obj):
-        """返回关联的第一个主记录的 model"""
+        """返回关联的第一个主记录的 model（列表查询使用 with_main_record_summary 注解）"""
+        if hasattr(obj, 'main_record_model'):
+            return obj.main_record_model
         main_record = obj.main_records.first()
         return main_record.model if main_record else None
 
@@ -51,6 +56,10 @@ class TestProcessAttachmentSerializer(serializers.ModelSerializer):
             ret['file_url'] = instance.file_url.name if hasattr(instance.file_url, 'name') else str(instance.file_url)
         else:
             ret['file_url'] = ''
+        # 缩略图 / WebP 预览图（尚未生成时为原图路径）
+        variants = variant_urls(ret['file_url'])
+        ret['file_thumbnail_url'] = variants['thumbnail']
+        ret['file_webp_url'] = variants['webp']
         return ret
 
 
@@ -93,6 +102,10 @@ class TestInfoSerializer(serializers.ModelSerializer):
             ret['teardown_attachment_url'] = instance.teardown_attachment_url.name if hasattr(instance.teardown_attachment_url, 'name') else str(instance.teardown_attachment_url)
         else:
             ret['teardown_attachment_url'] = ''
+        # 缩略图 / WebP 预览图（尚未生成时为原图路径）
+        variants = variant_urls(ret['teardown_attachment_url'])
+        ret['teardown_attachment_thumbnail_url'] = variants['thumbnail']
+        ret['teardown_attachment_webp_url'] = variants['webp']
         return ret
 
 
@@ -118,6 +131,10 @@ class DocApprovalSerializer(serializers.ModelSerializer):
             ret['file_url'] = instance.file_url.name if hasattr(instance.file_url, 'name') else str(instance.file_url)
         else:
             ret['file_url'] = ''
+        # 缩略图 / WebP 预览图（尚未生成时为原图路径）
+        variants = variant_urls(ret['file_url'])
+        ret['file_thumbnail_url'] = variants['thumbnail']
+        ret['file_webp_url'] = variants['webp']
         return ret
 
 
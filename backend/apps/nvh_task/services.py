@@ -2,6 +2,7 @@
 NVH Task 业务逻辑服务层
 封装：提交/撤回/闭环刷新/校验
 """
+from django.db.models import BooleanField, Case, Exists, OuterRef, Q, Value, When
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
@@ -9,15 +10,20 @@ from .models import (
     MainRecord, EntryExit, TestInfo, DocApproval, TestProcessAttachment,
     STATUS_DRAFT, STATUS_SUBMITTED
 )
+from .statistics import bump_statistics_version
 
 
 # ==================== 闭环刷新 ====================
 
-def refresh_main_closed(main: MainRecord) -> MainRecord:
+TASK_SCENARIO_CANCEL_WITH_SAMPLE = "CANCEL_WITH_SAMPLE"
+TASK_SCENARIO_CANCEL_NO_SAMPLE = "CANCEL_NO_SAMPLE"
+
+
+def closure_condition() -> Q:
     """
-    刷新单个 MainRecord 的闭环状态
-    
-    新闭环规则（按场景）：
+    MainRecord 闭环条件（可用于 filter / annotate / update）
+
+    闭环规则（按场景）：
     1) NORMAL（正常任务）：
        - doc_requirement=0: EE_OK && TI_OK
        - doc_requirement=1: EE_OK && TI_OK && DA_OK
@@ -25,60 +31,49 @@ def refresh_main_closed(main: MainRecord) -> MainRecord:
        - 仅需 EE_OK
     3) CANCEL_NO_SAMPLE（取消且无样品）：
        - 直接闭环 true
-    
+
     表单 OK 口径：记录存在 && is_deleted=false && status=SUBMITTED
+    三张表均以 EXISTS 子查询判断，不依赖 JOIN 类型，任意筛选后的 queryset 都可直接使用。
     """
-    # 获取任务场景和技术资料要求
-    task_scenario = main.task_scenario or "NORMAL"
-    doc_requirement = main.doc_requirement
-    
-    # 判断 EntryExit 是否 OK
-    entry_exit_ok = (
-        main.entry_exit is not None
-        and not main.entry_exit.is_deleted
-        and main.entry_exit.status == STATUS_SUBMITTED
+    entry_exit_ok = Exists(EntryExit.all_objects.filter(
+        pk=OuterRef('entry_exit_id'), is_deleted=False, status=STATUS_SUBMITTED,
+    ))
+    test_info_ok = Exists(TestInfo.all_objects.filter(
+        main_id=OuterRef('pk'), is_deleted=False, status=STATUS_SUBMITTED,
+    ))
+    doc_approval_ok = Exists(DocApproval.all_objects.filter(
+        main_id=OuterRef('pk'), is_deleted=False, status=STATUS_SUBMITTED,
+    ))
+    cancel_scenarios = [TASK_SCENARIO_CANCEL_WITH_SAMPLE, TASK_SCENARIO_CANCEL_NO_SAMPLE]
+    return (
+        Q(task_scenario=TASK_SCENARIO_CANCEL_NO_SAMPLE)
+        | (Q(task_scenario=TASK_SCENARIO_CANCEL_WITH_SAMPLE) & entry_exit_ok)
+        # NORMAL 或其他场景：按 doc_requirement 判断
+        | (
+            ~Q(task_scenario__in=cancel_scenarios)
+            & entry_exit_ok
+            & test_info_ok
+            & (Q(doc_requirement=False) | doc_approval_ok)
+        )
     )
 
-    # 判断 TestInfo 是否 OK
-    test_info_ok = False
-    try:
-        test_info = main.test_info
-        if test_info and not test_info.is_deleted:
-            test_info_ok = test_info.status == STATUS_SUBMITTED
-    except TestInfo.DoesNotExist:
-        pass
-
-    # 判断 DocApproval 是否 OK
-    doc_approval_ok = False
-    try:
-        doc_approval = main.doc_approval
-        if doc_approval and not doc_approval.is_deleted:
-            doc_approval_ok = doc_approval.status == STATUS_SUBMITTED
-    except DocApproval.DoesNotExist:
-        pass
-
-    # 按场景计算闭环状态
-    is_closed = False
-    
-    if task_scenario == "CANCEL_NO_SAMPLE":
-        # 取消且无样品：直接闭环
-        is_closed = True
-    elif task_scenario == "CANCEL_WITH_SAMPLE":
-        # 取消且有样品：仅需 EntryExit
-        is_closed = entry_exit_ok
-    else:
-        # NORMAL 或其他场景：按 doc_requirement 判断
-        if doc_requirement:
-            # 要求技术资料：三表都需要
-            is_closed = entry_exit_ok and test_info_ok and doc_approval_ok
-        else:
-            # 不要求技术资料：只需 EntryExit + TestInfo
-            is_closed = entry_exit_ok and test_info_ok
 
-    main.is_closed = is_closed
-    main.closure_checked_at = timezone.now()
-    main.save(update_fields=['is_closed', 'closure_checked_at'])
+def closure_expression() -> Case:
+    return Case(When(closure_condition(), then=Value(True)), default=Value(False), output_field=BooleanField())
 
+
+def refresh_closed(queryset) -> int:
+    """按闭环规则重新计算 queryset 内全部 MainRecord 的闭环状态（单条 UPDATE），返回更新行数"""
+    updated = queryset.update(is_closed=closure_expression(), closure_checked_at=timezone.now())
+    # UPDATE 不触发 post_save 信号，闭环状态变化需单独使统计缓存失效
+    bump_statistics_version()
+    return updated
+
+
+def refresh_main_closed(main: MainRecord) -> MainRecord:
+    """刷新单个 MainRecord 的闭环状态"""
+    refresh_closed(MainRecord.all_objects.filter(pk=main.pk))
+    main.refresh_from_db(fields=['is_closed', 'closure_checked_at'])
     return main
 
 
@@ -87,11 +82,16 @@ def refresh_mains_closed_by_entry_exit(entry_exit: EntryExit) -> int:
     刷新所有引用该 EntryExit 的 MainRecord 的闭环状态
     返回刷新的记录数
     """
-    count = 0
-    for main in entry_exit.main_records.all():
-        refresh_main_closed(main)
-        count += 1
-    return count
+    return refresh_closed(entry_exit.main_records.all())
+
+
+def rebuild_closed(batch_size: int = 1000):
+    """按主键分批重新计算全部 MainRecord（含已删除）的闭环状态，逐批返回 (已处理数, 总数)"""
+    ids = list(MainRecord.all_objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        refresh_closed(MainRecord.all_objects.filter(pk__gte=chunk[0], pk__lte=chunk[-1]))
+        yield start + len(chunk), len(ids)
 
 
 # ==================== EntryExit 提交/撤回 ====================
@@ -0,0 +1,29 @@
+"""
+任务主记录写入信号：使任务统计缓存失效，同步文本检索词元
+"""
+from django.db.models.signals import post_delete, post_save
+
+from .models import MainRecord
+from .search import SEARCH_FIELDS, sync_search_tokens
+from .statistics import bump_statistics_version
+
+
+def invalidate_statistics(sender, instance, raw=False, **kwargs):
+    # 软删除经 save(update_fields=...) 触发 post_save，同样会使缓存失效
+    if raw:
+        return
+    bump_statistics_version()
+
+
+def update_search_tokens(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # 仅更新了非检索字段（如软删除、闭环状态）时无需同步
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    sync_search_tokens(instance)
+
+
+post_save.connect(invalidate_statistics, sender=MainRecord, dispatch_uid='nvh_task:statistics')
+post_delete.connect(invalidate_statistics, sender=MainRecord, dispatch_uid='nvh_task:statistics')
+post_save.connect(update_search_tokens, sender=MainRecord, dispatch_uid='nvh_task:search_tokens')
@@ -0,0 +1,151 @@
+"""
+试验任务统计
+
+全部统计口径（总数、本月、本周、本周已闭环/未闭环，以及可选的自定义排期区间）
+以条件 Count(filter=...) 在一条查询中完成；按测试人员分组时改为一条 GROUP BY 查询，
+总计由各组求和得到，同样只查询一次。
+
+结果按统计口径缓存 STATISTICS_CACHE_TIMEOUT 秒，缓存键带版本号：
+MainRecord 新增/修改/删除（信号）及闭环状态批量刷新（refresh_closed）后在事务提交后递增。
+"""
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import MainRecord
+
+
+STATISTICS_VERSION_KEY = 'nvh_task:statistics:version'
+STATISTICS_KEY = 'nvh_task:statistics:{version}:{week}:{month}:{start}:{end}:{by_tester}'
+STATISTICS_CACHE_TIMEOUT = 60
+
+COUNT_FIELDS = ['total_tasks', 'month_tasks', 'week_tasks', 'week_closed', 'week_unclosed']
+PERIOD_COUNT_FIELDS = ['period_tasks', 'period_closed', 'period_unclosed']
+
+
+# ==================== 版本号 ====================
+
+def _current_version():
+    version = cache.get(STATISTICS_VERSION_KEY)
+    if version is None:
+        cache.add(STATISTICS_VERSION_KEY, 1, None)
+        version = cache.get(STATISTICS_VERSION_KEY, 1)
+    return version
+
+
+def bump_statistics_version():
+    """任务主记录变更后使统计缓存失效；在事务提交后执行"""
+    def _bump():
+        try:
+            cache.incr(STATISTICS_VERSION_KEY)
+        except ValueError:
+            cache.set(STATISTICS_VERSION_KEY, 1, None)
+    transaction.on_commit(_bump)
+
+
+# ==================== 统计区间 ====================
+
+def current_week_month(now=None):
+    """本周（周一至下周一）与本月的起止时间，均为本地时区"""
+    now = timezone.localtime(now or timezone.now())
+    week_start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if now.month == 12:
+        month_end = month_start.replace(year=now.year + 1, month=1)
+    else:
+        month_end = month_start.replace(month=now.month + 1)
+    return (week_start, week_start + timedelta(days=7)), (month_start, month_end)
+
+
+def _local_midnight(value):
+    dt = datetime.combine(value, datetime.min.time())
+    return timezone.make_aware(dt, timezone.get_current_timezone())
+
+
+def _range_q(start, end):
+    q = Q()
+    if start is not None:
+        q &= Q(schedule_start__gte=start)
+    if end is not None:
+        q &= Q(schedule_start__lt=end)
+    return q
+
+
+def _count_expressions(week, month, period):
+    counts = {
+        'total_tasks': Count('id'),
+        'month_tasks': Count('id', filter=_range_q(*month)),
+        'week_tasks': Count('id', filter=_range_q(*week)),
+        'week_closed': Count('id', filter=_range_q(*week) & Q(is_closed=True)),
+        'week_unclosed': Count('id', filter=_range_q(*week) & Q(is_closed=False)),
+    }
+    if period is not None:
+        counts['period_tasks'] = Count('id', filter=_range_q(*period))
+        counts['period_closed'] = Count('id', filter=_range_q(*period) & Q(is_closed=True))
+        counts['period_unclosed'] = Count('id', filter=_range_q(*period) & Q(is_closed=False))
+    return counts
+
+
+# ==================== 统计查询 ====================
+
+def compute_task_statistics(date_from=None, date_to=None, by_tester: bool = False, now=None) -> dict:
+    """
+    date_from/date_to 为自定义排期区间（date，均含当天，可只给一端）；
+    by_tester 时附带按测试人员分组的统计（测试人员为空的记录归入空字符串）。
+    """
+    week, month = current_week_month(now)
+    period = None
+    if date_from is not None or date_to is not None:
+        period = (
+            _local_midnight(date_from) if date_from is not None else None,
+            _local_midnight(date_to + timedelta(days=1)) if date_to is not None else None,
+        )
+    counts = _count_expressions(week, month, period)
+    fields = COUNT_FIELDS + (PERIOD_COUNT_FIELDS if period is not None else [])
+
+    testers = None
+    if by_tester:
+        groups = {}
+        for row in MainRecord.objects.order_by().values('tester_name').annotate(**counts):
+            name = row['tester_name'] or ''
+            group = groups.setdefault(name, dict.fromkeys(fields, 0))
+            for field in fields:
+                group[field] += row[field]
+        totals = {field: sum(group[field] for group in groups.values()) for field in fields}
+        testers = [{'tester_name': name, **groups[name]} for name in sorted(groups)]
+    else:
+        totals = MainRecord.objects.aggregate(**counts)
+
+    data = {field: totals[field] for field in COUNT_FIELDS}
+    if period is not None:
+        data['period'] = {
+            'start': date_from.isoformat() if date_from is not None else None,
+            'end': date_to.isoformat() if date_to is not None else None,
+            'tasks': totals['period_tasks'],
+            'closed': totals['period_closed'],
+            'unclosed': totals['period_unclosed'],
+        }
+    if testers is not None:
+        data['testers'] = testers
+    return data
+
+
+def get_task_statistics(date_from=None, date_to=None, by_tester: bool = False) -> dict:
+    """带缓存的任务统计；缓存键包含本周/本月起始日，跨周、跨月后自然失效"""
+    week, month = current_week_month()
+    key = STATISTICS_KEY.format(
+        version=_current_version(),
+        week=week[0].strftime('%Y%m%d'),
+        month=month[0].strftime('%Y%m'),
+        start=date_from.isoformat() if date_from else '',
+        end=date_to.isoformat() if date_to else '',
+        by_tester=int(bool(by_tester)),
+    )
+    data = cache.get(key)
+    if data is None:
+        data = compute_task_statistics(date_from, date_to, by_tester)
+        cache.set(key, data, STATISTICS_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,599 @@
+import io
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Q
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from openpyxl import Workbook, load_workbook
+from PIL import Image
+
+from utils.pagination import InvalidCursor, keyset_paginate
+from utils.xlsx_stream import iter_workbook
+
+from . import images, search, services, statistics
+from .models import STATUS_DRAFT, STATUS_SUBMITTED, DocApproval, EntryExit, MainRecord, TestInfo, TestProcessAttachment
+from .serializers import TestInfoSerializer, TestProcessAttachmentSerializer
+
+
+BASE_TIME = timezone.make_aware(datetime(2025, 1, 1, 9, 0))
+
+
+def create_main(**kwargs):
+    values = {
+        'model': 'A1',
+        'vin_or_part_no': 'VIN001',
+        'test_name': '整车噪声',
+        'warning_system_status': '无需',
+        'requester_name': '张三',
+        'schedule_start': BASE_TIME,
+    }
+    values.update(kwargs)
+    return MainRecord.objects.create(**values)
+
+
+# 子表状态：不存在 / 草稿 / 已提交 / 已提交但已删除
+FORM_STATES = ['missing', 'draft', 'submitted', 'deleted']
+
+
+def _form_values(state):
+    return {
+        'status': STATUS_DRAFT if state == 'draft' else STATUS_SUBMITTED,
+        'is_deleted': state == 'deleted',
+    }
+
+
+def legacy_is_closed(main: MainRecord) -> bool:
+    """原逐行闭环判断（重构为 closure_condition 之前的实现），用于对照"""
+    def form_ok(form):
+        return form is not None and not form.is_deleted and form.status == STATUS_SUBMITTED
+
+    entry_exit_ok = form_ok(EntryExit.all_objects.filter(pk=main.entry_exit_id).first())
+    test_info_ok = form_ok(TestInfo.all_objects.filter(main_id=main.pk).first())
+    doc_approval_ok = form_ok(DocApproval.all_objects.filter(main_id=main.pk).first())
+
+    task_scenario = main.task_scenario or "NORMAL"
+    if task_scenario == "CANCEL_NO_SAMPLE":
+        return True
+    if task_scenario == "CANCEL_WITH_SAMPLE":
+        return entry_exit_ok
+    if main.doc_requirement:
+        return entry_exit_ok and test_info_ok and doc_approval_ok
+    return entry_exit_ok and test_info_ok
+
+
+# ==================== 闭环判断 ====================
+
+class ClosureConditionTests(TestCase):
+    """closure_condition 与原逐行判断逐条一致"""
+
+    @classmethod
+    def setUpTestData(cls):
+        scenarios = ['NORMAL', 'CANCEL_WITH_SAMPLE', 'CANCEL_NO_SAMPLE', 'OTHER']
+        combinations = itertools.product(scenarios, [False, True], FORM_STATES, FORM_STATES, FORM_STATES)
+        for index, (scenario, doc_requirement, ee_state, ti_state, da_state) in enumerate(combinations):
+            entry_exit = None
+            if ee_state != 'missing':
+                entry_exit = EntryExit.all_objects.create(**_form_values(ee_state))
+            main = create_main(
+                vin_or_part_no=f'VIN{index:04d}',
+                task_scenario=scenario,
+                doc_requirement=doc_requirement,
+                entry_exit=entry_exit,
+                # 初始值与规则结果无关，确保 UPDATE 会覆盖
+                is_closed=index % 2 == 0,
+            )
+            if ti_state != 'missing':
+                TestInfo.all_objects.create(main=main, **_form_values(ti_state))
+            if da_state != 'missing':
+                DocApproval.all_objects.create(main=main, **_form_values(da_state))
+
+    def test_refresh_closed_matches_legacy_rules(self):
+        updated = services.refresh_closed(MainRecord.all_objects.all())
+        self.assertEqual(updated, MainRecord.all_objects.count())
+        for main in MainRecord.all_objects.all():
+            with self.subTest(vin=main.vin_or_part_no, scenario=main.task_scenario):
+                self.assertEqual(main.is_closed, legacy_is_closed(main))
+                self.assertIsNotNone(main.closure_checked_at)
+
+    def test_filter_by_condition_matches_legacy_rules(self):
+        closed_ids = set(MainRecord.all_objects.filter(services.closure_condition()).values_list('pk', flat=True))
+        expected = {main.pk for main in MainRecord.all_objects.all() if legacy_is_closed(main)}
+        self.assertEqual(closed_ids, expected)
+
+    def test_refresh_main_closed_updates_instance(self):
+        main = MainRecord.all_objects.filter(task_scenario='CANCEL_NO_SAMPLE', is_closed=False).first()
+        services.refresh_main_closed(main)
+        self.assertTrue(main.is_closed)
+
+    def test_refresh_by_entry_exit_only_touches_linked_records(self):
+        entry_exit = EntryExit.all_objects.create(status=STATUS_DRAFT)
+        linked = create_main(vin_or_part_no='LINKED', task_scenario='CANCEL_WITH_SAMPLE', entry_exit=entry_exit)
+        other = create_main(vin_or_part_no='OTHER', task_scenario='CANCEL_NO_SAMPLE')
+
+        entry_exit.status = STATUS_SUBMITTED
+        entry_exit.save()
+        self.assertEqual(services.refresh_mains_closed_by_entry_exit(entry_exit), 1)
+
+        linked.refresh_from_db()
+        other.refresh_from_db()
+        self.assertTrue(linked.is_closed)
+        self.assertFalse(other.is_closed)
+        self.assertIsNone(other.closure_checked_at)
+
+    def test_rebuild_closed_reports_progress(self):
+        total = MainRecord.all_objects.count()
+        progress = list(services.rebuild_closed(batch_size=100))
+        self.assertEqual(progress[-1], (total, total))
+        for main in MainRecord.all_objects.all():
+            self.assertEqual(main.is_closed, legacy_is_closed(main))
+
+
+# ==================== 游标分页 ====================
+
+class KeysetPaginationTests(TestCase):
+    """排序键含 NULL 时逐页遍历与一次性查询结果一致，且不重复、不遗漏"""
+
+    @classmethod
+    def setUpTestData(cls):
+        testers = [None, '李四', '王五']
+        assistants = [None, '', '赵六']
+        for index, (tester, assistant) in enumerate(itertools.product(testers, assistants)):
+            for offset in (0, 1):
+                create_main(
+                    vin_or_part_no=f'VIN{index}-{offset}',
+                    schedule_start=BASE_TIME + timedelta(days=offset),
+                    tester_name=tester,
+                    assistants=assistant,
+                )
+        enter_times = [None, BASE_TIME, BASE_TIME, None, BASE_TIME + timedelta(hours=1), None]
+        for enter_time in enter_times:
+            EntryExit.objects.create(enter_time=enter_time)
+
+    def walk(self, queryset, page_size):
+        pages = []
+        cursor = None
+        while True:
+            items, cursor = keyset_paginate(queryset, cursor, page_size)
+            pages.append([item.pk for item in items])
+            if cursor is None:
+                return pages
+
+    def assert_walk_matches(self, queryset):
+        expected = list(queryset.values_list('pk', flat=True))
+        for page_size in (1, 2, 3, 5, len(expected), len(expected) + 1):
+            with self.subTest(page_size=page_size):
+                pages = self.walk(queryset, page_size)
+                self.assertEqual([pk for page in pages for pk in page], expected)
+                self.assertTrue(all(len(page) == page_size for page in pages[:-1]))
+
+    def test_main_record_ordering_with_nullable_keys(self):
+        self.assert_walk_matches(
+            MainRecord.objects.order_by('-schedule_start', 'tester_name', 'assistants', '-id')
+        )
+
+    def test_descending_nullable_key(self):
+        self.assert_walk_matches(EntryExit.objects.order_by('-enter_time', '-id'))
+        self.assert_walk_matches(EntryExit.objects.order_by('enter_time', 'id'))
+
+    def test_last_page_has_no_cursor(self):
+        queryset = MainRecord.objects.order_by('-schedule_start', '-id')
+        items, cursor = keyset_paginate(queryset, None, queryset.count())
+        self.assertEqual(len(items), queryset.count())
+        self.assertIsNone(cursor)
+
+    def test_tampered_cursor_is_rejected(self):
+        queryset = MainRecord.objects.order_by('-schedule_start', '-id')
+        _, cursor = keyset_paginate(queryset, None, 2)
+        with self.assertRaises(InvalidCursor):
+            keyset_paginate(queryset, cursor[:-2] + 'xx', 2)
+        # 排序方式变化后旧游标失效
+        with self.assertRaises(InvalidCursor):
+            keyset_paginate(MainRecord.objects.order_by('tester_name', 'assistants', '-id'), cursor, 2)
+
+    def test_ordering_must_end_with_id(self):
+        with self.assertRaises(ValueError):
+            keyset_paginate(MainRecord.objects.order_by('-schedule_start'), None, 2)
+
+    def test_list_endpoint_cursor_mode(self):
+        url = '/api/nvh-task/main-records/'
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 4, 'with_total': 'true'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(len(data['items']), 4)
+        self.assertTrue(data['has_more'])
+        self.assertEqual(data['total'], MainRecord.objects.count())
+
+        response = self.client.get(url, {'pagination': 'cursor', 'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 400)
+
+
+# ==================== 文本检索 ====================
+
+class SearchTokenTests(TestCase):
+    """经词元表的模糊筛选与 icontains 结果一致"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rows = [
+            ('A1-Pro', 'LFV3A23C1234', '整车路噪测试', '张三', '李四'),
+            ('a1', 'lfv3a23c9999', '路噪复测', '张三丰', None),
+            ('B2', 'PART-001', '悬置隔振', '王五', '李四'),
+            ('B2 EV', 'PART-002', '整车 NVH', '赵六', ''),
+        ]
+        for model, vin, test_name, requester, tester in rows:
+            create_main(model=model, vin_or_part_no=vin, test_name=test_name,
+                        requester_name=requester, tester_name=tester)
+
+    def assert_same_as_icontains(self, field, term):
+        expected = set(MainRecord.objects.filter(**{f'{field}__icontains': term}).values_list('pk', flat=True))
+        actual = set(search.filter_text(MainRecord.objects.all(), field, term).values_list('pk', flat=True))
+        self.assertEqual(actual, expected, f'{field}={term!r}')
+
+    def test_terms_match_icontains(self):
+        cases = {
+            'model': ['a', 'A1', 'a1-p', 'B2 E', ' ', 'X'],
+            'vin_or_part_no': ['LFV', '23c', 'PART-00', '-', '9999', '12349'],
+            'test_name': ['整', '路噪', '整车路噪', '车 N', '隔振测'],
+            'requester_name': ['张三', '三丰', '张'],
+            'tester_name': ['李', '李四', '四'],
+        }
+        for field, terms in cases.items():
+            for term in terms:
+                with self.subTest(field=field, term=term):
+                    self.assert_same_as_icontains(field, term)
+
+    def test_tokens_follow_updates(self):
+        main = MainRecord.objects.get(vin_or_part_no='PART-001')
+        main.test_name = '模态测试'
+        main.save()
+        self.assert_same_as_icontains('test_name', '隔振')
+        self.assert_same_as_icontains('test_name', '模态')
+        self.assertTrue(search.filter_text(MainRecord.objects.all(), 'test_name', '模态').filter(pk=main.pk).exists())
+
+    def test_rebuild_restores_missing_tokens(self):
+        # 批量写入绕过 save() 时词元缺失，重建后恢复
+        MainRecord.objects.filter(vin_or_part_no='PART-002').update(test_name='声学包')
+        self.assertFalse(search.filter_text(MainRecord.objects.all(), 'test_name', '声学').exists())
+        list(search.rebuild_search_index(batch_size=2))
+        self.assert_same_as_icontains('test_name', '声学')
+        self.assert_same_as_icontains('test_name', '整车')
+
+    def test_apply_text_filters_combines_fields(self):
+        queryset = search.apply_text_filters(MainRecord.objects.all(), {'model': 'a1', 'tester_name': '李', 'vin_or_part_no': ''})
+        self.assertEqual(list(queryset.values_list('vin_or_part_no', flat=True)), ['LFV3A23C1234'])
+
+
+# ==================== Excel 导出 ====================
+
+def build_sample_workbook(rows):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('数据')
+    for index in range(rows):
+        ws.append([index, f'第{index}行', uuid.uuid4().hex])
+    return wb
+
+
+class StreamWorkbookTests(TestCase):
+    """iter_workbook 分块输出完整工作簿，构建异常在响应线程抛出"""
+
+    def test_chunks_form_complete_workbook(self):
+        chunks = list(iter_workbook(lambda: build_sample_workbook(5000)))
+        self.assertGreater(len(chunks), 1)
+        sheet = load_workbook(io.BytesIO(b''.join(chunks)), read_only=True)['数据']
+        rows = list(sheet.values)
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual(rows[-1][:2], (4999, '第4999行'))
+
+    def test_build_error_raised_in_consumer(self):
+        def build():
+            raise ValueError('构建失败')
+
+        with self.assertRaisesMessage(ValueError, '构建失败'):
+            list(iter_workbook(build))
+
+    def test_closing_response_stops_producer(self):
+        names = set()
+
+        def build():
+            names.add(threading.current_thread().name)
+            return build_sample_workbook(20000)
+
+        stream = iter_workbook(build, thread_name='xlsx-test-export')
+        next(stream)
+        stream.close()
+        producers = [thread for thread in threading.enumerate() if thread.name in names]
+        for thread in producers:
+            thread.join(timeout=10)
+            self.assertFalse(thread.is_alive())
+
+
+class ExportEndpointTests(TransactionTestCase):
+    """工作簿在后台线程中查询，测试数据需已提交"""
+
+    def test_export_endpoint_applies_filters(self):
+        create_main(model='A1', vin_or_part_no='EXPORT-1')
+        create_main(model='B2', vin_or_part_no='EXPORT-2')
+        response = self.client.get('/api/nvh-task/main-records/export/', {'model': 'a1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("filename*=UTF-8''%E8%AF%95", response['Content-Disposition'])
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        values = [cell for row in sheet.iter_rows(values_only=True) for cell in row]
+        self.assertIn('EXPORT-1', values)
+        self.assertNotIn('EXPORT-2', values)
+
+
+# ==================== 任务统计 ====================
+
+def local_time(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'nvh-task-statistics'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TaskStatisticsTests(TestCase):
+    """条件 Count 聚合与逐项 filter().count() 一致；排期区间含结束当天"""
+
+    # 2025-01-15 为周三：本周 [01-13, 01-20)，本月 [01-01, 02-01)
+    NOW = local_time(2025, 1, 15, 12, 0)
+    WEEK = (local_time(2025, 1, 13), local_time(2025, 1, 20))
+    MONTH = (local_time(2025, 1, 1), local_time(2025, 2, 1))
+    PERIOD = (local_time(2025, 1, 10), local_time(2025, 1, 21))
+
+    @classmethod
+    def setUpTestData(cls):
+        rows = [
+            (local_time(2024, 12, 31, 23, 59), '张三', False),
+            (local_time(2025, 1, 9, 23, 59), '张三', True),
+            (local_time(2025, 1, 10), None, False),
+            (local_time(2025, 1, 13), '', True),
+            (local_time(2025, 1, 19, 23, 59), '李四', False),
+            (local_time(2025, 1, 20), '张三', True),
+            (local_time(2025, 1, 20, 23, 30), '李四', False),
+            (local_time(2025, 1, 21), None, True),
+        ]
+        for index, (schedule_start, tester, closed) in enumerate(rows):
+            create_main(vin_or_part_no=f'STAT-{index}', schedule_start=schedule_start,
+                        tester_name=tester, is_closed=closed)
+        deleted = create_main(vin_or_part_no='STAT-DELETED', schedule_start=local_time(2025, 1, 14),
+                              tester_name='张三', is_closed=True)
+        deleted.soft_delete()
+
+    def setUp(self):
+        cache.clear()
+
+    def reference_counts(self, tester_q=Q()):
+        def count(bounds=None, **filters):
+            queryset = MainRecord.objects.filter(tester_q, **filters)
+            if bounds is not None:
+                queryset = queryset.filter(schedule_start__gte=bounds[0], schedule_start__lt=bounds[1])
+            return queryset.count()
+
+        return {
+            'total_tasks': count(),
+            'month_tasks': count(self.MONTH),
+            'week_tasks': count(self.WEEK),
+            'week_closed': count(self.WEEK, is_closed=True),
+            'week_unclosed': count(self.WEEK, is_closed=False),
+            'period_tasks': count(self.PERIOD),
+            'period_closed': count(self.PERIOD, is_closed=True),
+            'period_unclosed': count(self.PERIOD, is_closed=False),
+        }
+
+    def compute(self, **kwargs):
+        return statistics.compute_task_statistics(now=self.NOW, **kwargs)
+
+    def test_counts_match_filter_count(self):
+        expected = self.reference_counts()
+        with self.assertNumQueries(1):
+            data = self.compute(date_from=date(2025, 1, 10), date_to=date(2025, 1, 20))
+        for field in statistics.COUNT_FIELDS:
+            self.assertEqual(data[field], expected[field], field)
+        period = data['period']
+        self.assertEqual([period['tasks'], period['closed'], period['unclosed']],
+                         [expected['period_tasks'], expected['period_closed'], expected['period_unclosed']])
+        # 已删除记录不计入；本周不含下周一 00:00
+        self.assertEqual(data['total_tasks'], 8)
+        self.assertEqual(data['week_tasks'], 2)
+        self.assertNotIn('testers', data)
+
+    def test_period_end_date_inclusive(self):
+        period = self.compute(date_from=date(2025, 1, 10), date_to=date(2025, 1, 20))['period']
+        # 01-10 00:00 与 01-20 23:30 计入，01-09 23:59 与 01-21 00:00 不计入
+        self.assertEqual(period, {'start': '2025-01-10', 'end': '2025-01-20', 'tasks': 5, 'closed': 2, 'unclosed': 3})
+        self.assertEqual(self.compute(date_to=date(2025, 1, 9))['period']['tasks'], 2)
+        self.assertEqual(self.compute(date_from=date(2025, 1, 21))['period']['tasks'], 1)
+        self.assertNotIn('period', self.compute())
+
+    def test_by_tester_merges_blank_names(self):
+        with self.assertNumQueries(1):
+            data = self.compute(date_from=date(2025, 1, 10), date_to=date(2025, 1, 20), by_tester=True)
+        testers = {item['tester_name']: item for item in data['testers']}
+        self.assertEqual(list(testers), ['', '张三', '李四'])
+        tester_qs = {
+            '': Q(tester_name__isnull=True) | Q(tester_name=''),
+            '张三': Q(tester_name='张三'),
+            '李四': Q(tester_name='李四'),
+        }
+        for name, tester_q in tester_qs.items():
+            group = testers.pop(name)
+            group.pop('tester_name')
+            self.assertEqual(group, self.reference_counts(tester_q), name)
+
+        totals = self.compute(date_from=date(2025, 1, 10), date_to=date(2025, 1, 20))
+        self.assertEqual({field: data[field] for field in statistics.COUNT_FIELDS},
+                         {field: totals[field] for field in statistics.COUNT_FIELDS})
+        self.assertEqual(data['period'], totals['period'])
+
+    def test_save_invalidates_cache_after_commit(self):
+        total = statistics.get_task_statistics()['total_tasks']
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            create_main(vin_or_part_no='STAT-NEW')
+        # 提交前仍返回缓存结果
+        self.assertEqual(statistics.get_task_statistics()['total_tasks'], total)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(statistics.get_task_statistics()['total_tasks'], total + 1)
+
+    def test_refresh_closed_invalidates_cache(self):
+        main = create_main(vin_or_part_no='STAT-CANCEL', schedule_start=timezone.now(), task_scenario='CANCEL_NO_SAMPLE')
+        cache.clear()
+        before = statistics.get_task_statistics()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(services.refresh_closed(MainRecord.objects.filter(pk=main.pk)), 1)
+        after = statistics.get_task_statistics()
+        self.assertEqual(after['week_closed'], before['week_closed'] + 1)
+        self.assertEqual(after['week_unclosed'], before['week_unclosed'] - 1)
+
+
+# ==================== 进出登记列表 ====================
+
+class EntryExitSummaryTests(TestCase):
+    """引用主记录摘要以注解取得：仅统计未删除主记录，列表查询次数与行数无关"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.shared = EntryExit.objects.create(receiver_name='张三', enter_time=BASE_TIME)
+        cls.orphaned = EntryExit.objects.create(receiver_name='李四', enter_time=BASE_TIME - timedelta(days=1))
+        cls.unlinked = EntryExit.objects.create(receiver_name='王五', enter_time=BASE_TIME - timedelta(days=2))
+        create_main(model='DEL', vin_or_part_no='VIN-DELETED', entry_exit=cls.shared).soft_delete()
+        create_main(model='A1', vin_or_part_no='VIN-FIRST', entry_exit=cls.shared)
+        create_main(model='B2', vin_or_part_no='VIN-SECOND', entry_exit=cls.shared)
+        create_main(model='C3', vin_or_part_no='VIN-ORPHANED', entry_exit=cls.orphaned).soft_delete()
+
+    def test_summary_excludes_deleted_main_records(self):
+        rows = {
+            row.pk: (row.main_record_model, row.main_record_vin_or_part_no, row.active_main_count)
+            for row in EntryExit.objects.with_main_record_summary()
+        }
+        self.assertEqual(rows, {
+            self.shared.pk: ('A1', 'VIN-FIRST', 2),
+            self.orphaned.pk: (None, None, 0),
+            self.unlinked.pk: (None, None, 0),
+        })
+
+    def test_list_page_in_constant_queries(self):
+        # 页码分页：总数 1 次 + 本页 1 次
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/nvh-task/entry-exits/all/')
+        self.assertEqual(response.status_code, 200)
+        items = response.json()['data']['items']
+        summary = [(item['id'], item['model'], item['vin_or_part_no'], item['active_mainrecord_count']) for item in items]
+        self.assertEqual(summary, [
+            (self.shared.pk, 'A1', 'VIN-FIRST', 2),
+            (self.orphaned.pk, '', '', 0),
+            (self.unlinked.pk, '', '', 0),
+        ])
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/nvh-task/entry-exits/all/', {'pagination': 'cursor'})
+        self.assertEqual(len(response.json()['data']['items']), 3)
+
+
+# ==================== 附件衍生图 ====================
+
+PNG_NAME = 'nvh_task/nvh_test_process/sample.png'
+JPEG_NAME = 'nvh_task/nvh_test_info/sample.jpg'
+
+
+class ImageVariantTests(TestCase):
+    """衍生图写入临时 MEDIA_ROOT：尺寸、格式、跳过已存在与序列化回退"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        self.save_image(PNG_NAME, Image.new('RGBA', (2400, 1200), (255, 0, 0, 128)), 'PNG')
+        self.save_image(JPEG_NAME, Image.new('RGB', (800, 2400), (0, 128, 255)), 'JPEG')
+
+    def save_image(self, name, image, image_format):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image.save(path, image_format)
+
+    def open_variant(self, name, variant):
+        return Image.open(os.path.join(self.media_root, images.variant_path(name, variant)))
+
+    def test_variant_path(self):
+        self.assertEqual(images.variant_path(PNG_NAME, 'thumbnail'), 'nvh_task/nvh_test_process/_variants/sample_thumbnail.webp')
+        self.assertEqual(images.variant_path('sample.jpg', 'webp'), '_variants/sample_webp.webp')
+
+    def test_sizes_and_format(self):
+        for name, size, mode in [(PNG_NAME, (2400, 1200), 'RGBA'), (JPEG_NAME, (800, 2400), 'RGB')]:
+            with self.subTest(name=name):
+                self.assertEqual(images.generate_variants(name), 2)
+                for variant, longest in images.VARIANTS.items():
+                    with self.open_variant(name, variant) as image:
+                        self.assertEqual(image.format, 'WEBP')
+                        self.assertEqual(image.mode, mode)
+                        self.assertEqual(max(image.size), longest)
+                        # 保持宽高比
+                        self.assertAlmostEqual(image.size[0] / image.size[1], size[0] / size[1], places=1)
+
+    def test_existing_variants_skipped_unless_overwrite(self):
+        self.assertEqual(images.generate_variants(PNG_NAME), 2)
+        self.assertEqual(images.generate_variants(PNG_NAME), 0)
+
+        os.remove(os.path.join(self.media_root, images.variant_path(PNG_NAME, 'thumbnail')))
+        webp_path = os.path.join(self.media_root, images.variant_path(PNG_NAME, 'webp'))
+        mtime = os.stat(webp_path).st_mtime_ns
+        self.assertEqual(images.generate_variants(PNG_NAME), 1)
+        self.assertEqual(os.stat(webp_path).st_mtime_ns, mtime)
+
+        self.assertEqual(images.generate_variants(PNG_NAME, overwrite=True), 2)
+        self.assertFalse(any(name.endswith('.tmp') for name in os.listdir(os.path.dirname(webp_path))))
+
+    def test_serializer_falls_back_to_original(self):
+        test_info = TestInfo.objects.create(main=create_main(), teardown_attachment_url=JPEG_NAME)
+        attachment = TestProcessAttachment.objects.create(test_info=test_info, record_name='过程记录', file_url=PNG_NAME)
+
+        data = TestProcessAttachmentSerializer(attachment).data
+        self.assertEqual((data['file_thumbnail_url'], data['file_webp_url']), (PNG_NAME, PNG_NAME))
+
+        images.generate_variants(PNG_NAME)
+        data = TestProcessAttachmentSerializer(attachment).data
+        self.assertEqual(data['file_thumbnail_url'], images.variant_path(PNG_NAME, 'thumbnail'))
+        self.assertEqual(data['file_webp_url'], images.variant_path(PNG_NAME, 'webp'))
+
+        data = TestInfoSerializer(test_info).data
+        self.assertEqual(data['teardown_attachment_thumbnail_url'], JPEG_NAME)
+        test_info.teardown_attachment_url = ''
+        data = TestInfoSerializer(test_info).data
+        self.assertEqual((data['teardown_attachment_thumbnail_url'], data['teardown_attachment_webp_url']), ('', ''))
+
+    def test_command_counts_missing_originals(self):
+        test_info = TestInfo.objects.create(main=create_main(), teardown_attachment_url=JPEG_NAME)
+        TestProcessAttachment.objects.create(test_info=test_info, record_name='过程记录', file_url=PNG_NAME)
+        DocApproval.objects.create(main=create_main(vin_or_part_no='VIN002'), file_url='nvh_task/nvh_doc/missing.png')
+
+        out = io.StringIO()
+        call_command('generate_task_image_variants', stdout=out)
+        self.assertIn('生成 4 张衍生图，原图缺失 1 张，失败 0 张', out.getvalue())
+
+        out = io.StringIO()
+        call_command('generate_task_image_variants', stdout=out)
+        self.assertIn('生成 0 张衍生图，原图缺失 1 张', out.getvalue())
+
+        out = io.StringIO()
+        call_command('generate_task_image_variants', '--overwrite', stdout=out)
+        self.assertIn('生成 4 张衍生图', out.getvalue())
@@ -4,26 +4,21 @@ NVH Task Views
 import os
 import uuid
 import shutil
+from urllib.parse import quote
 from datetime import datetime, timedelta
-from io import BytesIO
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
 from django.db.models.functions import TruncDate
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 
-try:
-    import openpyxl
-    from openpyxl.styles import Font, Alignment, Border, Side
-    HAS_OPENPYXL = True
-except ImportError:
-    HAS_OPENPYXL = False
-
+from utils.pagination import InvalidCursor, cached_count, keyset_paginate
 from utils.response import Response
+from utils.xlsx_stream import XLSX_CONTENT_TYPE, iter_workbook
 from .models import (
     MainRecord, EntryExit, TestInfo, DocApproval,
     TestProcessAttachment, TestProcessList, STATUS_DRAFT, CommonRequester
@@ -33,7 +28,7 @@ from .serializers import (
     EntryExitSerializer, TestInfoSerializer, DocApprovalSerializer,
     TestProcessAttachmentSerializer, TestProcessListSerializer, CommonRequesterSerializer
 )
-from . import services
+from . import exports, images, search, services, statistics
 
 
 # ==================== 文件上传常量 ====================
@@ -95,6 +90,9 @@ def confirm_file_upload(temp_path: str, upload_type: str) -> str:
     if os.path.exists(src_path):
         shutil.move(src_path, dest_path)
 
+    # 后台生成缩略图与 WebP 衍生图
+    images.schedule_variants(final_relative_path)
+
     return final_relative_path
 
 
@@ -137,6 +135,27 @@ def paginate_queryset(queryset, page, page_size):
     return items, total
 
 
+def paginate_list(request, queryset):
+    """
+    按请求参数分页，返回 (本页记录, 分页信息)
+
+    默认页码分页：分页信息为 total/page/page_size。
+    pagination=cursor 时使用游标分页（翻页代价与页码无关）：cursor 为上一页返回的 next_cursor，
+    首页不传；分页信息为 next_cursor/has_more/page_size，with_total=true 时附带 total（短时缓存）。
+    游标无效时抛出 InvalidCursor。
+    """
+    page, page_size = get_pagination_params(request)
+    if request.GET.get('pagination') != 'cursor':
+        items, total = paginate_queryset(queryset, page, page_size)
+        return items, {'total': total, 'page': page, 'page_size': page_size}
+
+    items, next_cursor = keyset_paginate(queryset, request.GET.get('cursor'), page_size)
+    meta = {'next_cursor': next_cursor, 'has_more': next_cursor is not None, 'page_size': page_size}
+    if (request.GET.get('with_total') or '').lower() in ['true', '1', 'yes']:
+        meta['total'] = cached_count(queryset)
+    return items, meta
+
+
 # ==================== MainRecord 视图 ====================
 
 @api_view(['GET', 'POST'])
@@ -149,20 +168,8 @@ def main_record_list(request):
             'entry_exit', 'test_info', 'doc_approval'
         ).order_by('-schedule_start', 'tester_name', 'assistants', '-id')
 
-        # 筛选：车型
-        model_filter = request.GET.get('model')
-        if model_filter:
-            queryset = queryset.filter(model__icontains=model_filter)
-
-        # 筛选：VIN/零件编号
-        vin = request.GET.get('vin_or_part_no')
-        if vin:
-            queryset = queryset.filter(vin_or_part_no__icontains=vin)
-
-        # 筛选：试验名称
-        test_name = request.GET.get('test_name')
-        if test_name:
-            queryset = queryset.filter(test_name__icontains=test_name)
+        # 筛选：车型 / VIN/零件编号 / 试验名称 / 任务提出人 / 测试人员（模糊匹配，经检索词元表缩小范围）
+        queryset = search.apply_text_filters(queryset, request.GET)
 
         # 筛选：加入预警系统状态
         warning_status = request.GET.get('warning_system_status')
@@ -179,16 +186,6 @@ def main_record_list(request):
                 # 无内容：null或空字符串
                 queryset = queryset.filter(Q(contract_no__isnull=True) | Q(contract_no__exact=''))
 
-        # 筛选：任务提出人
-        requester = request.GET.get('requester_name')
-        if requester:
-            queryset = queryset.filter(requester_name__icontains=requester)
-
-        # 筛选：测试人员
-        tester = request.GET.get('tester_name')
-        if tester:
-            queryset = queryset.filter(tester_name__icontains=tester)
-
         # 筛选：是否闭环
         is_closed = request.GET.get('is_closed')
         if is_closed is not None and is_closed != '':
@@ -233,17 +230,14 @@ def main_record_list(request):
                 pass  # 日期格式错误时忽略该筛选条件
 
         # 分页
-        page, page_size = get_pagination_params(request)
-        items, total = paginate_queryset(queryset, page, page_size)
+        try:
+            items, pagination = paginate_list(request, queryset)
+        except InvalidCursor as e:
+            return Response.bad_request(message=str(e))
 
         serializer = MainRecordListSerializer(items, many=True)
         return Response.success(
-            data={
-                'items': serializer.data,
-                'total': total,
-                'page': page,
-                'page_size': page_size,
-            },
+            data={'items': serializer.data, **pagination},
             message='获取任务列表成功'
         )
 
@@ -307,7 +301,7 @@ def main_record_detail(request, pk):
 def entry_exit_list(request):
     """进出登记列表 / 创建"""
     if request.method == 'GET':
-        queryset = EntryExit.objects.order_by('-created_at', '-id')
+        queryset = EntryExit.objects.with_main_record_summary().order_by('-created_at', '-id')
 
         # 筛选：处置类型 dispose_type
         dispose_type = request.GET.get('dispose_type')
@@ -319,17 +313,14 @@ def entry_exit_list(request):
         if receiver:
             queryset = queryset.filter(receiver_name__icontains=receiver)
 
-        page, page_size = get_pagination_params(request)
-        items, total = paginate_queryset(queryset, page, page_size)
+        try:
+            items, pagination = paginate_list(request, queryset)
+        except InvalidCursor as e:
+            return Response.bad_request(message=str(e))
 
         serializer = EntryExitSerializer(items, many=True)
         return Response.success(
-            data={
-                'items': serializer.data,
-                'total': total,
-                'page': page,
-                'page_size': page_size,
-            },
+            data={'items': serializer.data, **pagination},
             message='获取进出登记列表成功'
         )
 
@@ -346,7 +337,8 @@ def entry_exit_list(request):
 @permission_classes([AllowAny])
 def entry_exit_all_list(request):
     """获取所有进出登记记录（用于记录管理，包含关联的主记录信息）"""
-    queryset = EntryExit.objects.prefetch_related('main_records').order_by('-enter_time', '-id')
+    # 引用主记录的车型/VIN 及数量以子查询与 Count 注解在同一条查询中取得
+    queryset = EntryExit.objects.with_main_record_summary().order_by('-enter_time', '-id')
 
     # 筛选：接收人
     receiver = request.GET.get('receiver_name')
@@ -358,29 +350,19 @@ def entry_exit_all_list(request):
     if dispose_type:
         queryset = queryset.filter(dispose_type=dispose_type)
 
-    page, page_size = get_pagination_params(request)
-    items, total = paginate_queryset(queryset, page, page_size)
+    try:
+        items, pagination = paginate_list(request, queryset)
+    except InvalidCursor as e:
+        return Response.bad_request(message=str(e))
 
-    # 构建返回数据，包含关联的主记录信息
-    result_items = []
-    for entry_exit in items:
-        # 获取第一个关联的主记录（用于显示型号和VIN）
-        main_record = entry_exit.main_records.first()
-        
-        item_data = EntryExitSerializer(entry_exit).data
-        item_data['model'] = main_record.model if main_record else ''
-        item_data['vin_or_part_no'] = main_record.vin_or_part_no if main_record else ''
-        item_data['active_mainrecord_count'] = entry_exit.active_mainrecord_count()
-        
-        result_items.append(item_data)
+    # 构建返回数据，包含关联的主记录信息（无关联主记录时型号和VIN为空字符串）
+    result_items = EntryExitSerializer(items, many=True).data
+    for item_data in result_items:
+        item_data['model'] = item_data['model'] or ''
+        item_data['vin_or_part_no'] = item_data['vin_or_part_no'] or ''
 
     return Response.success(
-        data={
-            'items': result_items,
-            'total': total,
-            'page': page,
-            'page_size': page_size,
-        },
+        data={'items': result_items, **pagination},
         message='获取进出登记记录列表成功'
     )
 
@@ -807,60 +789,26 @@ def get_task_statistics(request):
     """
     获取任务统计数据
     返回：总任务数、本月任务数、本周任务数、本周已闭环数、本周未闭环数
+    可选参数：
+        schedule_start_from / schedule_start_to: 自定义排期区间（YYYY-MM-DD，含当天），返回 period 统计
+        by_tester: 为 true 时返回 testers 按测试人员分组的统计
     """
-    now = timezone.localtime(timezone.now())
+    dates = {}
+    for param in ('schedule_start_from', 'schedule_start_to'):
+        value = request.GET.get(param)
+        if value:
+            try:
+                dates[param] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                return Response.bad_request(message=f'{param} 日期格式应为 YYYY-MM-DD')
+    by_tester = (request.GET.get('by_tester') or '').lower() in ['true', '1', 'yes']
 
-    # 获取本周的开始和结束时间（周一到周日）
-    week_start = now - timedelta(days=now.weekday())  # 本周一
-    week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_end = week_start + timedelta(days=7)  # 下周一
-    
-    # 获取本月的开始和结束时间
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    if now.month == 12:
-        month_end = month_start.replace(year=now.year + 1, month=1)
-    else:
-        month_end = month_start.replace(month=now.month + 1)
-    
-    # 总任务数
-    total_tasks = MainRecord.objects.count()
-    
-    # 本月任务数（排期开始时间在本月内）
-    month_tasks = MainRecord.objects.filter(
-        schedule_start__gte=month_start,
-        schedule_start__lt=month_end
-    ).count()
-    
-    # 本周任务数（排期开始时间在本周内）
-    week_tasks = MainRecord.objects.filter(
-        schedule_start__gte=week_start,
-        schedule_start__lt=week_end
-    ).count()
-    
-    # 本周已闭环任务数
-    week_closed = MainRecord.objects.filter(
-        schedule_start__gte=week_start,
-        schedule_start__lt=week_end,
-        is_closed=True
-    ).count()
-    
-    # 本周未闭环任务数
-    week_unclosed = MainRecord.objects.filter(
-        schedule_start__gte=week_start,
-        schedule_start__lt=week_end,
-        is_closed=False
-    ).count()
-    
-    return Response.success(
-        data={
-            'total_tasks': total_tasks,
-            'month_tasks': month_tasks,
-            'week_tasks': week_tasks,
-            'week_closed': week_closed,
-            'week_unclosed': week_unclosed
-        },
-        message='获取统计数据成功'
+    data = statistics.get_task_statistics(
+        date_from=dates.get('schedule_start_from'),
+        date_to=dates.get('schedule_start_to'),
+        by_tester=by_tester,
     )
+    return Response.success(data=data, message='获取统计数据成功')
 
 
 @api_view(['GET'])
@@ -868,194 +816,19 @@ def get_task_statistics(request):
 def export_main_records(request):
     """
     导出主记录列表为 Excel 文件
-    支持与列表查询一致的筛选条件
+    支持与列表查询一致的筛选条件；工作簿以只写模式生成并分块流式返回
+    页面导出走后台导出任务（/api/export-jobs/，kind=nvh_task.main_records），此接口保留供脚本直接下载
     """
-    if not HAS_OPENPYXL:
+    if not exports.HAS_OPENPYXL:
         return Response.bad_request(message='服务器未安装 openpyxl 库，无法导出 Excel')
-    
-    # 复用列表查询的筛选逻辑
-    queryset = MainRecord.objects.select_related(
-        'entry_exit', 'test_info', 'doc_approval'
-    ).order_by('tester_name', '-schedule_start', '-id')
-
-    # 筛选：车型
-    model_filter = request.GET.get('model')
-    if model_filter:
-        queryset = queryset.filter(model__icontains=model_filter)
-
-    # 筛选：VIN/零件编号
-    vin = request.GET.get('vin_or_part_no')
-    if vin:
-        queryset = queryset.filter(vin_or_part_no__icontains=vin)
-
-    # 筛选：试验名称
-    test_name = request.GET.get('test_name')
-    if test_name:
-        queryset = queryset.filter(test_name__icontains=test_name)
-
-    # 筛选：加入预警系统状态
-    warning_status = request.GET.get('warning_system_status')
-    if warning_status:
-        queryset = queryset.filter(warning_system_status=warning_status)
-
-    # 筛选：合同编号是否有内容
-    has_contract_no = request.GET.get('has_contract_no')
-    if has_contract_no is not None and has_contract_no != '':
-        if has_contract_no.lower() in ['true', '1', 'yes']:
-            queryset = queryset.exclude(contract_no__isnull=True).exclude(contract_no__exact='')
-        else:
-            queryset = queryset.filter(Q(contract_no__isnull=True) | Q(contract_no__exact=''))
-
-    # 筛选：任务提出人
-    requester = request.GET.get('requester_name')
-    if requester:
-        queryset = queryset.filter(requester_name__icontains=requester)
-
-    # 筛选：测试人员
-    tester = request.GET.get('tester_name')
-    if tester:
-        queryset = queryset.filter(tester_name__icontains=tester)
-
-    # 筛选：是否闭环
-    is_closed = request.GET.get('is_closed')
-    if is_closed is not None and is_closed != '':
-        queryset = queryset.filter(is_closed=(is_closed.lower() in ['true', '1', 'yes']))
-
-    # 筛选：样品状态
-    entry_exit_dispose_type = request.GET.get('entry_exit_dispose_type')
-    if entry_exit_dispose_type is not None and entry_exit_dispose_type != '':
-        if entry_exit_dispose_type == 'null' or entry_exit_dispose_type == '--':
-            queryset = queryset.filter(
-                Q(entry_exit__isnull=True) | Q(entry_exit__dispose_type__isnull=True) | Q(entry_exit__dispose_type__exact='')
-            )
-        else:
-            queryset = queryset.filter(entry_exit__dispose_type=entry_exit_dispose_type)
-
-    # 筛选：出具报告
-    report_required = request.GET.get('report_required')
-    if report_required is not None and report_required != '':
-        queryset = queryset.filter(report_required=report_required)
-
-    # 筛选：时间范围
-    start_date = request.GET.get('schedule_start_from')
-    end_date = request.GET.get('schedule_start_to')
-    if start_date:
-        try:
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            if settings.USE_TZ:
-                start_dt = timezone.make_aware(start_dt, timezone.get_current_timezone())
-            queryset = queryset.filter(schedule_start__gte=start_dt)
-        except ValueError:
-            pass
-    if end_date:
-        try:
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
-            if settings.USE_TZ:
-                end_dt = timezone.make_aware(end_dt, timezone.get_current_timezone())
-            queryset = queryset.filter(schedule_start__lt=end_dt)
-        except ValueError:
-            pass
 
-    # 创建 Excel 工作簿
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = '试验任务单'
-
-    # 定义表头（与前端表格列顺序一致）
-    headers = [
-        '闭环状态', '样品状态', '预警', '车型', 'VIN/零件编号', '试验名称',
-        '测试人员', '协助人员', '提出人', '排期开始', '排期结束', '排期备注',
-        '地点', '报告', '合同编号', '备注'
-    ]
-
-    # 设置表头样式
-    header_font = Font(bold=True, color='FFFFFF')
-    header_fill = openpyxl.styles.PatternFill(start_color='409EFF', end_color='409EFF', fill_type='solid')
-    header_alignment = Alignment(horizontal='center', vertical='center')
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
-    # 写入表头
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = thin_border
-
-    # 写入数据
-    for row_idx, record in enumerate(queryset, 2):
-        # 闭环状态
-        ws.cell(row=row_idx, column=1, value='已闭环' if record.is_closed else '未闭环')
-        # 样品状态
-        dispose_type = ''
-        if record.entry_exit and not record.entry_exit.is_deleted:
-            dispose_type = record.entry_exit.dispose_type or '--'
-        else:
-            dispose_type = '--'
-        ws.cell(row=row_idx, column=2, value=dispose_type)
-        # 预警
-        ws.cell(row=row_idx, column=3, value=record.warning_system_status or '')
-        # 车型
-        ws.cell(row=row_idx, column=4, value=record.model or '')
-        # VIN/零件编号
-        ws.cell(row=row_idx, column=5, value=record.vin_or_part_no or '')
-        # 试验名称
-        ws.cell(row=row_idx, column=6, value=record.test_name or '')
-        # 测试人员
-        ws.cell(row=row_idx, column=7, value=record.tester_name or '')
-        # 协助人员
-        ws.cell(row=row_idx, column=8, value=record.assistants or '--')
-        # 提出人
-        ws.cell(row=row_idx, column=9, value=record.requester_name or '')
-        # 排期开始
-        schedule_start = record.schedule_start.strftime('%Y-%m-%d') if record.schedule_start else '--'
-        ws.cell(row=row_idx, column=10, value=schedule_start)
-        # 排期结束
-        schedule_end = record.schedule_end.strftime('%Y-%m-%d') if record.schedule_end else '--'
-        ws.cell(row=row_idx, column=11, value=schedule_end)
-        # 排期备注
-        ws.cell(row=row_idx, column=12, value=record.schedule_remark or '--')
-        # 地点
-        ws.cell(row=row_idx, column=13, value=record.test_location or '')
-        # 报告
-        ws.cell(row=row_idx, column=14, value=record.report_required or '')
-        # 合同编号
-        ws.cell(row=row_idx, column=15, value=record.contract_no or '否')
-        # 备注
-        ws.cell(row=row_idx, column=16, value=record.remark or '--')
-
-        # 设置数据行样式
-        for col_idx in range(1, len(headers) + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = thin_border
-
-    # 调整列宽
-    column_widths = [10, 10, 10, 12, 20, 30, 12, 12, 12, 12, 12, 15, 15, 8, 12, 15]
-    for col_idx, width in enumerate(column_widths, 1):
-        ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = width
-
-    # 生成文件名
-    today = datetime.now().strftime('%Y%m%d')
-    filename = f'试验任务单_{today}.xlsx'
-
-    # 写入响应
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    response = HttpResponse(
-        output.read(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    queryset = exports.filter_export_records(request.GET)
+    response = StreamingHttpResponse(
+        iter_workbook(lambda: exports.build_workbook(queryset), thread_name='nvh-task-export'),
+        content_type=XLSX_CONTENT_TYPE,
     )
     # 使用 RFC 5987 编码处理中文文件名
-    response['Content-Disposition'] = f"attachment; filename*=UTF-8''{filename}"
-    
+    response['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(exports.export_filename())}"
     return response
 
 
@@ -0,0 +1,65 @@
+"""
+VOC/气味样品数据导出（后台导出任务，见 apps.export_job）
+"""
+from datetime import datetime
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+from .filters import apply_sample_filters
+from .models import SampleInfo
+
+
+EXPORT_SHEET_TITLE = 'VOC气味数据'
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = [
+    'project_name', 'part_name', 'development_stage', 'status', 'test_order_no', 'sample_no', 'test_date',
+    'benzene', 'toluene', 'ethylbenzene', 'xylene', 'styrene',
+    'formaldehyde', 'acetaldehyde', 'acrolein', 'acetone', 'tvoc',
+    'odor_static_front', 'odor_static_rear', 'odor_dynamic_front', 'odor_dynamic_rear', 'odor_mean',
+]
+
+
+def _header():
+    return [str(SampleInfo._meta.get_field(field).verbose_name) for field in EXPORT_FIELDS]
+
+
+def build_workbook(queryset, on_progress=None):
+    """只写模式工作簿；on_progress(已写入行数) 每 EXPORT_CHUNK_SIZE 行及写完时调用"""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=EXPORT_SHEET_TITLE)
+    bold = Font(bold=True)
+    header_cells = []
+    for value in _header():
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = bold
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    count = 0
+    for row in queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        ws.append(row)
+        count += 1
+        if on_progress and count % EXPORT_CHUNK_SIZE == 0:
+            on_progress(count)
+    if on_progress:
+        on_progress(count)
+    return wb
+
+
+def run_export_job(params, report):
+    """
+    导出任务入口
+
+    params 与 filtered-voc-chart-data 接口一致：{'filters': {...}}；返回 (文件名, 工作簿)。
+    """
+    queryset = apply_sample_filters(SampleInfo.objects.all(), params.get('filters') or {}).order_by('-id')
+    report(0, queryset.count())
+    wb = build_workbook(queryset, on_progress=report)
+    return f'{EXPORT_SHEET_TITLE}_{datetime.now().strftime("%Y%m%d")}.xlsx', wb
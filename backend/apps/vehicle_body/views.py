@@ -6,6 +6,7 @@ from django.db.models.functions import ExtractMonth
 from django.utils import timezone
 
 from utils.response import Response
+from .filters import apply_sample_filters
 from .models import SampleInfo, SubstancesTestDetail, Substance
 from .serializers import VocOdorDataSerializer, SubstancesTestListItemSerializer, SubstancesTestDetailSerializer, SubstanceSerializer
 
@@ -222,59 +223,6 @@ def sample_no_options(request):
         return Response.error(message=f'获取样品编号选项失败: {str(e)}')
 
 
-def _apply_filters(qs, filters):
-    project_names = filters.get('project_names', []) or []
-    if project_names:
-        qs = qs.filter(project_name__in=project_names)
-
-    part_names = filters.get('part_names', []) or []
-    if part_names:
-        part_names = list(part_names)
-        has_whole_vehicle = '整车' in part_names
-        has_other_parts = any(name != '整车' for name in part_names)
-
-        if has_whole_vehicle and has_other_parts:
-            # 出现“整车 + 其他零部件”混合时，按照前端约定：
-            # 选择非“整车”零部件时，自动排除“整车”数据
-            part_names = [name for name in part_names if name != '整车']
-
-        if part_names:
-            qs = qs.filter(part_name__in=part_names)
-
-    statuses = filters.get('statuses', []) or []
-    if statuses:
-        qs = qs.filter(status__in=statuses)
-
-    development_stages = filters.get('development_stages', []) or []
-    if development_stages:
-        qs = qs.filter(development_stage__in=development_stages)
-
-    test_order_no = filters.get('test_order_no') or ''
-    if test_order_no:
-        qs = qs.filter(test_order_no__icontains=test_order_no)
-
-    sample_no = filters.get('sample_no') or ''
-    if sample_no:
-        qs = qs.filter(sample_no__icontains=sample_no)
-
-    test_date_range = filters.get('test_date_range') or []
-    if isinstance(test_date_range, (list, tuple)) and len(test_date_range) == 2:
-        # 处理前端传来的 ISO 8601 格式日期字符串，提取日期部分
-        from datetime import datetime
-        start_date = test_date_range[0]
-        end_date = test_date_range[1]
-        
-        # 如果是字符串格式，尝试解析并转换为日期
-        if isinstance(start_date, str):
-            start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00')).date()
-        if isinstance(end_date, str):
-            end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00')).date()
-            
-        qs = qs.filter(test_date__range=[start_date, end_date])
-
-    return qs
-
-
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def row_chart_data(request):
@@ -336,7 +284,7 @@ def filtered_voc_chart_data(request):
         limit = int(request.data.get('limit', 10) or 10)
 
         queryset = SampleInfo.objects.all()
-        queryset = _apply_filters(queryset, filters)
+        queryset = apply_sample_filters(queryset, filters)
         queryset = queryset.order_by('-id')[:limit]
 
         x_axis = ["苯", "甲苯", "二甲苯", "乙苯", "苯乙烯", "甲醛", "乙醛", "丙酮", "TVOC"]
@@ -428,7 +376,7 @@ def filtered_odor_chart_data(request):
         limit = int(request.data.get('limit', 10) or 10)
 
         queryset = SampleInfo.objects.all()
-        queryset = _apply_filters(queryset, filters)
+        queryset = apply_sample_filters(queryset, filters)
         queryset = queryset.order_by('-id')[:limit]
 
         # 气味图采用固定5项（与旧端一致）
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wheel_performance', '0004_alter_wheelperformance_anti_resonance_peak_f2_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wheelperformance',
+            name='force_transfer_normalized',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='力传递一阶曲线（规范化）'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from utils.curves import normalize_force_transfer_signal
+
 
 class WheelPerformance(models.Model):
     """存储不同车型的车轮性能参数。"""
@@ -24,6 +26,8 @@ class WheelPerformance(models.Model):
     force_transfer_test_image_url = models.CharField(max_length=255, null=True, blank=True,verbose_name='力传递测试图 URL')
     # {"dB":[],"frequency":[]}
     force_transfer_signal = models.JSONField(default=list, null=True, blank=True,verbose_name='力传递一阶曲线信号')
+    # 入库时由 force_transfer_signal 生成的规范曲线 {"version": CURVE_SCHEMA_VERSION, "x": [...], "y": [...]}，见 utils/curves.py
+    force_transfer_normalized = models.JSONField(null=True, blank=True, editable=False, verbose_name='力传递一阶曲线（规范化）')
 
 
     class Meta:
@@ -32,5 +36,17 @@ class WheelPerformance(models.Model):
         verbose_name_plural = '车轮性能'
         ordering = ['vehicle_model__vehicle_model_name', 'tire_brand', 'tire_model']
 
+    def save(self, *args, **kwargs):
+        # 入库时同步生成规范曲线；force_transfer_signal 未加载或未更新时保持原值
+        update_fields = kwargs.get('update_fields')
+        if (
+            'force_transfer_signal' not in self.get_deferred_fields()
+            and (update_fields is None or 'force_transfer_signal' in update_fields)
+        ):
+            self.force_transfer_normalized = normalize_force_transfer_signal(self.force_transfer_signal)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'force_transfer_normalized'}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.vehicle_model.vehicle_model_name} - {self.tire_brand} {self.tire_model}"
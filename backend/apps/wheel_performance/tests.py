@@ -1,3 +1,111 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
-# Create your tests here.
+from apps.modal.models import VehicleModel
+from utils.curves import (
+    CURVE_SCHEMA_VERSION,
+    SOUND_PRESSURE_Y_KEYS,
+    canonical_curve,
+    normalize_force_transfer_signal,
+    normalize_speed_curve,
+    pick_value_list,
+)
+
+from .models import WheelPerformance
+
+
+# ==================== 曲线规范化 ====================
+
+class PickValueListTests(SimpleTestCase):
+    """候选键名取值：默认只按键名命中，fallback 时才回退到任意列表"""
+
+    def test_first_matching_key_wins(self):
+        series = {'values': [3], 'dB(A)': [1, 2]}
+        self.assertEqual(pick_value_list(series, ['dB(A)', 'values']), [1, 2])
+        self.assertEqual(pick_value_list(series, ['values', 'dB(A)']), [3])
+
+    def test_empty_or_non_list_values_are_skipped(self):
+        series = {'dB(A)': [], 'value': 'abc', 'values': [5]}
+        self.assertEqual(pick_value_list(series, ['dB(A)', 'value', 'values']), [5])
+
+    def test_no_match_returns_none_without_fallback(self):
+        series = {'speed': [10, 20], 'other': [1, 2]}
+        self.assertIsNone(pick_value_list(series, ['dB(A)', 'value']))
+        self.assertIsNone(pick_value_list(series, ['dB(A)', 'value'], fallback=False))
+
+    def test_fallback_returns_first_non_empty_list(self):
+        series = {'empty': [], 'speed': [10, 20], 'other': [1, 2]}
+        self.assertEqual(pick_value_list(series, ['dB(A)'], fallback=True), [10, 20])
+        self.assertIsNone(pick_value_list({'a': []}, ['dB(A)'], fallback=True))
+
+    def test_non_dict_input(self):
+        self.assertIsNone(pick_value_list([[1, 2]], ['x'], fallback=True))
+        self.assertIsNone(pick_value_list(None, ['x']))
+
+
+class NormalizeCurveTests(SimpleTestCase):
+
+    def test_speed_curve_without_y_key_is_empty(self):
+        # 缺少 y 键时不能把车速列当作声压级
+        curve = normalize_speed_curve({'speed': [60, 20, 40]}, SOUND_PRESSURE_Y_KEYS)
+        self.assertEqual(curve, {'version': CURVE_SCHEMA_VERSION, 'x': [], 'y': []})
+
+    def test_speed_curve_sorted_by_x(self):
+        curve = normalize_speed_curve('{"speed/rpm": [60, "20", 40], "dB(A)": [66, 50, null]}', SOUND_PRESSURE_Y_KEYS)
+        # 非数值项被丢弃后按位置配对
+        self.assertEqual(curve['x'], [20.0, 60.0])
+        self.assertEqual(curve['y'], [50.0, 66.0])
+
+    def test_speed_curve_from_pairs(self):
+        curve = normalize_speed_curve([[40, 55], [20, 50], ['bad', 1]], SOUND_PRESSURE_Y_KEYS)
+        self.assertEqual(curve['x'], [20.0, 40.0])
+        self.assertEqual(curve['y'], [50.0, 55.0])
+
+    def test_force_transfer_falls_back_to_unknown_keys(self):
+        curve = normalize_force_transfer_signal({'f': [100, 200], 'amp': [10, 20]})
+        # 两列均未命中键名时都回退到第一个列表，仅用于兼容历史数据
+        self.assertEqual(curve['x'], [100.0, 200.0])
+        self.assertEqual(curve['y'], [100.0, 200.0])
+
+    def test_force_transfer_swapped_axes(self):
+        curve = normalize_force_transfer_signal({'frequency': [-20, 10, 30], 'dB': [50, 150, 250]})
+        self.assertEqual(curve['x'], [50.0, 150.0, 250.0])
+        self.assertEqual(curve['y'], [-20.0, 10.0, 30.0])
+
+    def test_force_transfer_small_frequency_unit(self):
+        curve = normalize_force_transfer_signal({'frequency': [0.5, 30], 'dB': [1, 2]})
+        self.assertEqual(curve['x'], [5.0, 300.0])
+
+    def test_canonical_curve_version(self):
+        stored = {'version': CURVE_SCHEMA_VERSION, 'x': [1.0], 'y': [2.0]}
+        self.assertIs(canonical_curve(stored, lambda: self.fail('不应重新规范化')), stored)
+        outdated = {'version': CURVE_SCHEMA_VERSION - 1, 'x': [], 'y': []}
+        self.assertEqual(canonical_curve(outdated, lambda: 'raw'), 'raw')
+
+
+class WheelPerformanceSaveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vehicle = VehicleModel.objects.create(vehicle_model_name='测试车型', vin='TESTVIN0000000001')
+
+    def test_save_writes_normalized_curve(self):
+        wheel = WheelPerformance.objects.create(
+            vehicle_model=self.vehicle, force_transfer_signal={'frequency': [200, 100], 'dB': [2, 1]}
+        )
+        wheel.refresh_from_db()
+        self.assertEqual(wheel.force_transfer_normalized['x'], [100.0, 200.0])
+
+    def test_update_fields_without_signal_keeps_curve(self):
+        wheel = WheelPerformance.objects.create(
+            vehicle_model=self.vehicle, force_transfer_signal={'frequency': [100], 'dB': [1]}
+        )
+        deferred = WheelPerformance.objects.defer('force_transfer_signal').get(pk=wheel.pk)
+        deferred.tire_brand = 'X'
+        deferred.save()
+        deferred.refresh_from_db()
+        self.assertEqual(deferred.force_transfer_normalized['x'], [100.0])
+
+        wheel.force_transfer_signal = {'frequency': [150], 'dB': [1]}
+        wheel.save(update_fields=['force_transfer_signal'])
+        wheel.refresh_from_db()
+        self.assertEqual(wheel.force_transfer_normalized['x'], [150.0])
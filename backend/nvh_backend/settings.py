@@ -47,6 +47,7 @@ LOCAL_APPS = [
     'apps.vehicle_body',
     'apps.nvh_benchmark',
     'apps.nvh_task',
+    'apps.export_job',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -98,6 +99,18 @@ DATABASES = {
     }
 }
 
+# 缓存：对标数据、任务统计、筛选项索引等缓存依赖进程间共享的失效代号/版本号，
+# 多进程部署（gunicorn 多 worker、后台命令）必须使用共享后端，不能使用进程内 LocMemCache。
+# 默认使用数据库缓存（部署时需执行 python manage.py createcachetable），
+# 可通过环境变量改为 Redis：CACHE_BACKEND=django.core.cache.backends.redis.RedisCache，
+# CACHE_LOCATION=redis://127.0.0.1:6379/1（需安装 redis）
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('CACHE_LOCATION', default='django_cache'),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -197,3 +210,13 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 LOGIN_URL = '/oidc/authenticate/'
 
+
+# NVH对标分析：单个请求并发组装数据块的线程数（<=1 时顺序组装）、进程内全部请求的组装线程总数上限
+# （配额不足的请求改为顺序组装）及单个数据块自开始执行起的超时时间（秒）
+NVH_BENCHMARK_MAX_WORKERS = config('NVH_BENCHMARK_MAX_WORKERS', default=5, cast=int)
+NVH_BENCHMARK_THREAD_LIMIT = config('NVH_BENCHMARK_THREAD_LIMIT', default=20, cast=int)
+NVH_BENCHMARK_SECTION_TIMEOUT = config('NVH_BENCHMARK_SECTION_TIMEOUT', default=15, cast=float)
+
+# 后台导出任务：运行中任务超过该时长（秒）未更新进度视为中断；已结束任务及其文件的保留天数
+EXPORT_JOB_STALE_TIMEOUT = config('EXPORT_JOB_STALE_TIMEOUT', default=1800, cast=int)
+EXPORT_JOB_RETENTION_DAYS = config('EXPORT_JOB_RETENTION_DAYS', default=7, cast=int)
@@ -28,6 +28,7 @@ urlpatterns = [
     path('api/experience/', include('apps.experience.urls')),
     path('api/vehicle-body/', include('apps.vehicle_body.urls')),
     path('api/nvh-task/', include('apps.nvh_task.urls')),
+    path('api/export-jobs/', include('apps.export_job.urls')),
     path('oidc/', include('mozilla_django_oidc.urls')),
 ]
 
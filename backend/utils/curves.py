@@ -0,0 +1,194 @@
+"""
+曲线数据规范化
+
+历史导入的曲线 JSON 键名不统一（{"speed/rpm": [...], "dB(A)": [...]}、{"dB": [], "frequency": []}、
+[[x, y], ...] 等），部分力传递曲线还存在频率/dB 对调或频率单位偏小的问题。
+入库时统一转换为规范形式并与原始数据一同保存，读取时直接使用：
+
+    {"version": CURVE_SCHEMA_VERSION, "x": [...], "y": [...]}   # 按 x 升序
+
+规范化规则变化时递增 CURVE_SCHEMA_VERSION，并执行 backfill_normalized_curves 命令重新生成。
+
+版本 2：车速/转速曲线只按候选键名取值，不再回退到任意列表（缺少 y 键时不会把 x 当作 y）。
+"""
+import json
+from decimal import Decimal
+from typing import Callable, Sequence
+
+
+CURVE_SCHEMA_VERSION = 2
+
+# 车速/转速曲线（动态噪声）的候选键名
+SPEED_X_KEYS = ['speed', 'rpm', 'speed/rpm', 'Speed', 'km/h']
+SOUND_PRESSURE_Y_KEYS = ['dB(A)', 'value', 'values', 'sound_pressure', 'Sound Pressure']
+SPEECH_CLARITY_Y_KEYS = ['%AI', 'value', 'values']
+# 力传递曲线的候选键名
+FORCE_TRANSFER_X_KEYS = ['frequency', 'Hz', 'freq', 'speed', 'rpm']
+FORCE_TRANSFER_Y_KEYS = ['dB', 'db', 'dB(A)', 'value', 'values']
+
+
+# ==================== 原始数据解析 ====================
+
+def to_float(value):
+    if value in (None, ''):
+        return None
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_json_field(value):
+    if isinstance(value, (dict, list)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+    return None
+
+
+def normalize_numeric_list(values):
+    if not isinstance(values, list):
+        return []
+    normalized = []
+    for item in values:
+        val = to_float(item)
+        if val is None:
+            continue
+        normalized.append(val)
+    return normalized
+
+
+def pick_value_list(series_dict, candidate_keys: Sequence[str], fallback: bool = False):
+    """
+    按候选键名顺序取第一个非空列表；均未命中时返回 None
+
+    fallback=True 时改为返回字典中第一个非空列表（仅用于键名极不统一、且按轴向有纠正逻辑的力传递曲线）。
+    """
+    if not isinstance(series_dict, dict):
+        return None
+    for key in candidate_keys:
+        value = series_dict.get(key)
+        if isinstance(value, list) and value:
+            return value
+    if not fallback:
+        return None
+    for value in series_dict.values():
+        if isinstance(value, list) and value:
+            return value
+    return None
+
+
+def build_curve_pairs(series_data, x_keys: Sequence[str], y_keys: Sequence[str], fallback: bool = False):
+    if series_data is None:
+        return []
+    if isinstance(series_data, list):
+        pairs = []
+        for entry in series_data:
+            if isinstance(entry, (list, tuple)) and len(entry) >= 2:
+                x_val = to_float(entry[0])
+                y_val = to_float(entry[1])
+            elif isinstance(entry, dict):
+                x_val = to_float(entry.get('x') or entry.get('frequency') or entry.get('Hz')or entry.get('speed'))
+                y_val = to_float(entry.get('y') or entry.get('value') or entry.get('dB') or entry.get('dB(A)'))
+            else:
+                continue
+            if x_val is None or y_val is None:
+                continue
+            pairs.append([x_val, y_val])
+        return pairs
+    if isinstance(series_data, dict):
+        x_list = normalize_numeric_list(pick_value_list(series_data, x_keys, fallback))
+        y_list = normalize_numeric_list(pick_value_list(series_data, y_keys, fallback))
+        length = min(len(x_list), len(y_list))
+        return [[x_list[i], y_list[i]] for i in range(length)]
+    return []
+
+
+# ==================== 规范化 ====================
+
+def _to_canonical(pairs) -> dict:
+    # 无有效数据时同样返回规范结构（空列表），与“尚未规范化”的 None 区分
+    pairs = sorted(pairs, key=lambda item: item[0])
+    return {
+        'version': CURVE_SCHEMA_VERSION,
+        'x': [item[0] for item in pairs],
+        'y': [item[1] for item in pairs],
+    }
+
+
+def normalize_speed_curve(curve, y_keys: Sequence[str]) -> dict:
+    """车速/转速曲线（声压级、语音清晰度）规范化"""
+    return _to_canonical(build_curve_pairs(parse_json_field(curve), SPEED_X_KEYS, y_keys))
+
+
+def normalize_force_transfer_signal(signal) -> dict:
+    """力传递一阶曲线规范化：纠正频率/dB 对调与频率单位偏小"""
+    pairs = build_curve_pairs(
+        parse_json_field(signal), FORCE_TRANSFER_X_KEYS, FORCE_TRANSFER_Y_KEYS, fallback=True
+    )
+    if not pairs:
+        return _to_canonical(pairs)
+
+    # 为兼容 WheelPerformance 查询页，对可能出现的「频率 / dB 维度对调」做一次自动纠正：
+    # - 频率通常在 [0, 300]（或更高），最大值 >= 80
+    # - dB 幅值通常在 [-100, 100]，整体跨度不超过 ~120dB
+    xs = [item[0] for item in pairs]
+    ys = [item[1] for item in pairs]
+    x_min, x_max = min(xs), max(xs)
+    y_min, y_max = min(ys), max(ys)
+
+    def looks_like_freq(v_min, v_max):
+        return v_max >= 80 and v_max <= 1000
+
+    def looks_like_db(v_min, v_max, v_range):
+        return v_range <= 120 and v_max <= 120 and v_min >= -120
+
+    freq_looks_db = looks_like_db(x_min, x_max, x_max - x_min)
+    db_looks_freq = y_max >= 80
+    x_is_freq = looks_like_freq(x_min, x_max)
+    y_is_db = looks_like_db(y_min, y_max, y_max - y_min)
+
+    # 若当前 x 更像 dB、y 更像频率，则整体对调坐标轴
+    if (not x_is_freq) and (not y_is_db) and freq_looks_db and db_looks_freq:
+        pairs = [[p[1], p[0]] for p in pairs]
+
+    # 若频率最大值在 30~40 之间，视为以 0.5 为步长但单位偏小，按 10 倍缩放到 0-300 区间
+    max_freq = max((item[0] for item in pairs), default=0)
+    if 0 < max_freq <= 40:
+        pairs = [[round(freq * 10, 4), value] for freq, value in pairs]
+    return _to_canonical(pairs)
+
+
+# ==================== 读取 ====================
+
+def canonical_curve(stored, normalize_raw: Callable[[], dict]) -> dict:
+    """
+    优先使用入库时生成的规范曲线；尚未回填或版本过期时调用 normalize_raw 现场规范化
+
+    normalize_raw 延迟调用，查询时可只加载规范曲线字段，历史记录才会额外读取原始曲线。
+    """
+    if isinstance(stored, dict) and stored.get('version') == CURVE_SCHEMA_VERSION:
+        return stored
+    return normalize_raw()
+
+
+def curve_to_pairs(curve) -> list:
+    """规范曲线转为图表使用的 [[x, y], ...]"""
+    if not curve:
+        return []
+    return [list(item) for item in zip(curve['x'], curve['y'])]
@@ -0,0 +1,97 @@
+"""
+曲线降采样工具
+
+图表宽度通常只有 1000~2000 像素，返回上万个点只会增加传输和渲染开销。
+这里按桶保留每段的最小值与最大值（min/max 降采样），峰值和谷值都不会被抹平，
+全部计算基于 NumPy 向量化完成。
+"""
+import numpy as np
+
+
+def minmax_indices(values, max_points):
+    """
+    计算 min/max 降采样后需要保留的下标（升序）
+
+    首尾两点始终保留，其余点均分为若干桶，每桶保留最小值与最大值所在位置。
+    点数不超过 max_points 时返回全部下标。
+    """
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    if not max_points or n <= max_points or max_points < 4:
+        return np.arange(n)
+
+    interior = n - 2
+    bucket_count = max(1, (max_points - 2) // 2)
+    bucket_size = -(-interior // bucket_count)
+    bucket_count = -(-interior // bucket_size)
+
+    # 补齐为整桶后 reshape，补齐部分使用 NaN，nanargmin/nanargmax 会自动忽略
+    padded = np.full(bucket_count * bucket_size, np.nan)
+    padded[:interior] = y[1:-1]
+    buckets = padded.reshape(bucket_count, bucket_size)
+    valid_rows = ~np.isnan(buckets).all(axis=1)
+
+    offsets = np.arange(bucket_count) * bucket_size + 1
+    picked = [np.array([0, n - 1])]
+    if valid_rows.any():
+        rows = buckets[valid_rows]
+        picked.append(offsets[valid_rows] + np.nanargmin(rows, axis=1))
+        picked.append(offsets[valid_rows] + np.nanargmax(rows, axis=1))
+    return np.unique(np.concatenate(picked))
+
+
+def downsample_xy(x, y, max_points):
+    """对 x/y 两个等长数组做 min/max 降采样，返回 NumPy 数组"""
+    x_arr = np.asarray(x, dtype=np.float64)
+    y_arr = np.asarray(y, dtype=np.float64)
+    length = min(len(x_arr), len(y_arr))
+    x_arr, y_arr = x_arr[:length], y_arr[:length]
+    if not max_points or length <= max_points:
+        return x_arr, y_arr
+    idx = minmax_indices(y_arr, max_points)
+    return x_arr[idx], y_arr[idx]
+
+
+def downsample_pairs(pairs, max_points):
+    """对 [[x, y], ...] 形式的曲线做 min/max 降采样"""
+    if not max_points or len(pairs) <= max_points:
+        return pairs
+    y = np.fromiter((p[1] for p in pairs), dtype=np.float64, count=len(pairs))
+    return [pairs[i] for i in minmax_indices(y, max_points).tolist()]
+
+
+def downsample_matrix(axis, matrix, max_points):
+    """
+    对共享同一横轴的多行数据（如热力图）按列分桶降采样
+
+    各行需使用相同的横轴下标，因此每桶取各行的最大值（峰值保持），
+    横轴取桶内第一个点。缺失值（None/NaN）不参与计算，整桶缺失时输出 None。
+    """
+    width = len(axis)
+    if not max_points or width <= max_points or not matrix:
+        return axis, matrix
+
+    data = np.full((len(matrix), width), np.nan)
+    for row_index, row in enumerate(matrix):
+        values = np.array(
+            [np.nan if v is None else v for v in row[:width]],
+            dtype=np.float64,
+        )
+        data[row_index, :len(values)] = values
+
+    bucket_size = -(-width // max_points)
+    bucket_count = -(-width // bucket_size)
+    padded = np.full((len(matrix), bucket_count * bucket_size), np.nan)
+    padded[:, :width] = data
+    buckets = padded.reshape(len(matrix), bucket_count, bucket_size)
+
+    missing = np.isnan(buckets)
+    peaks = np.where(missing, -np.inf, buckets).max(axis=2)
+    peaks[missing.all(axis=2)] = np.nan
+
+    new_axis = np.asarray(axis, dtype=np.float64)[::bucket_size].tolist()
+    new_matrix = [
+        [None if v != v else v for v in row]
+        for row in peaks.tolist()
+    ]
+    return new_axis, new_matrix
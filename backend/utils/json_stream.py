@@ -0,0 +1,123 @@
+"""
+流式 JSON 编码
+
+大体积曲线接口（频谱、热力图、隔振率曲线）一次性构建完整响应再整体序列化，
+内存峰值为数据体积的数倍。这里按“生成器即数组”的约定逐条编码输出：
+data 中任意位置的生成器/迭代器会被编码为 JSON 数组，每个元素单独序列化后立即写出，
+其余普通值（dict/list/数值等）整体编码。
+
+编码器优先使用 orjson（见 requirements.txt），未安装时回退到标准库 json；
+Decimal、日期时间与 NumPy 数组/标量经 _default 转换，NaN/Infinity 两者均输出为 null。
+"""
+import datetime
+import json
+import math
+from collections.abc import Iterator
+from decimal import Decimal
+
+import numpy as np
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _default(value):
+    """处理 JSON 原生不支持的类型（与 DRF JSONRenderer 口径一致）"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _finite(value):
+    """递归将 NaN/Infinity 替换为 None（与 orjson 输出 null 一致）"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_finite(item) for item in value]
+    if isinstance(value, (Decimal, np.ndarray, np.generic)):
+        return _finite(_default(value))
+    return value
+
+
+# 不允许 NaN：标准库默认输出非法 JSON 字面量 NaN，遇到时整体替换为 null 后重新编码
+_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+
+
+def _dumps_json(value) -> bytes:
+    try:
+        text = _encoder.encode(value)
+    except ValueError:
+        text = _encoder.encode(_finite(value))
+    return text.encode('utf-8')
+
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value) -> bytes:
+        """将值编码为 UTF-8 JSON 字节串"""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(value) -> bytes:
+        """将值编码为 UTF-8 JSON 字节串"""
+        return _dumps_json(value)
+
+
+def _contains_stream(value) -> bool:
+    if isinstance(value, Iterator):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_stream(item) for item in value.values())
+    return False
+
+
+def iter_json(value):
+    """
+    逐段编码 value，返回字节串生成器
+
+    生成器/迭代器按数组逐元素输出；包含生成器的 dict 逐键输出；其余值整体编码。
+    """
+    if isinstance(value, Iterator):
+        yield b'['
+        first = True
+        for item in value:
+            if not first:
+                yield b','
+            first = False
+            yield from iter_json(item)
+        yield b']'
+    elif isinstance(value, dict) and _contains_stream(value):
+        yield b'{'
+        first = True
+        for key, item in value.items():
+            yield (b'' if first else b',') + dumps(str(key)) + b':'
+            first = False
+            yield from iter_json(item)
+        yield b'}'
+    else:
+        yield dumps(value)
+
+
+def stream_json(value, chunk_size=64 * 1024):
+    """在 iter_json 基础上合并小片段，按约 chunk_size 字节输出，减少写出次数"""
+    buffer = bytearray()
+    for piece in iter_json(value):
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
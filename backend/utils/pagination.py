@@ -1,7 +1,17 @@
+import hashlib
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 
+CURSOR_SALT = 'utils.pagination.cursor'
+COUNT_CACHE_TIMEOUT = 60
+
+
 class PageNumberPaginationUtil(PageNumberPagination):
     """
     自定义分页器
@@ -36,3 +46,113 @@ class PageNumberPaginationUtil(PageNumberPagination):
             'max_page': self.page.paginator.num_pages,
             'results': data
         })
+
+
+# ==================== 游标（keyset）分页 ====================
+#
+# 按排序键定位而非 OFFSET：下一页条件为“排序键严格位于上一页末行之后”，
+# 配合与排序一致的联合索引，第 1 页与第 500 页的查询代价相同。
+# 排序字段的最后一个必须是 id/-id，保证排序键唯一。
+# 游标为上一页末行排序键的签名串，客户端无法篡改，也不依赖其具体格式。
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析（被篡改或排序方式已变化）"""
+
+
+def _ordering(queryset):
+    """[(字段名, 是否倒序, 是否可为 NULL)]"""
+    ordering = [str(field) for field in queryset.query.order_by]
+    if not ordering or ordering[-1].lstrip('-') not in ('id', 'pk'):
+        raise ValueError('游标分页要求查询集按字段排序且以 id 结尾')
+    opts = queryset.model._meta
+    result = []
+    for field in ordering:
+        name = field.lstrip('-')
+        model_field = opts.pk if name == 'pk' else opts.get_field(name)
+        result.append((model_field.attname, field.startswith('-'), model_field.null))
+    return result
+
+
+def _after(field, value, descending, nullable, nulls_largest):
+    """排序方向上严格位于 value 之后的条件（NULL 的排序位置随数据库而定）"""
+    # NULL 是否排在非 NULL 值之后
+    nulls_after = nullable and (nulls_largest != descending)
+    if value is None:
+        return Q(pk__in=[]) if nulls_after else Q(**{f'{field}__isnull': False})
+    after = Q(**{f'{field}__lt' if descending else f'{field}__gt': value})
+    return after | Q(**{f'{field}__isnull': True}) if nulls_after else after
+
+
+def _equal(field, value):
+    return Q(**{f'{field}__isnull': True}) if value is None else Q(**{field: value})
+
+
+def _to_json(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # 日期时间保留微秒精度（DjangoJSONEncoder 会截断到毫秒）
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def encode_cursor(obj, ordering):
+    return signing.dumps(
+        [_to_json(getattr(obj, field)) for field, _, _ in ordering],
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def decode_cursor(cursor, queryset, ordering):
+    try:
+        values = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature as exc:
+        raise InvalidCursor('无效的分页游标') from exc
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor('无效的分页游标')
+    opts = queryset.model._meta
+    try:
+        return [
+            None if value is None else opts.get_field(field).to_python(value)
+            for (field, _, _), value in zip(ordering, values)
+        ]
+    except Exception as exc:
+        raise InvalidCursor('无效的分页游标') from exc
+
+
+def keyset_paginate(queryset, cursor, page_size):
+    """
+    返回 (本页记录列表, 下一页游标)；cursor 为空时取第一页，没有下一页时游标为 None
+
+    多取一行判断是否还有下一页，不执行 COUNT。
+    """
+    ordering = _ordering(queryset)
+    if cursor:
+        values = decode_cursor(cursor, queryset, ordering)
+        nulls_largest = connections[queryset.db].features.nulls_order_largest
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for (field, descending, nullable), value in zip(ordering, values):
+            condition |= prefix & _after(field, value, descending, nullable, nulls_largest)
+            prefix &= _equal(field, value)
+        # 首个排序字段的范围条件单独给出，便于数据库按联合索引做范围扫描
+        field, descending, nullable = ordering[0]
+        condition &= _after(field, values[0], descending, nullable, nulls_largest) | _equal(field, values[0])
+        queryset = queryset.filter(condition)
+
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    items = items[:page_size]
+    return items, encode_cursor(items[-1], ordering)
+
+
+def cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """按查询语句缓存 COUNT 结果，游标翻页时总数只在首次查询时计算"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = 'pagination:count:' + hashlib.sha1(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, timeout)
+    return total
@@ -1,6 +1,9 @@
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response as DRFResponse
 from rest_framework import status
 
+from utils.json_stream import stream_json
+
 
 class Response:
     """
@@ -17,6 +20,26 @@ class Response:
             "success": True
         }, status=status_code)
     
+    @staticmethod
+    def stream(data=None, message="操作成功", status_code=status.HTTP_200_OK):
+        """
+        流式成功响应，信封格式与 success 一致
+
+        data 中的生成器会被编码为 JSON 数组并逐条写出（见 utils.json_stream），
+        适用于大体积曲线数据。生成器在响应写出时才执行，参数校验等错误需在此之前返回。
+        """
+        envelope = {
+            "code": 200,
+            "message": message,
+            "data": data,
+            "success": True
+        }
+        return StreamingHttpResponse(
+            stream_json(envelope),
+            status=status_code,
+            content_type='application/json',
+        )
+
     @staticmethod
     def error(message="操作失败", code=400, data=None, status_code=status.HTTP_400_BAD_REQUEST):
         """错误响应"""
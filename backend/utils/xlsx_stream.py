@@ -0,0 +1,96 @@
+"""
+Excel 流式输出
+
+openpyxl 只写模式下行数据先写入各工作表的临时文件，保存时才打包为 xlsx（zip）。
+这里在后台线程中构建并保存工作簿，写入端是不可 seek 的队列：zip 字节按 CHUNK_SIZE 聚合后
+经有界队列交给响应逐块发送，内存占用与行数无关。
+
+构建函数在后台线程中执行，可以直接遍历查询集；线程结束时关闭该线程的数据库连接。
+"""
+import io
+import queue
+import threading
+from typing import Callable, Iterator
+
+from django.db import connections
+
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CHUNK_SIZE = 64 * 1024
+
+_DONE = object()
+
+
+class _QueueWriter(io.RawIOBase):
+    """
+    不可 seek 的写入端：按 CHUNK_SIZE 聚合后放入有界队列
+
+    zipfile 检测到不可 seek 时使用数据描述符写入，无需回写文件头。
+    响应提前结束（客户端断开）时 cancelled 被置位，之后的输出直接丢弃。
+    """
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer.extend(data)
+        if len(self._buffer) >= CHUNK_SIZE:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def flush_buffer(self):
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item):
+        while True:
+            if self._cancelled.is_set():
+                # 响应已结束，直接丢弃输出让线程尽快结束
+                return
+            try:
+                self._chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+
+def iter_workbook(build_workbook: Callable, thread_name: str = 'xlsx-export') -> Iterator[bytes]:
+    """
+    逐块输出 build_workbook() 返回的工作簿
+
+    build_workbook 中的异常在响应线程中重新抛出。
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=16)
+    cancelled = threading.Event()
+    errors = []
+
+    def produce():
+        writer = _QueueWriter(chunks, cancelled)
+        try:
+            build_workbook().save(writer)
+            writer.flush_buffer()
+        except Exception as exc:  # 交由响应线程抛出
+            errors.append(exc)
+        finally:
+            connections.close_all()
+            writer.put(_DONE)
+
+    thread = threading.Thread(target=produce, name=thread_name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        cancelled.set()
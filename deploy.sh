@@ -65,6 +65,10 @@ init_database() {
     # 运行数据库迁移
     echo "执行数据库迁移..."
     docker exec nvh_backend python manage.py migrate
+
+    # 创建数据库缓存表（多进程共享缓存，已存在时跳过）
+    echo "创建缓存表..."
+    docker exec nvh_backend python manage.py createcachetable
     
     # 创建超级用户（可选）
     echo "创建超级用户（可选，按Ctrl+C跳过）..."
@@ -0,0 +1,39 @@
+import request from '@/utils/request'
+
+/**
+ * 后台导出任务 API
+ * 导出由后台 worker 生成文件，前端创建任务后轮询状态，完成后下载
+ */
+export const exportJobApi = {
+  /**
+   * 创建导出任务
+   * @param {string} kind 导出类型（如 nvh_task.main_records、vehicle_body.voc）
+   * @param {Object} params 导出参数（与对应列表/查询接口的筛选条件一致）
+   */
+  createJob(kind, params = {}) {
+    return request.post('/export-jobs/', { kind, params })
+  },
+
+  /**
+   * 获取导出任务状态与进度
+   * @param {number} id 任务ID
+   */
+  getJob(id) {
+    return request.get(`/export-jobs/${id}/`)
+  },
+
+  /**
+   * 下载已完成任务的文件
+   * @param {number} id 任务ID
+   */
+  async downloadJob(id) {
+    // 使用原生 axios 避免响应拦截器干扰 blob 数据
+    const axios = (await import('axios')).default
+    const response = await axios.get(`/api/export-jobs/${id}/download/`, {
+      responseType: 'blob'
+    })
+    return response.data
+  }
+}
+
+export default exportJobApi
@@ -5,6 +5,7 @@
 import { defineStore } from 'pinia'
 import { nvhTaskApi } from '@/api/nvhTask'
 import { userApi } from '@/api/user'
+import { runExportJob } from '@/utils/exportJob'
 import { useUserStore } from '@/store/index'
 
 export const useTaskStore = defineStore('nvhTask', {
@@ -598,10 +599,10 @@ export const useTaskStore = defineStore('nvhTask', {
 
     // ==================== 导出 Excel ====================
 
-    async exportToExcel() {
+    // 创建后台导出任务，轮询完成后下载；onProgress 接收任务状态用于显示进度
+    async exportToExcel(onProgress) {
       const params = this.getActiveFilters()
-      const res = await nvhTaskApi.exportMainRecords(params)
-      return res
+      return runExportJob('nvh_task.main_records', params, onProgress)
     },
 
     // ==================== 获取上次填写数据 ====================
@@ -0,0 +1,57 @@
+/**
+ * 后台导出任务工具
+ * 创建导出任务 → 轮询状态 → 完成后以任务文件名下载
+ */
+
+import { exportJobApi } from '@/api/exportJob'
+
+// 轮询间隔（毫秒）
+const POLL_INTERVAL = 1500
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms))
+
+/**
+ * 触发浏览器下载 blob
+ * @param {Blob} data 文件内容
+ * @param {string} filename 文件名
+ */
+export const saveBlob = (data, filename) => {
+  const blob = new Blob([data], {
+    type: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+  })
+  const url = window.URL.createObjectURL(blob)
+  const link = document.createElement('a')
+  link.href = url
+  link.download = filename
+  document.body.appendChild(link)
+  link.click()
+  document.body.removeChild(link)
+  window.URL.revokeObjectURL(url)
+}
+
+/**
+ * 执行导出任务并下载文件
+ * @param {string} kind 导出类型
+ * @param {Object} params 导出参数
+ * @param {Function} onProgress 进度回调，参数为任务状态对象（含 progress、processed_rows、total_rows）
+ * @returns {Promise<Object>} 完成后的任务状态对象；任务失败时抛出错误（message 为失败原因）
+ */
+export const runExportJob = async (kind, params = {}, onProgress) => {
+  const created = await exportJobApi.createJob(kind, params)
+  let job = created?.data
+  while (job.status === 'pending' || job.status === 'running') {
+    onProgress?.(job)
+    await sleep(POLL_INTERVAL)
+    const res = await exportJobApi.getJob(job.id)
+    job = res?.data
+  }
+  if (job.status !== 'success') {
+    throw new Error(job.error_message || '导出失败')
+  }
+  onProgress?.(job)
+  const data = await exportJobApi.downloadJob(job.id)
+  saveBlob(data, job.filename)
+  return job
+}
+
+export default runExportJob